@@ -1,4 +1,7 @@
-from typing import List, Dict
+import re
+from functools import lru_cache
+from typing import List, Dict, Iterable, Optional, Sequence
+import numpy as np
 
 EXPENSE_CATEGORIES = {
     "essential": ["rent", "utilities", "groceries", "healthcare", "insurance", "transportation"],
@@ -6,30 +9,73 @@ EXPENSE_CATEGORIES = {
     "savings": ["savings", "investments", "emergency fund"],
     "debt": ["credit card", "loans", "mortgage"]
 }
+DEFAULT_EXPENSE_TYPE = "lifestyle"
+CATEGORY_CACHE_SIZE = 4096
+
+def normalize_category(category: str) -> str:
+    return " ".join(category.lower().split())
+
+class ExpenseCategorizer:
+    # Keywords match anywhere in the category and the first group in table order wins, as before,
+    # but the whole table is one compiled pattern and each distinct category string is matched once.
+    def __init__(self, categories: Dict[str, Iterable[str]] = EXPENSE_CATEGORIES, default: str = DEFAULT_EXPENSE_TYPE,
+                 cache_size: int = CATEGORY_CACHE_SIZE):
+        self.types = list(dict.fromkeys([*categories, default]))
+        self.default = default
+        self._rank = {}
+        alternatives = []
+        for rank, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword not in self._rank:
+                    self._rank[keyword] = rank
+                    alternatives.append(re.escape(keyword))
+        # A zero-width lookahead reports a match at every position, overlapping ones included, and
+        # alternatives are listed in group order, so the smallest rank seen is the first group that matches.
+        self._pattern = re.compile(f"(?=({'|'.join(alternatives)}))") if alternatives else None
+        self.categorize = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, category: str) -> str:
+        if self._pattern is None:
+            return self.default
+        ranks = [self._rank[match.group(1)] for match in self._pattern.finditer(category.lower())]
+        return self.types[min(ranks)] if ranks else self.default
+
+    def categorize_codes(self, categories: Sequence[str], overrides: Optional[Dict[str, str]] = None) -> np.ndarray:
+        # One pass for a whole import: each distinct category is resolved once (a user's override first,
+        # then the keyword table) and every row gets the index of its type in self.types.
+        type_codes = {expense_type: code for code, expense_type in enumerate(self.types)}
+        categorize = self.categorize
+        codes = {}
+        for category in dict.fromkeys(categories):
+            expense_type = overrides.get(normalize_category(category)) if overrides else None
+            codes[category] = type_codes.get(expense_type or categorize(category), type_codes[self.default])
+        return np.fromiter(map(codes.__getitem__, categories), dtype=np.int8, count=len(categories))
+
+    def categorize_many(self, categories: Sequence[str], overrides: Optional[Dict[str, str]] = None) -> List[str]:
+        return np.array(self.types, dtype=object)[self.categorize_codes(categories, overrides)].tolist()
+
+    def type_totals(self, codes: np.ndarray, amounts: Sequence[float]) -> Dict[str, float]:
+        totals = np.bincount(codes, weights=np.asarray(amounts, dtype=np.float64), minlength=len(self.types))
+        return dict(zip(self.types, totals.tolist()))
+
+expense_categorizer = ExpenseCategorizer()
 
 def categorize_expense(category: str) -> str:
-    category_lower = category.lower()
-    
-    for cat_type, categories in EXPENSE_CATEGORIES.items():
-        if any(c in category_lower for c in categories):
-            return cat_type
-    
-    return "lifestyle"
+    return expense_categorizer.categorize(category)
 
-def analyze_spending(transactions: List[Dict], income: float) -> Dict:
+def analyze_spending(transactions: List[Dict], income: float, overrides: Optional[Dict[str, str]] = None) -> Dict:
     if not transactions:
         return {"analysis": "no_data", "recommendations": []}
     
     category_totals = {}
-    type_totals = {"essential": 0, "lifestyle": 0, "savings": 0, "debt": 0}
+    expenses = [t for t in transactions if t["type"] == "expense"]
+    for t in expenses:
+        cat = t["category"]
+        category_totals[cat] = category_totals.get(cat, 0) + t["amount"]
     
-    for t in transactions:
-        if t["type"] == "expense":
-            cat = t["category"]
-            category_totals[cat] = category_totals.get(cat, 0) + t["amount"]
-            
-            exp_type = categorize_expense(cat)
-            type_totals[exp_type] += t["amount"]
+    codes = expense_categorizer.categorize_codes([t["category"] for t in expenses], overrides)
+    type_totals = expense_categorizer.type_totals(codes, [t["amount"] for t in expenses])
     
     total_expenses = sum(category_totals.values())
     
@@ -0,0 +1,301 @@
+import bisect
+import os
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+NUTRIENTS = ("calories", "protein", "carbs", "fat", "fiber")
+# pg_trgm's default cut-off for a misspelled word to count; matching a whole name to fill in a log asks for more.
+WORD_THRESHOLD = 0.3
+MATCH_THRESHOLD = 0.5
+# Name prefix hits are ranked by length, shortest first; this many are looked at per query.
+PREFIX_SCAN = 256
+# Spellings or completions of one query word that are followed into the food lists (at most 255, they are
+# numbered in a uint8 when intersecting).
+WORD_VARIANTS = 16
+# Scores are rounded to six decimals and scaled past any name length when ranking.
+RANK_SCALE = 1e12
+# Binary searching a food list costs about this many times a linear pass per candidate.
+SEARCH_COST = 8
+WORD_CACHE_SIZE = 4096
+
+# Each array is its own .npy file so the catalog can be memory-mapped.
+ARRAYS = (
+    "keys", "key_offsets", "names", "name_offsets", "servings", "serving_offsets", "nutrients",
+    "words", "word_offsets", "word_food_offsets", "word_foods",
+    "trigram_keys", "trigram_offsets", "trigram_words", "trigram_counts"
+)
+
+NAME_TOKEN_TABLE = str.maketrans({char: " " for char in string.punctuation})
+
+def normalize_food_name(name: Optional[str]) -> str:
+    return " ".join(name.lower().translate(NAME_TOKEN_TABLE).split()) if name else ""
+
+@lru_cache(maxsize=65536)
+def word_trigrams(word: str) -> Tuple[int, ...]:
+    # pg_trgm style: the word padded with two spaces in front and one behind, three UTF-8 bytes per trigram.
+    padded = b"  " + word.encode() + b" "
+    return tuple(sorted({padded[i] << 16 | padded[i + 1] << 8 | padded[i + 2] for i in range(len(padded) - 2)}))
+
+def name_trigrams(name: str) -> Set[int]:
+    return {gram for word in name.split() for gram in word_trigrams(word)}
+
+def trigram_similarity(first_grams: Set[int], second_grams: Set[int]) -> float:
+    union = len(first_grams | second_grams)
+    return len(first_grams & second_grams) / union if union else 0.0
+
+def _pack(values: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in values], out=offsets[1:])
+    return np.frombuffer(b"".join(values), dtype=np.uint8), offsets
+
+def _csr(lists: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(values) for values in lists], out=offsets[1:])
+    return offsets, np.fromiter((value for values in lists for value in values), dtype=np.int32, count=offsets[-1])
+
+class _SortedStrings:
+    # Lets bisect walk a sorted UTF-8 blob without decoding it up front.
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.blob[self.offsets[index]:self.offsets[index + 1]].tobytes()
+
+    def range(self, prefix: bytes) -> Tuple[int, int]:
+        # 0xFF never occurs in UTF-8, so it sorts after every string that starts with the prefix.
+        start = bisect.bisect_left(self, prefix)
+        return start, bisect.bisect_left(self, prefix + b"\xff", start)
+
+    def find(self, value: bytes) -> Optional[int]:
+        index = bisect.bisect_left(self, value)
+        return index if index < len(self) and self[index] == value else None
+
+class FoodCatalog:
+    # Foods sorted by normalized name and stored column-wise: UTF-8 blobs with offsets for the strings and
+    # one float row of NUTRIENTS per serving. Search goes through the vocabulary of name words, which maps
+    # each word to the sorted foods containing it and is itself indexed by trigram for misspellings.
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.sorted_keys = _SortedStrings(self.keys, self.key_offsets)
+        self.sorted_words = _SortedStrings(self.words, self.word_offsets)
+        # Query words repeat far more than foods do; their variants are worked out once per process.
+        self.word_variants = lru_cache(maxsize=WORD_CACHE_SIZE)(self._word_variants)
+
+    def __len__(self) -> int:
+        return len(self.nutrients)
+
+    @classmethod
+    def build(cls, foods: Iterable[tuple]) -> "FoodCatalog":
+        # foods yields (name, serving_size, calories, protein, carbs, fat, fiber); the first row wins
+        # when several names normalize to the same key.
+        rows = {}
+        for food in foods:
+            key = normalize_food_name(food[0])
+            if key and key not in rows:
+                rows[key] = food
+        ordered = sorted(rows.items(), key=lambda item: item[0].encode())
+
+        keys, key_offsets = _pack([key.encode() for key, _ in ordered])
+        names, name_offsets = _pack([food[0].strip().encode() for _, food in ordered])
+        servings, serving_offsets = _pack([(food[1] or "").encode() for _, food in ordered])
+        nutrients = np.array([[value or 0 for value in food[2:7]] for _, food in ordered], dtype=np.float64).reshape(-1, len(NUTRIENTS))
+
+        word_foods = {}
+        for index, (key, _) in enumerate(ordered):
+            for word in dict.fromkeys(key.split()):
+                word_foods.setdefault(word, []).append(index)
+        vocabulary = sorted(word_foods, key=str.encode)
+        words, word_offsets = _pack([word.encode() for word in vocabulary])
+        word_food_offsets, word_food_ids = _csr([word_foods[word] for word in vocabulary])
+
+        grams = [word_trigrams(word) for word in vocabulary]
+        pairs = np.unique(np.fromiter(
+            (gram << 32 | index for index, word_grams in enumerate(grams) for gram in word_grams), dtype=np.int64
+        ))
+        trigram_keys, starts = np.unique(pairs >> 32, return_index=True)
+
+        return cls({
+            "keys": keys,
+            "key_offsets": key_offsets,
+            "names": names,
+            "name_offsets": name_offsets,
+            "servings": servings,
+            "serving_offsets": serving_offsets,
+            "nutrients": nutrients,
+            "words": words,
+            "word_offsets": word_offsets,
+            "word_food_offsets": word_food_offsets,
+            "word_foods": word_food_ids,
+            "trigram_keys": trigram_keys.astype(np.int32),
+            "trigram_offsets": np.append(starts, len(pairs)).astype(np.int64),
+            "trigram_words": (pairs & 0xFFFFFFFF).astype(np.int32),
+            "trigram_counts": np.array([len(word_grams) for word_grams in grams], dtype=np.int32)
+        })
+
+    def save(self, directory: str):
+        # Files are replaced by rename, never rewritten in place: processes still mapping the old
+        # catalog keep reading the old inodes until they restart.
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            path = os.path.join(directory, f"{name}.npy")
+            with open(path + ".tmp", "wb") as file:
+                np.save(file, getattr(self, name))
+            os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, directory: str) -> "FoodCatalog":
+        # Read-only maps: pages come from the OS page cache, shared by every process that loads the catalog.
+        return cls({name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in ARRAYS})
+
+    def food(self, index: int) -> dict:
+        name_start, name_end = self.name_offsets[index:index + 2]
+        serving_start, serving_end = self.serving_offsets[index:index + 2]
+        serving = self.servings[serving_start:serving_end].tobytes().decode()
+        return {
+            "name": self.names[name_start:name_end].tobytes().decode(),
+            "serving_size": serving or None,
+            **dict(zip(NUTRIENTS, self.nutrients[index].tolist()))
+        }
+
+    def prefix_matches(self, key: str, limit: int) -> List[int]:
+        start, stop = self.sorted_keys.range(key.encode())
+        stop = min(stop, start + PREFIX_SCAN)
+        if start == stop:
+            return []
+        lengths = np.diff(self.key_offsets[start:stop + 1])
+        return (start + np.argsort(lengths, kind="stable")[:limit]).tolist()
+
+    def similar_words(self, word: str, threshold: float = WORD_THRESHOLD) -> Dict[int, float]:
+        # Trigram Jaccard similarity against the vocabulary, which is small next to the foods.
+        grams = np.array(word_trigrams(word), dtype=np.int32)
+        if not len(self.trigram_keys):
+            return {}
+        positions = np.minimum(np.searchsorted(self.trigram_keys, grams), len(self.trigram_keys) - 1)
+        positions = positions[self.trigram_keys[positions] == grams]
+        if not len(positions):
+            return {}
+        postings = np.concatenate([
+            self.trigram_words[self.trigram_offsets[position]:self.trigram_offsets[position + 1]] for position in positions
+        ])
+        candidates, shared = np.unique(postings, return_counts=True)
+        similarity = shared / (len(grams) + self.trigram_counts[candidates] - shared)
+        keep = similarity >= threshold
+        return dict(zip(candidates[keep].tolist(), similarity[keep].tolist()))
+
+    def _word_variants(self, word: str, complete: bool) -> Dict[int, float]:
+        # Vocabulary words that may stand for a query word, weighted by how close they are: the word itself
+        # or, for the word still being typed, its completions; misspellings only when neither exists.
+        encoded = word.encode()
+        variants = {}
+        if complete:
+            start, stop = self.sorted_words.range(encoded)
+            lengths = np.diff(self.word_offsets[start:stop + 1])
+            for index in (start + np.argsort(lengths, kind="stable")[:WORD_VARIANTS]).tolist():
+                variants[index] = len(encoded) / int(lengths[index - start])
+        else:
+            exact = self.sorted_words.find(encoded)
+            if exact is not None:
+                variants[exact] = 1.0
+        if not variants:
+            variants = self.similar_words(word)
+        if len(variants) > WORD_VARIANTS:
+            variants = dict(sorted(variants.items(), key=lambda item: -item[1])[:WORD_VARIANTS])
+        return variants
+
+    def _word_foods(self, word: int) -> np.ndarray:
+        return self.word_foods[self.word_food_offsets[word]:self.word_food_offsets[word + 1]]
+
+    def _scatter_weights(self, group: Dict[int, float], candidates: np.ndarray) -> np.ndarray:
+        # The group's best weight for each candidate, 0 where none of its words occur. Foods are marked with
+        # the position of their variant in ascending weight order, heavier ones written last.
+        ordered = sorted(group.items(), key=lambda item: item[1])
+        marks = np.zeros(len(self), dtype=np.uint8)
+        for position, (word, _) in enumerate(ordered, 1):
+            marks[self._word_foods(word)] = position
+        return np.array([0.0] + [weight for _, weight in ordered])[marks[candidates]]
+
+    def word_matches(self, key: str, limit: int, complete: bool = True) -> List[int]:
+        # Foods containing every query word or a variant of it, best total weight first and shorter
+        # names before longer ones. Query words with no variant at all are ignored.
+        words = key.split()
+        groups = [self.word_variants(word, complete and position == len(words) - 1) for position, word in enumerate(words)]
+        groups = [group for group in groups if group]
+        if not groups:
+            return []
+        sized = sorted(
+            ((sum(int(self._word_foods(word).size) for word in group), group) for group in groups), key=lambda item: item[0]
+        )
+        groups = [group for _, group in sized]
+
+        # Candidates start from the group with the fewest foods. Every other group is probed by binary search,
+        # since each word's foods are sorted, unless there are so many candidates that a linear pass is cheaper.
+        if len(groups[0]) == 1:
+            (word, weight), = groups[0].items()
+            candidates = np.asarray(self._word_foods(word))
+            scores = np.full(len(candidates), weight)
+        else:
+            foods = np.concatenate([self._word_foods(word) for word in groups[0]])
+            weights = np.concatenate([np.full(self._word_foods(word).size, weight) for word, weight in groups[0].items()])
+            order = np.lexsort((-weights, foods))
+            foods, weights = foods[order], weights[order]
+            first = np.ones(len(foods), dtype=bool)
+            first[1:] = foods[1:] != foods[:-1]
+            candidates, scores = foods[first], weights[first]
+
+        for size, group in sized[1:]:
+            if len(candidates) * SEARCH_COST > size:
+                # Many candidates: look them up in the group's weights over all foods, linear in both sizes.
+                best = self._scatter_weights(group, candidates)
+            else:
+                best = np.zeros(len(candidates))
+                for word, weight in group.items():
+                    posting = self._word_foods(word)
+                    found = np.minimum(np.searchsorted(posting, candidates), len(posting) - 1)
+                    best = np.where(posting[found] == candidates, np.maximum(best, weight), best)
+            keep = best > 0
+            candidates, scores = candidates[keep], scores[keep] + best[keep]
+            if not len(candidates):
+                return []
+
+        # One sort key, score first and name length second, so the top of the list is a linear-time partition.
+        rank = np.round(scores, 6) * -RANK_SCALE + (self.key_offsets[candidates + 1] - self.key_offsets[candidates])
+        if len(candidates) > limit:
+            top = np.argpartition(rank, limit - 1)[:limit]
+            candidates, rank = candidates[top], rank[top]
+        return candidates[np.lexsort((candidates, rank))].tolist()
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        # Autocomplete: names starting with the query first, then names containing its words in any order,
+        # misspelled or, for the last word, not yet finished.
+        key = normalize_food_name(query)
+        if not key:
+            return []
+        results = self.prefix_matches(key, limit)
+        if len(results) < limit:
+            seen = set(results)
+            results.extend(index for index in self.word_matches(key, limit + len(results)) if index not in seen)
+        return results[:limit]
+
+    def match(self, name: str, threshold: float = MATCH_THRESHOLD) -> Optional[int]:
+        # The food a free-text name most likely refers to: an exact name, else the closest of the
+        # word matches by whole-name trigram similarity.
+        key = normalize_food_name(name)
+        if not key:
+            return None
+        exact = self.sorted_keys.find(key.encode())
+        if exact is not None:
+            return exact
+        best, best_similarity = None, 0.0
+        key_grams = name_trigrams(key)
+        for index in self.word_matches(key, 5, complete=False):
+            similarity = trigram_similarity(key_grams, name_trigrams(self.sorted_keys[index].decode()))
+            if similarity >= threshold and similarity > best_similarity:
+                best, best_similarity = index, similarity
+        return best
@@ -1,4 +1,6 @@
-from typing import List, Dict, Optional
+import string
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Tuple
 
 MOOD_KEYWORDS = {
     "positive": ["happy", "grateful", "excited", "peaceful", "energized", "productive", "content"],
@@ -6,12 +8,115 @@ MOOD_KEYWORDS = {
     "neutral": ["okay", "fine", "normal", "average", "stable"]
 }
 
-def analyze_journal_sentiment(content: str) -> Dict:
-    content_lower = content.lower()
-    
-    positive_count = sum(1 for word in MOOD_KEYWORDS["positive"] if word in content_lower)
-    negative_count = sum(1 for word in MOOD_KEYWORDS["negative"] if word in content_lower)
-    
+# Scored terms beyond MOOD_KEYWORDS. Multi-word phrases are matched as whole token sequences.
+SENTIMENT_TERMS = {
+    "positive": [
+        "happier", "happiest", "glad", "joy", "joyful", "thankful", "gratitude", "exciting", "calm",
+        "relaxed", "rested", "refreshed", "motivated", "inspired", "proud", "hopeful", "confident",
+        "optimistic", "accomplished", "loved", "great", "good", "wonderful", "amazing", "fun",
+        "focused", "better", "at peace"
+    ],
+    "negative": [
+        "sadder", "unhappy", "depressed", "lonely", "anxiety", "worried", "nervous", "stress",
+        "stressful", "exhausted", "drained", "sleepy", "annoyed", "irritated", "upset", "hopeless",
+        "miserable", "awful", "terrible", "bad", "worse", "sick", "scared", "afraid", "burned out",
+        "burnt out", "worn out", "fed up"
+    ]
+}
+
+NEGATIONS = frozenset([
+    "not", "no", "never", "nothing", "nobody", "none", "neither", "nor", "without", "hardly", "barely",
+    "cannot", "can't", "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't", "weren't", "won't",
+    "wouldn't", "couldn't", "shouldn't", "haven't", "hasn't", "hadn't", "ain't"
+])
+# A negation flips the next few lexicon terms ("not very happy", "not happy or calm") until the clause ends;
+# words in between that aren't terms don't count towards the scope.
+NEGATION_SCOPE = 3
+CLAUSE_BREAK = "."
+# Clause punctuation, commas included ("no sleep, anxious"), becomes a "." token, apostrophes are dropped ("don't" -> "dont") and any other
+# punctuation or digit separates words; str.translate does all of it in one C-level pass.
+TOKEN_TABLE = str.maketrans({
+    **{char: " " for char in string.punctuation + string.digits},
+    **{char: f" {CLAUSE_BREAK} " for char in ".,!?;:"},
+    "'": None,
+    "\u2019": None
+})
+
+# Token actions: (_TERM, [(following tokens, polarity)]), (_NEGATION, None) or (_BREAK, None).
+_TERM = 0
+_NEGATION = 1
+_BREAK = 2
+
+def tokenize(text: str) -> List[str]:
+    return text.lower().translate(TOKEN_TABLE).split()
+
+class SentimentEngine:
+    # Text is tokenized once and every token costs one dict lookup, so scoring is linear in the
+    # text, independent of the lexicon size, and a term never matches inside another word.
+    def __init__(self, terms: Optional[Dict[str, Iterable[str]]] = None, negations: Iterable[str] = NEGATIONS,
+                 negation_scope: int = NEGATION_SCOPE):
+        self.negation_scope = negation_scope
+        self._actions: Dict[str, tuple] = {CLAUSE_BREAK: (_BREAK, None)}
+        for negation in negations:
+            for token in tokenize(negation):
+                self._actions[token] = (_NEGATION, None)
+        if terms:
+            self.add_terms(terms)
+
+    def add_terms(self, terms: Dict[str, Iterable[str]]):
+        # Later additions win, so a custom lexicon can flip or extend the defaults.
+        for polarity_name, words in terms.items():
+            polarity = {"positive": 1, "negative": -1}.get(polarity_name)
+            if polarity is None:
+                continue
+            for word in words:
+                first, *rest = tokenize(word)
+                action = self._actions.get(first)
+                entries = [entry for entry in action[1] if entry[0] != tuple(rest)] if action and action[0] == _TERM else []
+                entries.append((tuple(rest), polarity))
+                entries.sort(key=lambda entry: -len(entry[0]))
+                self._actions[first] = (_TERM, entries)
+
+    def count(self, text: str) -> Tuple[int, int]:
+        tokens = tokenize(text)
+        actions = self._actions
+        scope = self.negation_scope
+        positive = negative = 0
+        negated_terms = 0
+        consumed_through = -1
+        # compress/map keep the per-token membership test in C; Python only sees tokens that matter.
+        for position in compress(range(len(tokens)), map(actions.__contains__, tokens)):
+            if position <= consumed_through:
+                continue
+            kind, entries = actions[tokens[position]]
+            if kind == _NEGATION:
+                negated_terms = scope
+                continue
+            if kind == _BREAK:
+                negated_terms = 0
+                continue
+            for rest, polarity in entries:
+                if rest and tuple(tokens[position + 1:position + 1 + len(rest)]) != rest:
+                    continue
+                if negated_terms:
+                    polarity = -polarity
+                    negated_terms -= 1
+                if polarity > 0:
+                    positive += 1
+                else:
+                    negative += 1
+                consumed_through = position + len(rest)
+                break
+        return positive, negative
+
+    def analyze(self, text: str) -> Dict:
+        return sentiment_result(*self.count(text))
+
+    def analyze_many(self, texts: Iterable[str]) -> List[Dict]:
+        count = self.count
+        return [sentiment_result(*count(text or "")) for text in texts]
+
+def sentiment_result(positive_count: int, negative_count: int) -> Dict:
     if positive_count > negative_count:
         sentiment = "positive"
         score = min(0.5 + (positive_count * 0.1), 1.0)
@@ -29,6 +134,12 @@ def analyze_journal_sentiment(content: str) -> Dict:
         "negative_indicators": negative_count
     }
 
+sentiment_engine = SentimentEngine(MOOD_KEYWORDS)
+sentiment_engine.add_terms(SENTIMENT_TERMS)
+
+def analyze_journal_sentiment(content: str) -> Dict:
+    return sentiment_engine.analyze(content)
+
 def detect_mood_patterns(mood_entries: List[Dict]) -> Dict:
     if len(mood_entries) < 5:
         return {"pattern": "insufficient_data", "insights": []}
@@ -1,4 +1,6 @@
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
+from .food_catalog import FoodCatalog, NUTRIENTS
 
 FOOD_DATABASE = {
     "apple": {"calories": 95, "protein": 0.5, "carbs": 25, "fat": 0.3, "fiber": 4.4},
@@ -11,14 +13,22 @@ FOOD_DATABASE = {
     "milk": {"calories": 149, "protein": 8, "carbs": 12, "fat": 8, "fiber": 0},
 }
 
-def estimate_nutrition(food_name: str) -> Dict:
-    food_lower = food_name.lower()
-    
-    for key, nutrients in FOOD_DATABASE.items():
-        if key in food_lower:
-            return nutrients
-    
-    return {"calories": 200, "protein": 5, "carbs": 25, "fat": 8, "fiber": 2}
+DEFAULT_NUTRITION = {"calories": 200, "protein": 5, "carbs": 25, "fat": 8, "fiber": 2}
+
+@lru_cache()
+def builtin_food_catalog() -> FoodCatalog:
+    # Used when no FOOD_CATALOG_PATH is configured.
+    return FoodCatalog.build(
+        (name, None, *(nutrients[field] for field in NUTRIENTS)) for name, nutrients in FOOD_DATABASE.items()
+    )
+
+def estimate_nutrition(food_name: str, catalog: Optional[FoodCatalog] = None) -> Dict:
+    catalog = catalog or builtin_food_catalog()
+    index = catalog.match(food_name)
+    if index is None:
+        return dict(DEFAULT_NUTRITION)
+    food = catalog.food(index)
+    return {field: food[field] for field in NUTRIENTS}
 
 def analyze_daily_nutrition(food_logs: List[Dict], goals: Dict) -> Dict:
     totals = {"calories": 0, "protein": 0, "carbs": 0, "fat": 0, "fiber": 0}
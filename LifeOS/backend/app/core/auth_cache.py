@@ -0,0 +1,112 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Set
+from sqlalchemy import event
+from .config import settings
+from ..models.user import User
+
+class Principal:
+    __slots__ = ("id", "email", "username", "is_active")
+
+    def __init__(self, id: int, email: str, username: str, is_active: bool):
+        self.id = id
+        self.email = email
+        self.username = username
+        self.is_active = is_active
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.email, user.username, bool(user.is_active))
+
+class AuthCache:
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.auth_count = 0
+        self.auth_seconds_total = 0.0
+        self.auth_seconds_max = 0.0
+
+    def get(self, token: str) -> Optional[Principal]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires_at = entry
+            if expires_at <= now:
+                self._discard(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def set(self, token: str, principal: Principal, token_expires_at: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        with self._lock:
+            self._discard(token)
+            self._entries[token] = (principal, expires_at)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._discard(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def record_auth(self, seconds: float):
+        with self._lock:
+            self.auth_count += 1
+            self.auth_seconds_total += seconds
+            self.auth_seconds_max = max(self.auth_seconds_max, seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "auth_requests": self.auth_count,
+                "auth_avg_ms": round(self.auth_seconds_total / self.auth_count * 1000, 3) if self.auth_count else 0.0,
+                "auth_max_ms": round(self.auth_seconds_max * 1000, 3)
+            }
+
+    def _discard(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_tokens = self._tokens_by_user.get(entry[0].id)
+        if user_tokens is not None:
+            user_tokens.discard(token)
+            if not user_tokens:
+                del self._tokens_by_user[entry[0].id]
+
+auth_cache = AuthCache(settings.auth_cache_size, settings.auth_cache_ttl_seconds)
+
+# Only reaches this process's cache; other workers hold stale entries until the TTL expires them.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    auth_cache.invalidate_user(target.id)
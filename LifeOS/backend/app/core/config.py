@@ -1,11 +1,29 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     database_url: str
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    async_database: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: Optional[int] = None
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_queue_limit: int = 32
+    auth_cache_size: int = 10000
+    auth_cache_ttl_seconds: int = 60
+    result_cache_backend: str = "memory"
+    result_cache_size: int = 10000
+    result_cache_ttl_seconds: int = 300
+    redis_url: Optional[str] = None
+    food_catalog_path: Optional[str] = None
 
     class Config:
         env_file = ".env"
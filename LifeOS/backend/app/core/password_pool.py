@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Optional
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+from .config import settings
+
+_contexts = {}
+
+def _crypt_context(rounds: int) -> CryptContext:
+    context = _contexts.get(rounds)
+    if context is None:
+        context = _contexts[rounds] = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+    return context
+
+def _hash(password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(password)
+
+def _verify(password: str, hashed_password: str, rounds: int) -> bool:
+    return _crypt_context(rounds).verify(password, hashed_password)
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_limit: int, rounds: int):
+        self.workers = workers
+        self.rounds = rounds
+        self._slots = BoundedSemaphore(workers + queue_limit) if workers > 0 else None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, password, hashed_password, self.rounds)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            return await run_in_threadpool(fn, *args)
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        # Awaited on the event loop so queued requests do not each park a threadpool thread.
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn rather than fork: the server process has threads and open DB connections.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+password_hasher = PasswordHasher(
+    settings.password_hash_workers,
+    settings.password_hash_queue_limit,
+    settings.bcrypt_rounds
+)
@@ -0,0 +1,256 @@
+import pickle
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .config import settings
+from ..utils.logger import logger
+
+PENDING_TAGS_KEY = "result_cache_pending_tags"
+
+def user_tag(user_id: int, domain: str) -> str:
+    return f"user:{user_id}:{domain}"
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Tag versions are never evicted; a reset counter could make an old entry look current again.
+        self._tag_versions: Dict[str, int] = {}
+        self._key_locks: Dict[str, list] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: int):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.time() + ttl_seconds)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        with self._lock:
+            return [self._tag_versions.get(tag, 0) for tag in tags]
+
+    def bump_tags(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        with self._lock:
+            holder = self._key_locks.setdefault(key, [Lock(), 0])
+            holder[1] += 1
+        acquired = holder[0].acquire(timeout=timeout)
+        try:
+            yield
+        finally:
+            if acquired:
+                holder[0].release()
+            with self._lock:
+                holder[1] -= 1
+                if not holder[1]:
+                    del self._key_locks[key]
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_versions.clear()
+
+class RedisBackend:
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "lifeos:cache:"):
+        import redis
+
+        self.client = client
+        self.prefix = prefix
+        self._errors = (redis.RedisError,)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        import redis
+
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Any:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except self._errors as exc:
+            logger.warning(f"Result cache read failed: {exc}")
+            return None
+        return None if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: int):
+        try:
+            self.client.set(self.prefix + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), ex=ttl_seconds)
+        except self._errors as exc:
+            logger.warning(f"Result cache write failed: {exc}")
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        try:
+            raw = self.client.mget([self.prefix + "tag:" + tag for tag in tags])
+        except self._errors as exc:
+            logger.warning(f"Result cache read failed: {exc}")
+            return [-1] * len(tags)
+        return [int(value) if value is not None else 0 for value in raw]
+
+    def bump_tags(self, tags: Iterable[str]):
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for tag in tags:
+                pipeline.incr(self.prefix + "tag:" + tag)
+            pipeline.execute()
+        except self._errors as exc:
+            # Entries for these tags stay readable until their TTL runs out.
+            logger.error(f"Result cache invalidation failed: {exc}")
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        lock = self.client.lock(self.prefix + "lock:" + key, timeout=timeout, blocking_timeout=timeout)
+        try:
+            acquired = lock.acquire()
+        except self._errors:
+            acquired = False
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    lock.release()
+                except self._errors:
+                    pass
+
+    def size(self) -> Optional[int]:
+        return None
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+class ResultCache:
+    def __init__(self, backend, ttl_seconds: int, lock_timeout_seconds: float = 10.0):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def cached(self, namespace: str, domains: Sequence[str], ttl_seconds: Optional[int] = None, key: Optional[Callable[..., str]] = None):
+        # Wraps fn(db, user_id, *args). Entries are keyed by user, today's date and the remaining
+        # arguments (or key(*args, **kwargs)), and go stale when any of the user's domains is written.
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(db: Session, user_id: int, *args, **kwargs):
+                if key is not None:
+                    suffix = key(*args, **kwargs)
+                else:
+                    suffix = ",".join([repr(arg) for arg in args] + [f"{k}={v!r}" for k, v in sorted(kwargs.items())])
+                cache_key = f"{namespace}:{user_id}:{date.today().isoformat()}:{suffix}"
+                tags = [user_tag(user_id, domain) for domain in domains]
+                return self.get_or_compute(cache_key, tags, lambda: fn(db, user_id, *args, **kwargs), ttl_seconds)
+
+            wrapper.uncached = fn
+            return wrapper
+        return decorator
+
+    def get_or_compute(self, key: str, tags: Sequence[str], compute: Callable[[], Any], ttl_seconds: Optional[int] = None) -> Any:
+        versions = self.backend.tag_versions(tags)
+        entry = self.backend.get(key)
+        if entry is not None and entry[0] == versions:
+            self._count("hits")
+            return entry[1]
+
+        # Single flight: concurrent misses on one key wait for the first caller instead of all recomputing.
+        with self.backend.lock(key, self.lock_timeout_seconds):
+            versions = self.backend.tag_versions(tags)
+            entry = self.backend.get(key)
+            if entry is not None and entry[0] == versions:
+                self._count("coalesced")
+                return entry[1]
+
+            self._count("misses")
+            value = compute()
+            # Stored against the versions read before computing, so a write that commits mid-compute
+            # leaves this entry stale rather than caching pre-write data as current.
+            self.backend.set(key, (versions, value), ttl_seconds or self.ttl_seconds)
+            return value
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        self.backend.bump_tags(tags)
+        self._count("invalidations")
+
+    def invalidate_after_commit(self, db: Session, user_id: int, domain: str):
+        # Invalidating before commit would let a concurrent reader re-cache the old rows.
+        db.info.setdefault(PENDING_TAGS_KEY, set()).add(user_tag(user_id, domain))
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "backend": self.backend.name,
+                "size": self.backend.size(),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations
+            }
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+def build_backend(config=settings):
+    if config.result_cache_backend == "redis":
+        if not config.redis_url:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis requires REDIS_URL")
+        return RedisBackend.from_url(config.redis_url)
+    if config.result_cache_backend == "memory":
+        return MemoryBackend(config.result_cache_size)
+    raise RuntimeError(f"Unknown result cache backend: {config.result_cache_backend}")
+
+result_cache = ResultCache(build_backend(), settings.result_cache_ttl_seconds)
+
+@event.listens_for(Session, "after_commit")
+def _fire_pending_invalidations(session):
+    tags = session.info.pop(PENDING_TAGS_KEY, None)
+    if tags:
+        result_cache.invalidate_tags(tags)
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_invalidations(session):
+    session.info.pop(PENDING_TAGS_KEY, None)
@@ -1,25 +1,31 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from .config import settings
-from .database import get_db
+from .database import get_db, get_async_db
+from .auth_cache import Principal, auth_cache
+from .password_pool import password_hasher
 from ..models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
+    if "sub" in to_encode:
+        # RFC 7519 requires a string subject; python-jose rejects integers on decode.
+        to_encode["sub"] = str(to_encode["sub"])
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -35,22 +41,71 @@ def decode_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _user_id_from_token(token: str) -> tuple:
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
-    user_id: int = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise _credentials_exception()
+    return user_id, payload.get("exp")
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    started = time.perf_counter()
+    try:
+        principal = auth_cache.get(token)
+        if principal is not None:
+            return principal
+        
+        user_id, expires_at = _user_id_from_token(token)
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise _credentials_exception()
+        
+        principal = Principal.from_user(user)
+        auth_cache.set(token, principal, expires_at)
+        return principal
+    finally:
+        auth_cache.record_auth(time.perf_counter() - started)
+
+async def get_current_principal_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    started = time.perf_counter()
+    try:
+        principal = auth_cache.get(token)
+        if principal is not None:
+            return principal
+        
+        user_id, expires_at = _user_id_from_token(token)
+        user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+        if user is None:
+            raise _credentials_exception()
+        
+        principal = Principal.from_user(user)
+        auth_cache.set(token, principal, expires_at)
+        return principal
+    finally:
+        auth_cache.record_auth(time.perf_counter() - started)
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    user_id, _ = _user_id_from_token(token)
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
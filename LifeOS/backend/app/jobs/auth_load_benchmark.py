@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import sys
+import httpx
+from .load_benchmark import start_server, wait_until_ready, login, run_load
+from ..utils.logger import logger
+
+async def login_storm(client: httpx.AsyncClient, email: str, password: str, stop: asyncio.Event, counts: dict):
+    while not stop.is_set():
+        response = await client.post("/api/auth/login", json={"email": email, "password": password})
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+async def benchmark(args) -> dict:
+    server = start_server(args.port, False, args.workers)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client, \
+                httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=httpx.Limits(max_connections=args.logins)) as storm_client:
+            await wait_until_ready(client, server)
+            headers = await login(client, args.email, args.password)
+
+            results = {}
+            for path in args.endpoints:
+                await run_load(client, headers, path, args.concurrency, args.concurrency)
+                results[path] = {"idle": await run_load(client, headers, path, args.requests, args.concurrency)}
+
+            stop = asyncio.Event()
+            login_counts = {}
+            storm = [
+                asyncio.create_task(login_storm(storm_client, args.email, args.password, stop, login_counts))
+                for _ in range(args.logins)
+            ]
+            await asyncio.sleep(1.0)
+            for path in args.endpoints:
+                results[path]["storm"] = await run_load(client, headers, path, args.requests, args.concurrency)
+            stop.set()
+            await asyncio.gather(*storm)
+
+            return {"endpoints": results, "logins": login_counts}
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure endpoint latency while a login storm is running")
+    parser.add_argument("--email", default="demo@lifeos.com")
+    parser.add_argument("--password", default="demo123")
+    parser.add_argument("--logins", type=int, default=64, help="concurrent login loops")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--endpoints", nargs="+", default=["/api/habits/", "/api/insights/dashboard"])
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args))
+
+    for path, result in results["endpoints"].items():
+        idle, storm = result["idle"], result["storm"]
+        logger.info(
+            f"{path}: idle p50 {idle['p50_ms']:.1f}ms p95 {idle['p95_ms']:.1f}ms | "
+            f"during logins p50 {storm['p50_ms']:.1f}ms p95 {storm['p95_ms']:.1f}ms"
+        )
+    logger.info(f"Login responses during the storm: {results['logins']}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+import time
+from ..core.database import SessionLocal
+from ..services.rollup_service import rebuild_all_rollups
+from ..utils.logger import logger
+
+def main():
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rebuilt = rebuild_all_rollups(db)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Rebuilt daily rollups for {rebuilt} users in {elapsed:.2f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
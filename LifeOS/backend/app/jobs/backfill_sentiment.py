@@ -0,0 +1,47 @@
+import argparse
+import sys
+import time
+from sqlalchemy import select
+from ..core.database import SessionLocal
+from ..models import user  # registers the users table the journal and data version foreign keys point at
+from ..models.mood import JournalEntry
+from ..services.mood_service import score_journal_entries
+from ..services.data_version_service import bump_data_versions, MOOD
+from ..utils.logger import logger
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Store sentiment scores on journal entries that do not have one yet")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="entries per transaction")
+    parser.add_argument("--rescore", action="store_true", help="rescore every entry, e.g. after a lexicon change")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scored = 0
+    after_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            statement = select(JournalEntry.id, JournalEntry.user_id, JournalEntry.content).where(JournalEntry.id > after_id)
+            if not args.rescore:
+                statement = statement.where(JournalEntry.sentiment.is_(None))
+            rows = db.execute(statement.order_by(JournalEntry.id).limit(args.chunk_size)).all()
+            if not rows:
+                break
+
+            scored += score_journal_entries(db, [(row.id, row.content) for row in rows])
+            # Journal responses now carry the score, so cached copies must revalidate.
+            bump_data_versions(db, [row.user_id for row in rows], MOOD)
+            db.commit()
+
+            after_id = rows[-1].id
+            elapsed = time.perf_counter() - started
+            logger.info(f"Scored {scored} journal entries ({scored / elapsed:.0f} entries/s)")
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Backfilled sentiment for {scored} journal entries in {elapsed:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
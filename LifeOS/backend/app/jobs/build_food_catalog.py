@@ -0,0 +1,29 @@
+import argparse
+import csv
+import sys
+import time
+from ..ai.food_catalog import FoodCatalog, NUTRIENTS
+from ..utils.logger import logger
+
+def read_foods(path: str):
+    # CSV with a `name` column, optional `serving_size` and any of the NUTRIENTS columns (missing ones are 0).
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield (row["name"], row.get("serving_size") or None, *(float(row.get(field) or 0) for field in NUTRIENTS))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the memory-mapped food catalog from a CSV nutrient dataset")
+    parser.add_argument("path", help="CSV file with name, serving_size, calories, protein, carbs, fat, fiber columns")
+    parser.add_argument("output", help="directory to write the catalog to; point FOOD_CATALOG_PATH at it")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    catalog = FoodCatalog.build(read_foods(args.path))
+    catalog.save(args.output)
+    elapsed = time.perf_counter() - started
+
+    logger.info(f"Built a catalog of {len(catalog)} foods with {len(catalog.trigram_keys)} trigrams in {elapsed:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import sys
+from datetime import date, timedelta
+from sqlalchemy import select, text, tuple_
+from ..core.database import engine
+from ..models.habit import Habit, HabitLog
+from ..models.mood import MoodEntry, JournalEntry, JournalTag, JournalTagCount
+from ..models.nutrition import FoodLog, WaterLog
+from ..models.finance import Transaction
+from ..models.ai_scores import LifeScore, AIInsight
+from ..models.rollup import DailyHabit, DailyNutrition, DailyMood, DailyFinance
+from ..utils.logger import logger
+
+def hot_queries(user_id: int = 1) -> dict:
+    today = date.today()
+    since = today - timedelta(days=30)
+
+    return {
+        "active_habits": select(Habit).where(Habit.user_id == user_id, Habit.is_active == True),
+        "habit_streaks": select(HabitLog.habit_id, HabitLog.completed_at).where(
+            HabitLog.habit_id.in_([1, 2, 3]),
+            HabitLog.user_id == user_id,
+            HabitLog.completed_at >= since
+        ),
+        "habit_logs_today": select(HabitLog).where(HabitLog.user_id == user_id, HabitLog.completed_at == today),
+        "mood_entries": select(MoodEntry).where(MoodEntry.user_id == user_id, MoodEntry.logged_at >= since),
+        "journal_entries": select(JournalEntry).where(JournalEntry.user_id == user_id, JournalEntry.logged_at >= since),
+        "journal_by_tag": select(JournalEntry).where(
+            JournalEntry.user_id == user_id,
+            JournalEntry.logged_at >= since,
+            JournalEntry.id.in_(select(JournalTag.journal_id).where(JournalTag.user_id == user_id, JournalTag.tag == "work"))
+        ),
+        "journal_tag_counts": select(JournalTagCount).where(JournalTagCount.user_id == user_id),
+        "journal_search_refresh": select(JournalEntry).where(JournalEntry.user_id == user_id, JournalEntry.search_revision > 0),
+        "food_logs": select(FoodLog).where(FoodLog.user_id == user_id, FoodLog.logged_at >= since),
+        "water_logs": select(WaterLog).where(WaterLog.user_id == user_id, WaterLog.logged_at >= since),
+        "transactions": select(Transaction).where(
+            Transaction.user_id == user_id,
+            Transaction.transaction_date >= since
+        ),
+        "transactions_page": select(Transaction).where(
+            Transaction.user_id == user_id,
+            Transaction.transaction_date >= since,
+            tuple_(Transaction.transaction_date, Transaction.id) < tuple_(today, 1000)
+        ).order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(101),
+        "life_scores": select(LifeScore).where(LifeScore.user_id == user_id, LifeScore.calculated_at >= since),
+        "insights_generated": select(AIInsight).where(
+            AIInsight.user_id == user_id,
+            AIInsight.generated_at >= since
+        ),
+        "insights_unread": select(AIInsight).where(
+            AIInsight.user_id == user_id,
+            AIInsight.is_read == 0
+        ).order_by(AIInsight.priority.desc()),
+        "daily_habits": select(DailyHabit).where(DailyHabit.user_id == user_id, DailyHabit.day >= since),
+        "daily_nutrition": select(DailyNutrition).where(DailyNutrition.user_id == user_id, DailyNutrition.day >= since),
+        "daily_mood": select(DailyMood).where(DailyMood.user_id == user_id, DailyMood.day >= since),
+        "daily_finance": select(DailyFinance).where(DailyFinance.user_id == user_id, DailyFinance.day >= since),
+    }
+
+def explain(connection, statement) -> list:
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+
+    if connection.dialect.name == "postgresql":
+        return [row[0] for row in connection.execute(text(f"EXPLAIN {sql}"))]
+
+    return [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+def is_sequential_scan(dialect_name: str, plan_line: str) -> bool:
+    if dialect_name == "postgresql":
+        return "Seq Scan" in plan_line
+    return plan_line.startswith("SCAN ") and "INDEX" not in plan_line
+
+def main() -> int:
+    failures = []
+
+    with engine.connect() as connection:
+        dialect_name = connection.dialect.name
+        if dialect_name == "postgresql":
+            # Small tables are cheaper to scan; only fail when no index can serve the query.
+            connection.execute(text("SET enable_seqscan = off"))
+
+        for name, statement in hot_queries().items():
+            plan = explain(connection, statement)
+            if any(is_sequential_scan(dialect_name, line) for line in plan):
+                failures.append(name)
+                logger.error(f"Sequential scan in {name}: {' | '.join(plan)}")
+
+    if failures:
+        logger.error(f"{len(failures)} hot queries fall back to a sequential scan")
+        return 1
+
+    logger.info("All hot queries are served by an index")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
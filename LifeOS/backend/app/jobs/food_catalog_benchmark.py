@@ -0,0 +1,101 @@
+import argparse
+import sys
+import tempfile
+import time
+from typing import Callable, List
+import numpy as np
+from ..ai.food_catalog import ARRAYS, FoodCatalog
+from ..utils.logger import logger
+
+FOODS = [
+    "chicken", "breast", "thigh", "salmon", "fillet", "tuna", "beef", "steak", "pork", "chop", "turkey", "tofu", "tempeh",
+    "egg", "rice", "brown", "quinoa", "oatmeal", "pasta", "bread", "bagel", "tortilla", "potato", "sweet", "apple",
+    "banana", "orange", "strawberries", "blueberries", "mango", "pineapple", "grapes", "avocado", "tomato", "broccoli",
+    "spinach", "kale", "carrot", "peas", "lentils", "chickpeas", "black", "beans", "almonds", "walnuts", "peanut",
+    "butter", "yogurt", "greek", "milk", "cheddar", "cheese", "mozzarella", "cottage", "olive", "oil", "hummus",
+    "grilled", "roasted", "baked", "fried", "steamed", "raw", "smoked", "spicy", "low", "fat", "whole", "grain",
+    "organic", "slices", "bowl", "wrap", "salad", "soup", "bar", "smoothie", "sandwich", "pie", "muffin", "stir", "fry"
+]
+ONSETS = ["", "b", "br", "c", "ch", "cr", "d", "f", "fl", "g", "gr", "h", "j", "k", "l", "m", "n", "p", "pl", "qu", "r",
+          "s", "sh", "sl", "st", "t", "tr", "v", "w", "z"]
+VOWELS = ["a", "e", "i", "o", "u", "ai", "ea", "ee", "ie", "oo", "ou"]
+CODAS = ["", "", "", "l", "m", "n", "r", "s", "t", "ck", "nd", "ng", "rt", "sh", "st"]
+
+def synthetic_vocabulary(n_words: int, rng: np.random.Generator) -> List[str]:
+    # Real food words first, then pronounceable made-up words of two to four syllables, like the brand
+    # names, dishes and ingredients of a large nutrient dataset.
+    words = dict.fromkeys(FOODS)
+    while len(words) < n_words:
+        syllables = rng.integers(2, 5)
+        words.setdefault("".join(
+            ONSETS[rng.integers(len(ONSETS))] + VOWELS[rng.integers(len(VOWELS))] + CODAS[rng.integers(len(CODAS))]
+            for _ in range(syllables)
+        ))
+    return list(words)[:n_words]
+
+def synthetic_foods(n_items: int, n_words: int, seed: int = 0) -> list:
+    # Names of two to six words drawn with Zipf-like frequencies, so common words such as "chicken" occur in
+    # thousands of foods and most of the vocabulary in a handful.
+    rng = np.random.default_rng(seed)
+    vocabulary = synthetic_vocabulary(n_words, rng)
+    frequencies = 1 / np.arange(1, len(vocabulary) + 1)
+    frequencies /= frequencies.sum()
+    names = {}
+    while len(names) < n_items:
+        lengths = rng.integers(2, 7, n_items)
+        drawn = rng.choice(len(vocabulary), int(lengths.sum()), p=frequencies).tolist()
+        position = 0
+        for length in lengths.tolist():
+            names.setdefault(" ".join(dict.fromkeys(vocabulary[index] for index in drawn[position:position + length])))
+            position += length
+    values = rng.uniform(0, 1, (n_items, 5)) * [800, 60, 120, 50, 15]
+    return [(name, "100 g", *row) for name, row in zip(list(names)[:n_items], np.round(values, 1).tolist())]
+
+def typo(name: str, rng: np.random.Generator) -> str:
+    position = int(rng.integers(1, len(name)))
+    return name[:position - 1] + name[position] + name[position - 1] + name[position + 1:]
+
+def timed(fn: Callable, queries: List[str]) -> np.ndarray:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        latencies.append(time.perf_counter() - started)
+    return np.array(latencies) * 1000
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time food catalog autocomplete and name matching on a synthetic catalog")
+    parser.add_argument("--items", type=int, default=150000)
+    parser.add_argument("--words", type=int, default=40000, help="distinct words the names are drawn from")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    foods = synthetic_foods(args.items, args.words)
+    started = time.perf_counter()
+    built = FoodCatalog.build(foods)
+    build_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        built.save(directory)
+        catalog = FoodCatalog.load(directory)
+        size_mb = sum(getattr(catalog, name).nbytes for name in ARRAYS) / 2**20
+
+        names = [foods[index][0] for index in rng.integers(0, len(foods), args.queries)]
+        scenarios = {
+            "prefix": (lambda query: catalog.search(query, 10), [name[:int(rng.integers(2, 8))] for name in names]),
+            "fuzzy": (lambda query: catalog.search(query, 10), [typo(max(name.split(), key=len), rng) for name in names]),
+            "exact match": (catalog.match, names),
+            "typo match": (catalog.match, [typo(name, rng) for name in names])
+        }
+        logger.info(f"{len(catalog)} foods, {len(catalog.word_offsets) - 1} words, built in {build_seconds:.2f}s, {size_mb:.1f} MB mapped")
+        for label, (fn, queries) in scenarios.items():
+            latencies = timed(fn, queries)
+            logger.info(
+                f"{label}: p50 {np.percentile(latencies, 50):.3f}ms, p99 {np.percentile(latencies, 99):.3f}ms, "
+                f"max {latencies.max():.3f}ms"
+            )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+import time
+from ..core.database import SessionLocal
+from ..services.import_service import IMPORTS, import_rows, read_csv_rows
+from ..utils.logger import logger
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk import transactions, food logs or habit logs for one user")
+    parser.add_argument("domain", choices=list(IMPORTS))
+    parser.add_argument("path", help="JSON array or CSV file")
+    parser.add_argument("--user-id", type=int, required=True)
+    args = parser.parse_args()
+    
+    with open(args.path, "rb") as f:
+        content = f.read()
+    
+    if args.path.lower().endswith(".csv"):
+        rows = read_csv_rows(content)
+    else:
+        rows = json.loads(content)
+    
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = import_rows(db, args.domain, args.user_id, rows)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    
+    written = result["inserted"] + result["updated"]
+    logger.info(
+        f"Imported {written} of {result['received']} {args.domain} rows in {elapsed:.2f}s "
+        f"({result['received'] / elapsed:.0f} rows/s), {result['failed']} failed"
+    )
+    for error in result["errors"]:
+        logger.error(f"Row {error['row']}: {error['field']}: {error['message']}")
+    
+    return 1 if result["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import httpx
+from ..utils.logger import logger
+
+ENDPOINTS = [
+    "/api/insights/dashboard",
+    "/api/habits/",
+    "/api/mood/",
+    "/api/mood/journal",
+    "/api/nutrition/food",
+    "/api/finance/transactions",
+    "/api/insights/life-score/history"
+]
+
+def start_server(port: int, async_database: bool, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, ASYNC_DATABASE="true" if async_database else "false")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env
+    )
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def run_load(client: httpx.AsyncClient, headers: dict, path: str, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+    
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors
+    }
+
+async def benchmark_mode(args, async_database: bool) -> dict:
+    server = start_server(args.port, async_database, args.workers)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60.0) as client:
+            await wait_until_ready(client, server)
+            headers = await login(client, args.email, args.password)
+            results = {}
+            for path in args.endpoints:
+                await run_load(client, headers, path, min(args.requests, args.concurrency), args.concurrency)
+                results[path] = await run_load(client, headers, path, args.requests, args.concurrency)
+            return results
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare sync and async database mode throughput")
+    parser.add_argument("--email", default="demo@lifeos.com")
+    parser.add_argument("--password", default="demo123")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS)
+    args = parser.parse_args()
+    
+    results = {}
+    for async_database in (False, True):
+        mode = "async" if async_database else "sync"
+        logger.info(f"Benchmarking {mode} mode: {args.requests} requests per endpoint at concurrency {args.concurrency}")
+        results[mode] = asyncio.run(benchmark_mode(args, async_database))
+    
+    for path in args.endpoints:
+        sync_result, async_result = results["sync"][path], results["async"][path]
+        logger.info(
+            f"{path}: sync {sync_result['rps']:.1f} req/s (p95 {sync_result['p95_ms']:.1f}ms) | "
+            f"async {async_result['rps']:.1f} req/s (p95 {async_result['p95_ms']:.1f}ms) | "
+            f"speedup {async_result['rps'] / sync_result['rps']:.2f}x"
+        )
+        if sync_result["errors"] or async_result["errors"]:
+            logger.error(f"{path}: {sync_result['errors']} sync and {async_result['errors']} async requests failed")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from typing import Iterator, List
+from sqlalchemy import exists, select
+from ..core.database import SessionLocal
+from ..models.user import User
+from ..models.ai_scores import LifeScore
+from ..services.life_score_service import score_users
+from ..utils.logger import logger
+
+def pending_user_ids(day: date, after_id: int, limit: int) -> List[int]:
+    # Users already scored for the day are skipped, so a crashed run resumes where it stopped.
+    db = SessionLocal()
+    try:
+        return db.execute(
+            select(User.id).where(
+                User.is_active == True,
+                User.id > after_id,
+                ~exists().where(LifeScore.user_id == User.id, LifeScore.calculated_at == day)
+            ).order_by(User.id).limit(limit)
+        ).scalars().all()
+    finally:
+        db.close()
+
+def iter_chunks(day: date, chunk_size: int) -> Iterator[List[int]]:
+    after_id = 0
+    while True:
+        user_ids = pending_user_ids(day, after_id, chunk_size)
+        if not user_ids:
+            return
+        yield user_ids
+        after_id = user_ids[-1]
+
+def score_chunk(user_ids: List[int], day: date, vectorized: bool = True) -> int:
+    db = SessionLocal()
+    try:
+        return score_users(db, user_ids, day, vectorized)
+    finally:
+        db.close()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Precompute today's LifeScore and AIInsight rows for every active user")
+    parser.add_argument("--chunk-size", type=int, default=500, help="users per transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes; 1 scores in-process")
+    parser.add_argument("--scalar", action="store_true", help="score user by user instead of with the NumPy kernel")
+    args = parser.parse_args()
+    
+    day = date.today()
+    started = time.perf_counter()
+    scored = 0
+    
+    def report(count: int):
+        nonlocal scored
+        scored += count
+        elapsed = time.perf_counter() - started
+        logger.info(f"Scored {scored} users ({scored / elapsed:.0f} users/s)")
+    
+    if args.workers <= 1:
+        for user_ids in iter_chunks(day, args.chunk_size):
+            report(score_chunk(user_ids, day, not args.scalar))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            in_flight = set()
+            for user_ids in iter_chunks(day, args.chunk_size):
+                # Bounded so a large user table is never materialized as queued futures.
+                if len(in_flight) >= args.workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report(future.result())
+                in_flight.add(pool.submit(score_chunk, user_ids, day, not args.scalar))
+            for future in wait(in_flight).done:
+                report(future.result())
+    
+    elapsed = time.perf_counter() - started
+    logger.info(f"Scored {scored} users for {day} in {elapsed:.2f}s ({scored / elapsed if elapsed else 0:.0f} users/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
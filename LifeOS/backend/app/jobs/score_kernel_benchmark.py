@@ -0,0 +1,206 @@
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Dict, List
+import numpy as np
+from ..services.life_score_service import WEIGHTS, SCORE_FIELDS, compute_life_score
+from ..services.score_kernel import FINANCE_INCOME, FINANCE_EXPENSE, compute_life_scores
+from ..utils.logger import logger
+
+CATEGORIES = np.array(["bills", "entertainment", "food", "rent", "salary", "shopping", "transport"])
+FINANCE_TYPE_NAMES = {FINANCE_INCOME: "income", FINANCE_EXPENSE: "expense"}
+HISTORY_DAYS = 45
+
+def synthetic_cohort(n_users: int, today: date, window_days: int = 7, seed: int = 0) -> Dict[str, np.ndarray]:
+    # Rollup-shaped rows with the edge cases the scorers branch on: users with no data in a domain,
+    # inactive habits, future-dated logs, empty food days, zero goals, untyped finance rows.
+    rng = np.random.default_rng(seed)
+    month_offset = (today - date(today.year, today.month, 1)).days
+    users = np.arange(n_users)
+
+    habit_user = np.repeat(users, rng.integers(0, 4, n_users))
+    habit_id = np.arange(1, len(habit_user) + 1)
+    active = rng.random(len(habit_user)) < 0.85
+    # Each habit is logged on a random subset of the last HISTORY_DAYS days, plus the odd future day.
+    done = rng.random((len(habit_user), HISTORY_DAYS + 1)) < rng.uniform(0.2, 0.95, (len(habit_user), 1))
+    log_habit_index, log_offset = np.nonzero(done)
+    log_offset = log_offset - 1
+
+    def days_with_rows(probability: float, days: int):
+        user, offset = np.nonzero(rng.random((n_users, days + 1)) < probability)
+        return user, offset
+
+    nutrition_user, _ = days_with_rows(0.6, window_days)
+    nutrition_entries = rng.integers(0, 5, len(nutrition_user))
+    nutrition_values = rng.uniform(0, 1, (len(nutrition_user), 4)) * [3000, 150, 400, 120] * (nutrition_entries > 0)[:, None]
+    goals = np.tile([2000.0, 50.0, 250.0, 65.0], (n_users, 1))
+    custom = rng.random(n_users) < 0.4
+    goals[custom] = rng.uniform(0, 1, (custom.sum(), 4)) * [3500, 200, 400, 120]
+    goals[rng.random(n_users) < 0.02, 1] = 0
+
+    mood_user, _ = days_with_rows(0.5, window_days)
+    mood_entries = rng.integers(1, 4, len(mood_user))
+    sleep_entries = rng.integers(0, mood_entries + 1)
+    mood_values = np.column_stack([
+        rng.integers(1, 11, len(mood_user)) * mood_entries,
+        rng.integers(1, 11, len(mood_user)) * mood_entries,
+        rng.integers(1, 11, len(mood_user)) * mood_entries,
+        rng.integers(3, 10, len(mood_user)) * sleep_entries,
+        sleep_entries
+    ]).astype(np.float64)
+
+    finance_user, finance_offset = days_with_rows(0.3, max(month_offset, window_days))
+    finance_type = rng.choice([0, FINANCE_INCOME, FINANCE_EXPENSE], len(finance_user), p=[0.05, 0.15, 0.8]).astype(np.int8)
+    finance_category = rng.integers(0, len(CATEGORIES), len(finance_user))
+    finance_amount = np.round(np.where(
+        finance_type == FINANCE_INCOME, rng.uniform(500, 4000, len(finance_user)), rng.uniform(1, 400, len(finance_user))
+    ), 2)
+
+    # At most one budget per (user, category), like the unique constraint.
+    budget_user, budget_category = np.nonzero(rng.random((n_users, len(CATEGORIES))) < 0.15)
+    budget_limit = np.round(rng.uniform(50, 1500, len(budget_user)), 2)
+
+    return {
+        "today": today,
+        "window_days": window_days,
+        "month_offset": month_offset,
+        "user_ids": users + 1,
+        "habit_user": habit_user[active],
+        "habit_id": habit_id[active],
+        "log_user": habit_user[log_habit_index],
+        "log_habit": habit_id[log_habit_index],
+        "log_offset": log_offset.astype(np.int64),
+        "nutrition_user": nutrition_user,
+        "nutrition_entries": nutrition_entries,
+        "nutrition_values": nutrition_values,
+        "goals": goals,
+        "mood_user": mood_user,
+        "mood_entries": mood_entries,
+        "mood_values": mood_values,
+        "finance_user": finance_user,
+        "finance_offset": finance_offset.astype(np.int64),
+        "finance_type": finance_type,
+        "finance_category": finance_category,
+        "finance_entries": rng.integers(1, 4, len(finance_user)),
+        "finance_amount": finance_amount,
+        "budget_user": budget_user,
+        "budget_category": budget_category,
+        "budget_limit": budget_limit,
+        "categories": CATEGORIES
+    }
+
+def scalar_inputs(cohort: Dict[str, np.ndarray], start: int, stop: int) -> List[dict]:
+    # The same rows in the shape load_score_inputs_bulk produces, for users [start, stop).
+    today = cohort["today"]
+    days = [today - timedelta(days=int(offset)) for offset in range(-1, 400)]
+    categories = cohort["categories"].tolist()
+
+    def rows_by_user(user_column: str, *columns: str):
+        user = cohort[user_column]
+        selected = np.nonzero((user >= start) & (user < stop))[0]
+        grouped = [[] for _ in range(stop - start)]
+        values = [cohort[column][selected].tolist() for column in columns]
+        for position, index in enumerate(user[selected].tolist()):
+            grouped[index - start].append([column[position] for column in values])
+        return grouped
+
+    habits = rows_by_user("habit_user", "habit_id")
+    logs = rows_by_user("log_user", "log_habit", "log_offset")
+    nutrition = rows_by_user("nutrition_user", "nutrition_entries", "nutrition_values")
+    mood = rows_by_user("mood_user", "mood_entries", "mood_values")
+    finance = rows_by_user("finance_user", "finance_offset", "finance_type", "finance_category", "finance_entries", "finance_amount")
+    budgets = rows_by_user("budget_user", "budget_category", "budget_limit")
+    goals = cohort["goals"][start:stop].tolist()
+
+    inputs = []
+    for index in range(stop - start):
+        habit_dates = {}
+        for habit, offset in logs[index]:
+            habit_dates.setdefault(habit, set()).add(days[offset + 1])
+        goal = goals[index]
+        inputs.append({
+            "today": today,
+            "window_days": cohort["window_days"],
+            "habits": [SimpleNamespace(id=habit) for habit, in habits[index]],
+            "habit_dates": habit_dates,
+            "nutrition_days": [
+                SimpleNamespace(food_entries=entries, calories=values[0], protein=values[1], carbs=values[2], fat=values[3])
+                for entries, values in nutrition[index]
+            ],
+            "mood_days": [
+                SimpleNamespace(entries=entries, mood_total=values[0], energy_total=values[1], stress_total=values[2],
+                                sleep_total=values[3], sleep_entries=values[4])
+                for entries, values in mood[index]
+            ],
+            "finance_days": [
+                SimpleNamespace(day=days[offset + 1], type=FINANCE_TYPE_NAMES.get(type_, "transfer"),
+                                category=categories[category], entries=entries, amount=amount)
+                for offset, type_, category, entries, amount in finance[index]
+            ],
+            "nutrition_goal": None if goal == [2000.0, 50.0, 250.0, 65.0] else SimpleNamespace(
+                daily_calories=goal[0], daily_protein=goal[1], daily_carbs=goal[2], daily_fat=goal[3]
+            ),
+            "budgets": [SimpleNamespace(category=categories[category], monthly_limit=limit) for category, limit in budgets[index]]
+        })
+    return inputs
+
+def benchmark(n_users: int, today: date, chunk_size: int, repeat: int) -> dict:
+    cohort = synthetic_cohort(n_users, today)
+
+    kernel_seconds = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        vectorized = compute_life_scores(cohort, WEIGHTS)
+        kernel_seconds = min(kernel_seconds, time.perf_counter() - started)
+
+    # Scalar inputs are built a chunk at a time so 100k users of Python objects never coexist;
+    # only compute_life_score itself is timed.
+    scalar_seconds = 0.0
+    mismatches = 0
+    max_difference = 0.0
+    for start in range(0, n_users, chunk_size):
+        stop = min(start + chunk_size, n_users)
+        inputs = scalar_inputs(cohort, start, stop)
+        started = time.perf_counter()
+        scalar = [compute_life_score(user_inputs) for user_inputs in inputs]
+        scalar_seconds += time.perf_counter() - started
+        for field in SCORE_FIELDS:
+            expected = np.array([scores[field] for scores in scalar])
+            difference = np.abs(vectorized[field][start:stop] - expected)
+            mismatches += int(np.count_nonzero(difference > 1e-9))
+            max_difference = max(max_difference, float(difference.max(initial=0)))
+
+    return {
+        "users": n_users,
+        "scalar_seconds": scalar_seconds,
+        "kernel_seconds": kernel_seconds,
+        "speedup": scalar_seconds / kernel_seconds if kernel_seconds else float("inf"),
+        "mismatches": mismatches,
+        "max_difference": max_difference
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the NumPy life score kernel with the per-user scorer on synthetic cohorts")
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="day to score (default: today)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="users per batch of scalar inputs")
+    parser.add_argument("--repeat", type=int, default=3, help="kernel runs per cohort; the fastest is reported")
+    args = parser.parse_args()
+
+    today = args.date or date.today()
+    failed = False
+    for n_users in args.users:
+        result = benchmark(n_users, today, args.chunk_size, args.repeat)
+        logger.info(
+            f"{result['users']} users: scalar {result['scalar_seconds']:.3f}s "
+            f"({result['users'] / result['scalar_seconds']:.0f} users/s), "
+            f"kernel {result['kernel_seconds']:.3f}s ({result['users'] / result['kernel_seconds']:.0f} users/s), "
+            f"{result['speedup']:.0f}x, {result['mismatches']} mismatched scores (max difference {result['max_difference']:.2g})"
+        )
+        failed = failed or result["mismatches"] > 0
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
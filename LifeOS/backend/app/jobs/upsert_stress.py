@@ -0,0 +1,203 @@
+import argparse
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.exc import IntegrityError
+from ..core.database import SessionLocal, engine
+from ..core.security import create_access_token
+from ..main import app
+from ..models.user import User
+from ..models.habit import Habit, HabitLog
+from ..models.mood import MoodEntry
+from ..models.nutrition import WaterLog, NutritionGoal
+from ..models.finance import Budget
+from ..models.ai_scores import LifeScore
+from ..models.rollup import DailyHabit, DailyNutrition, DailyMood
+from ..models.data_version import DataVersion
+from ..utils.logger import logger
+
+# model -> natural key the endpoints upsert on
+NATURAL_KEYS = {
+    MoodEntry: ["user_id", "logged_at"],
+    WaterLog: ["user_id", "logged_at"],
+    HabitLog: ["habit_id", "user_id", "completed_at"],
+    Budget: ["user_id", "category"],
+    NutritionGoal: ["user_id"]
+}
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self._lock:
+            self.count += 1
+
+    def take(self) -> int:
+        with self._lock:
+            count, self.count = self.count, 0
+        return count
+
+def create_stress_user() -> tuple:
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:12]
+        user = User(email=f"stress-{tag}@lifeos.local", username=f"stress-{tag}", hashed_password="!")
+        db.add(user)
+        db.flush()
+        habit = Habit(user_id=user.id, name="Stress test")
+        db.add(habit)
+        db.commit()
+        return user.id, habit.id
+    finally:
+        db.close()
+
+def drop_stress_user(user_id: int):
+    db = SessionLocal()
+    try:
+        for model in (MoodEntry, DailyMood, WaterLog, DailyNutrition, HabitLog, DailyHabit, Habit, Budget, NutritionGoal, LifeScore, DataVersion):
+            db.execute(delete(model).where(model.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    finally:
+        db.close()
+
+def hammer(method: str, path: str, payload: Any, headers: dict, threads: int, requests: int) -> dict:
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker():
+        client = TestClient(app)
+        for _ in range(requests):
+            response = client.request(method, path, json=payload, headers=headers)
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for future in [pool.submit(worker) for _ in range(threads)]:
+            future.result()
+    return statuses
+
+def duplicate_keys(user_id: int) -> dict:
+    db = SessionLocal()
+    try:
+        duplicates = {}
+        for model, key in NATURAL_KEYS.items():
+            columns = [getattr(model, name) for name in key]
+            groups = db.execute(
+                select(*columns).where(model.user_id == user_id).group_by(*columns).having(func.count() > 1)
+            ).all()
+            if groups:
+                duplicates[model.__tablename__] = len(groups)
+        return duplicates
+    finally:
+        db.close()
+
+def select_then_write(user_id: int, day: date, amount_ml: int) -> bool:
+    # The read-modify-write the water endpoint used before: look the row up, then update or insert it.
+    db = SessionLocal()
+    try:
+        log = db.query(WaterLog).filter(WaterLog.user_id == user_id, WaterLog.logged_at == day).first()
+        if log:
+            log.amount_ml += amount_ml
+        else:
+            log = WaterLog(user_id=user_id, amount_ml=amount_ml, logged_at=day)
+            db.add(log)
+        db.commit()
+        db.refresh(log)
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Race concurrent writers on the same natural keys and check nothing is duplicated")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=25, help="requests per thread")
+    parser.add_argument("--keep", action="store_true", help="keep the stress user's rows")
+    args = parser.parse_args()
+
+    total = args.threads * args.requests
+    today = date.today()
+    user_id, habit_id = create_stress_user()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user_id})}"}
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    failures = []
+
+    try:
+        # Warm the auth cache so the counts below are the writes alone.
+        TestClient(app).get("/api/nutrition/goals", headers=headers)
+
+        scenarios = [
+            ("mood", "POST", "/api/mood/", {"mood_score": 7, "sleep_hours": 8, "logged_at": str(today)}),
+            ("water", "POST", "/api/nutrition/water", {"amount_ml": 250, "logged_at": str(today)}),
+            ("habit log", "POST", "/api/habits/log", {"habit_id": habit_id, "completed_at": str(today), "count": 1}),
+            ("habit log import", "POST", "/api/import/habit-logs", [{"habit_id": habit_id, "completed_at": str(today), "count": 1}] * 2),
+            ("budget", "POST", "/api/finance/budgets", {"category": "food", "monthly_limit": 300}),
+            ("nutrition goals", "PUT", "/api/nutrition/goals", {"daily_calories": 2200})
+        ]
+        for name, method, path, payload in scenarios:
+            counter.take()
+            started = time.perf_counter()
+            statuses = hammer(method, path, payload, headers, args.threads, args.requests)
+            elapsed = time.perf_counter() - started
+            statements = counter.take()
+            logger.info(
+                f"{name}: {total} concurrent writes in {elapsed:.2f}s, "
+                f"{statements / total:.2f} statements/request, responses {statuses}"
+            )
+            if set(statuses) != {200}:
+                failures.append(f"{name} returned {statuses}")
+
+        duplicates = duplicate_keys(user_id)
+        if duplicates:
+            failures.append(f"duplicate natural keys {duplicates}")
+
+        # Additive upserts must not lose increments under contention.
+        db = SessionLocal()
+        try:
+            water = db.query(WaterLog.amount_ml).filter(WaterLog.user_id == user_id, WaterLog.logged_at == today).scalar()
+            water_rollup = db.query(DailyNutrition.water_ml).filter(DailyNutrition.user_id == user_id, DailyNutrition.day == today).scalar()
+            habit_count = db.query(HabitLog.count).filter(HabitLog.habit_id == habit_id, HabitLog.completed_at == today).scalar()
+            habit_rollup = db.query(DailyHabit.log_entries).filter(DailyHabit.user_id == user_id, DailyHabit.day == today).scalar()
+        finally:
+            db.close()
+        expected = {"water_logs.amount_ml": (water, 250 * total), "daily_nutrition.water_ml": (water_rollup, 250 * total),
+                    "habit_logs.count": (habit_count, 3 * total), "daily_habits.log_entries": (habit_rollup, 1)}
+        for column, (actual, wanted) in expected.items():
+            if actual != wanted:
+                failures.append(f"{column} is {actual}, expected {wanted}")
+
+        # Baseline: the same contention through select-then-write on a fresh day.
+        legacy_day = date(today.year - 1, today.month, min(today.day, 28))
+        counter.take()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(lambda _: select_then_write(user_id, legacy_day, 250), range(total)))
+        legacy_statements = counter.take()
+        logger.info(
+            f"select-then-write baseline: {legacy_statements / total:.2f} statements/write for the row alone, "
+            f"{results.count(False)} of {total} writes failed on the unique constraint"
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+        if not args.keep:
+            drop_stress_user(user_id)
+
+    for failure in failures:
+        logger.error(failure)
+    if not failures:
+        logger.info("No duplicate natural keys and no lost increments")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,16 @@
+import time
 from fastapi import FastAPI
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
-from .core.database import engine, Base
-from .routes import auth, habits, mood, nutrition, finance, insights
-
-Base.metadata.create_all(bind=engine)
+from .core.config import settings
+from .core.auth_cache import auth_cache
+from .core.result_cache import result_cache
+from .core.database import engine, async_engine
+from .core.db_pool import pool_status
+from .core.password_pool import password_hasher
+from .services.nutrition_service import get_food_catalog
+from .utils.pagination import NEXT_CURSOR_HEADER
+from .routes import auth, habits, mood, nutrition, finance, insights, export, imports, async_api
 
 app = FastAPI(
     title="LifeOS API",
@@ -17,14 +24,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+if settings.async_database:
+    # Registered first so the async read endpoints shadow their sync counterparts.
+    for router in async_api.routers:
+        app.include_router(router)
+
 app.include_router(auth.router)
 app.include_router(habits.router)
 app.include_router(mood.router)
 app.include_router(nutrition.router)
 app.include_router(finance.router)
 app.include_router(insights.router)
+app.include_router(export.router)
+app.include_router(imports.router)
+
+@app.on_event("startup")
+def load_food_catalog():
+    # Map the catalog before the first search so a bad FOOD_CATALOG_PATH fails at boot.
+    get_food_catalog()
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
 
 @app.get("/")
 def root():
@@ -37,3 +61,29 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+def db_pool_metrics() -> dict:
+    pools = {"sync": pool_status(engine)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine)
+    return pools
+
+@app.get("/health/db")
+def db_health_check():
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        status = "healthy"
+    except Exception:
+        status = "unhealthy"
+    
+    return {
+        "status": status,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+        "pool": db_pool_metrics()
+    }
+
+@app.get("/metrics")
+def metrics():
+    return {"auth_cache": auth_cache.stats(), "result_cache": result_cache.stats(), "db_pool": db_pool_metrics()}
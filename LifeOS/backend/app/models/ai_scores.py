@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float, Text, Index, UniqueConstraint, text
 from sqlalchemy.sql import func
 from ..core.database import Base
 
 class LifeScore(Base):
     __tablename__ = "life_scores"
+    __table_args__ = (
+        Index("ix_life_scores_user_calculated", "user_id", "calculated_at", "id"),
+        UniqueConstraint("user_id", "calculated_at", name="uq_life_scores_user_calculated"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -18,6 +22,10 @@ class LifeScore(Base):
 
 class AIInsight(Base):
     __tablename__ = "ai_insights"
+    __table_args__ = (
+        Index("ix_ai_insights_user_generated", "user_id", "generated_at"),
+        Index("ix_ai_insights_user_unread", "user_id", "priority", postgresql_where=text("is_read = 0"), sqlite_where=text("is_read = 0")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
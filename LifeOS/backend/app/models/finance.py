@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from ..core.database import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_user_date", "user_id", "transaction_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -16,6 +19,9 @@ class Transaction(Base):
 
 class Budget(Base):
     __tablename__ = "budgets"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category", name="uq_budgets_user_category"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -35,3 +41,17 @@ class FinancialGoal(Base):
     deadline = Column(Date)
     is_achieved = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ExpenseCategoryOverride(Base):
+    # A user's own expense type for one of their categories; wins over the keyword table.
+    __tablename__ = "expense_category_overrides"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category", name="uq_expense_category_overrides_user_category"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    category = Column(String, nullable=False)  # lowercased, single spaced
+    expense_type = Column(String(16), nullable=False)  # essential, lifestyle, savings or debt
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
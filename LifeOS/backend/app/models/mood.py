@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Text, Float, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from ..core.database import Base
 
 class MoodEntry(Base):
     __tablename__ = "mood_entries"
+    __table_args__ = (
+        Index("ix_mood_entries_user_logged", "user_id", "logged_at", "id"),
+        UniqueConstraint("user_id", "logged_at", name="uq_mood_entries_user_logged"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -17,6 +21,10 @@ class MoodEntry(Base):
 
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
+    __table_args__ = (
+        Index("ix_journal_entries_user_logged", "user_id", "logged_at", "id"),
+        Index("ix_journal_entries_user_revision", "user_id", "search_revision"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -24,5 +32,30 @@ class JournalEntry(Base):
     content = Column(Text, nullable=False)
     mood_id = Column(Integer, ForeignKey("mood_entries.id"))
     tags = Column(String)
+    sentiment = Column(String)  # positive, negative or neutral; set from content on every write
+    sentiment_score = Column(Float)  # 0-1
+    search_revision = Column(Integer)  # the user's journal data version when title, tags or content last changed
     logged_at = Column(Date, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class JournalTag(Base):
+    # One row per tag on an entry; JournalEntry.tags keeps the text as the user typed it.
+    __tablename__ = "journal_tags"
+    __table_args__ = (
+        Index("ix_journal_tags_user_tag", "user_id", "tag", "journal_id"),
+    )
+
+    journal_id = Column(Integer, ForeignKey("journal_entries.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(255), primary_key=True)  # lowercased, trimmed and cut to 255 characters by split_tags
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+class JournalTagCount(Base):
+    # Per-user tag frequencies, maintained on every journal write.
+    __tablename__ = "journal_tag_counts"
+    __table_args__ = (UniqueConstraint("user_id", "tag", name="uq_journal_tag_counts_user_tag"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    tag = Column(String(255), nullable=False)
+    entries = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from ..core.database import Base
 
 class FoodLog(Base):
     __tablename__ = "food_logs"
+    __table_args__ = (
+        Index("ix_food_logs_user_logged", "user_id", "logged_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -20,6 +23,10 @@ class FoodLog(Base):
 
 class WaterLog(Base):
     __tablename__ = "water_logs"
+    __table_args__ = (
+        Index("ix_water_logs_user_logged", "user_id", "logged_at", "id"),
+        UniqueConstraint("user_id", "logged_at", name="uq_water_logs_user_logged"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,57 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float, UniqueConstraint
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+class DailyHabit(Base):
+    __tablename__ = "daily_habits"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uq_daily_habits_user_day"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    log_entries = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class DailyNutrition(Base):
+    __tablename__ = "daily_nutrition"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uq_daily_nutrition_user_day"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    food_entries = Column(Integer, default=0)
+    calories = Column(Float, default=0)
+    protein = Column(Float, default=0)
+    carbs = Column(Float, default=0)
+    fat = Column(Float, default=0)
+    fiber = Column(Float, default=0)
+    water_ml = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class DailyMood(Base):
+    __tablename__ = "daily_mood"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uq_daily_mood_user_day"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    entries = Column(Integer, default=0)
+    mood_total = Column(Integer, default=0)
+    energy_total = Column(Integer, default=0)
+    stress_total = Column(Integer, default=0)
+    sleep_total = Column(Integer, default=0)
+    sleep_entries = Column(Integer, default=0)  # entries that reported sleep_hours
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class DailyFinance(Base):
+    __tablename__ = "daily_finance"
+    __table_args__ = (UniqueConstraint("user_id", "day", "type", "category", name="uq_daily_finance_user_day_type_category"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    type = Column(String, nullable=False)  # income or expense
+    category = Column(String, nullable=False)
+    entries = Column(Integer, default=0)
+    amount = Column(Float, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,153 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, timedelta
+from ..core.database import get_async_db
+from ..core.security import get_current_principal_async
+from ..core.auth_cache import Principal
+from ..models.habit import Habit
+from ..models.mood import MoodEntry, JournalEntry
+from ..models.nutrition import FoodLog
+from ..models.finance import Transaction
+from ..models.ai_scores import LifeScore
+from ..schemas.habit_schema import HabitResponse
+from ..schemas.mood_schema import MoodResponse, JournalResponse
+from ..schemas.nutrition_schema import FoodLogResponse
+from ..schemas.finance_schema import TransactionResponse
+from ..schemas.ai_schema import LifeScoreResponse, DashboardData
+from ..services.habit_service import get_habit_stats_async
+from ..services.dashboard_service import build_dashboard_async
+from ..services.journal_service import split_tags, tag_filters
+from ..services.data_version_service import DOMAINS, HABITS
+from ..utils.etag import conditional_get_async
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields, page_statement, render_page
+
+# Async variants of the read-heavy endpoints. main.py registers these ahead of the
+# sync routers when ASYNC_DATABASE is enabled, so they take over the same paths.
+habits_router = APIRouter(prefix="/api/habits", tags=["Habits"])
+mood_router = APIRouter(prefix="/api/mood", tags=["Mood"])
+nutrition_router = APIRouter(prefix="/api/nutrition", tags=["Nutrition"])
+finance_router = APIRouter(prefix="/api/finance", tags=["Finance"])
+insights_router = APIRouter(prefix="/api/insights", tags=["Insights"])
+
+routers = [habits_router, mood_router, nutrition_router, finance_router, insights_router]
+
+@habits_router.get("/", response_model=List[HabitResponse], dependencies=[Depends(conditional_get_async(HABITS))])
+async def get_habits(
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    habits = (await db.execute(select(Habit).where(
+        Habit.user_id == current_user.id,
+        Habit.is_active == True
+    ))).scalars().all()
+    
+    stats = await get_habit_stats_async(db, [habit.id for habit in habits], current_user.id)
+    
+    result = []
+    for habit in habits:
+        habit_data = HabitResponse.model_validate(habit)
+        habit_data.current_streak, habit_data.completion_rate = stats[habit.id]
+        result.append(habit_data)
+    
+    return result
+
+@mood_router.get("/", response_model=List[MoodResponse])
+async def get_mood_entries(
+    response: Response,
+    days: int = 30,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    start_date = date.today() - timedelta(days=days)
+    selected = parse_fields(fields, MoodResponse)
+    statement = page_statement(MoodEntry, MoodEntry.logged_at, [
+        MoodEntry.user_id == current_user.id,
+        MoodEntry.logged_at >= start_date
+    ], limit, cursor, selected)
+    return render_page(await db.execute(statement), MoodResponse, MoodEntry.logged_at, limit, selected, response)
+
+@mood_router.get("/journal", response_model=List[JournalResponse])
+async def get_journal_entries(
+    response: Response,
+    days: int = 30,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    tags: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    start_date = date.today() - timedelta(days=days)
+    selected = parse_fields(fields, JournalResponse)
+    statement = page_statement(JournalEntry, JournalEntry.logged_at, [
+        JournalEntry.user_id == current_user.id,
+        JournalEntry.logged_at >= start_date,
+        *tag_filters(current_user.id, split_tags(tags))
+    ], limit, cursor, selected)
+    return render_page(await db.execute(statement), JournalResponse, JournalEntry.logged_at, limit, selected, response)
+
+@nutrition_router.get("/food", response_model=List[FoodLogResponse])
+async def get_food_logs(
+    response: Response,
+    days: int = 7,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    start_date = date.today() - timedelta(days=days)
+    selected = parse_fields(fields, FoodLogResponse)
+    statement = page_statement(FoodLog, FoodLog.logged_at, [
+        FoodLog.user_id == current_user.id,
+        FoodLog.logged_at >= start_date
+    ], limit, cursor, selected)
+    return render_page(await db.execute(statement), FoodLogResponse, FoodLog.logged_at, limit, selected, response)
+
+@finance_router.get("/transactions", response_model=List[TransactionResponse])
+async def get_transactions(
+    response: Response,
+    days: int = 30,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    start_date = date.today() - timedelta(days=days)
+    selected = parse_fields(fields, TransactionResponse)
+    statement = page_statement(Transaction, Transaction.transaction_date, [
+        Transaction.user_id == current_user.id,
+        Transaction.transaction_date >= start_date
+    ], limit, cursor, selected)
+    return render_page(await db.execute(statement), TransactionResponse, Transaction.transaction_date, limit, selected, response)
+
+@insights_router.get("/life-score/history", response_model=List[LifeScoreResponse])
+async def get_life_score_history(
+    response: Response,
+    days: int = 30,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    start_date = date.today() - timedelta(days=days)
+    selected = parse_fields(fields, LifeScoreResponse)
+    statement = page_statement(LifeScore, LifeScore.calculated_at, [
+        LifeScore.user_id == current_user.id,
+        LifeScore.calculated_at >= start_date
+    ], limit, cursor, selected)
+    return render_page(await db.execute(statement), LifeScoreResponse, LifeScore.calculated_at, limit, selected, response)
+
+@insights_router.get("/dashboard", response_model=DashboardData, dependencies=[Depends(conditional_get_async(*DOMAINS))])
+async def get_dashboard_data(
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await build_dashboard_async(db, current_user.id)
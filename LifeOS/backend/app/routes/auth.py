@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -10,26 +11,32 @@ from ..schemas.user_schema import UserCreate, UserLogin, UserResponse, Token
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
+def _save_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
 @router.post("/register", response_model=Token)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    existing_user = await run_in_threadpool(db.query(User).filter(
         (User.email == user_data.email) | (User.username == user_data.username)
-    ).first()
+    ).first)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email or username already registered"
         )
     
+    # Hand the connection back to the pool while bcrypt runs.
+    await run_in_threadpool(db.close)
+    
     new_user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash(user_data.password),
         full_name=user_data.full_name
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_save_user, db, new_user)
     
     access_token = create_access_token(
         data={"sub": new_user.id},
@@ -43,9 +50,11 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.hashed_password):
+async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(db.query(User).filter(User.email == user_data.email).first)
+    # The user row is fully loaded; release the connection while bcrypt runs.
+    await run_in_threadpool(db.close)
+    if not user or not await verify_password(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
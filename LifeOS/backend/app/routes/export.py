@@ -0,0 +1,39 @@
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from ..core.security import get_current_principal
+from ..core.auth_cache import Principal
+from ..services.export_service import EXPORTS, stream_export
+
+router = APIRouter(prefix="/api/export", tags=["Export"])
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv"
+}
+
+@router.get("/{domain}")
+def export_domain(
+    domain: str,
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = False,
+    current_user: Principal = Depends(get_current_principal)
+):
+    if domain not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export domain. Choose one of: {', '.join(EXPORTS)}")
+    
+    filename = f"{domain}.{format.value}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        stream_export(domain, current_user.id, format.value, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
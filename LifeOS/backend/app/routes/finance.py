@@ -1,38 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from typing import List
+from typing import Any, Dict, List, Optional
 from datetime import date, timedelta
 from ..core.database import get_db
-from ..core.security import get_current_user
-from ..models.user import User
-from ..models.finance import Transaction, Budget, FinancialGoal
+from ..core.security import get_current_principal
+from ..core.auth_cache import Principal
+from ..ai.finance_model import expense_categorizer
+from ..models.finance import Transaction, Budget, FinancialGoal, ExpenseCategoryOverride
 from ..schemas.finance_schema import (
     TransactionCreate, TransactionUpdate, TransactionResponse,
     BudgetCreate, BudgetUpdate, BudgetResponse,
     FinancialGoalCreate, FinancialGoalUpdate, FinancialGoalResponse,
-    MonthlySummary
+    MonthlySummary, CategoryOverrideCreate, CategoryOverrideResponse, CategorizeResult
 )
+from ..services.rollup_service import record_transaction
+from ..services.finance_service import (
+    get_period_totals, learn_category_override, categorize_transactions
+)
+from ..services.life_score_service import refresh_life_score
+from ..services.import_service import validate_rows, error_report
+from ..services.upsert_service import upsert
+from ..services.data_version_service import bump_data_version, FINANCE
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields, page_statement, render_page
 
 router = APIRouter(prefix="/api/finance", tags=["Finance"])
 
 @router.get("/transactions", response_model=List[TransactionResponse])
 def get_transactions(
+    response: Response,
     days: int = 30,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     start_date = date.today() - timedelta(days=days)
-    transactions = db.query(Transaction).filter(
+    selected = parse_fields(fields, TransactionResponse)
+    statement = page_statement(Transaction, Transaction.transaction_date, [
         Transaction.user_id == current_user.id,
         Transaction.transaction_date >= start_date
-    ).order_by(Transaction.transaction_date.desc()).all()
-    return [TransactionResponse.model_validate(t) for t in transactions]
+    ], limit, cursor, selected)
+    return render_page(db.execute(statement), TransactionResponse, Transaction.transaction_date, limit, selected, response)
 
 @router.post("/transactions", response_model=TransactionResponse)
 def create_transaction(
     trans_data: TransactionCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     transaction = Transaction(
@@ -40,6 +54,9 @@ def create_transaction(
         **trans_data.model_dump()
     )
     db.add(transaction)
+    record_transaction(db, transaction)
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, FINANCE)
     db.commit()
     db.refresh(transaction)
     return TransactionResponse.model_validate(transaction)
@@ -48,7 +65,7 @@ def create_transaction(
 def update_transaction(
     trans_id: int,
     trans_data: TransactionUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     transaction = db.query(Transaction).filter(
@@ -58,10 +75,14 @@ def update_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
+    record_transaction(db, transaction, -1)
     update_data = trans_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(transaction, key, value)
+    record_transaction(db, transaction)
     
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, FINANCE)
     db.commit()
     db.refresh(transaction)
     return TransactionResponse.model_validate(transaction)
@@ -69,7 +90,7 @@ def update_transaction(
 @router.delete("/transactions/{trans_id}")
 def delete_transaction(
     trans_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     transaction = db.query(Transaction).filter(
@@ -79,13 +100,16 @@ def delete_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
+    record_transaction(db, transaction, -1)
     db.delete(transaction)
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, FINANCE)
     db.commit()
     return {"message": "Transaction deleted successfully"}
 
 @router.get("/budgets", response_model=List[BudgetResponse])
 def get_budgets(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     budgets = db.query(Budget).filter(Budget.user_id == current_user.id).all()
@@ -93,14 +117,11 @@ def get_budgets(
     today = date.today()
     month_start = date(today.year, today.month, 1)
     
+    expense_by_category = get_period_totals(db, current_user.id, month_start)["expense_by_category"]
+    
     result = []
     for budget in budgets:
-        spent = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == current_user.id,
-            Transaction.type == "expense",
-            Transaction.category == budget.category,
-            Transaction.transaction_date >= month_start
-        ).scalar() or 0
+        spent = expense_by_category.get(budget.category, 0)
         
         budget_data = BudgetResponse.model_validate(budget)
         budget_data.spent = spent
@@ -112,30 +133,20 @@ def get_budgets(
 @router.post("/budgets", response_model=BudgetResponse)
 def create_budget(
     budget_data: BudgetCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    existing = db.query(Budget).filter(
-        Budget.user_id == current_user.id,
-        Budget.category == budget_data.category
-    ).first()
-    
-    if existing:
-        existing.monthly_limit = budget_data.monthly_limit
-        db.commit()
-        db.refresh(existing)
-        return BudgetResponse.model_validate(existing)
-    
-    budget = Budget(user_id=current_user.id, **budget_data.model_dump())
-    db.add(budget)
+    budget = upsert(db, Budget, dict(user_id=current_user.id, **budget_data.model_dump()), ["user_id", "category"])
+    refresh_life_score(db, current_user.id)
+    response = BudgetResponse.model_validate(budget)
+    bump_data_version(db, current_user.id, FINANCE)
     db.commit()
-    db.refresh(budget)
-    return BudgetResponse.model_validate(budget)
+    return response
 
 @router.delete("/budgets/{budget_id}")
 def delete_budget(
     budget_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     budget = db.query(Budget).filter(
@@ -146,12 +157,70 @@ def delete_budget(
         raise HTTPException(status_code=404, detail="Budget not found")
     
     db.delete(budget)
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, FINANCE)
     db.commit()
     return {"message": "Budget deleted successfully"}
 
+@router.get("/category-overrides", response_model=List[CategoryOverrideResponse])
+def get_category_overrides(
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    return db.query(ExpenseCategoryOverride).filter(
+        ExpenseCategoryOverride.user_id == current_user.id
+    ).order_by(ExpenseCategoryOverride.category).all()
+
+@router.put("/category-overrides", response_model=CategoryOverrideResponse)
+def learn_category(
+    override_data: CategoryOverrideCreate,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    if override_data.expense_type not in expense_categorizer.types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown expense type. Choose one of: {', '.join(expense_categorizer.types)}"
+        )
+    override = learn_category_override(db, current_user.id, override_data.category, override_data.expense_type)
+    response = CategoryOverrideResponse.model_validate(override)
+    bump_data_version(db, current_user.id, FINANCE)
+    db.commit()
+    return response
+
+@router.delete("/category-overrides/{override_id}")
+def delete_category_override(
+    override_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    override = db.query(ExpenseCategoryOverride).filter(
+        ExpenseCategoryOverride.id == override_id,
+        ExpenseCategoryOverride.user_id == current_user.id
+    ).first()
+    if not override:
+        raise HTTPException(status_code=404, detail="Category override not found")
+    
+    db.delete(override)
+    bump_data_version(db, current_user.id, FINANCE)
+    db.commit()
+    return {"message": "Category override deleted successfully"}
+
+@router.post("/categorize", response_model=CategorizeResult)
+def categorize(
+    rows: List[Dict[str, Any]] = Body(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    # Same rows and per-row validation as POST /api/import/transactions, so an import can be previewed
+    # before it's sent.
+    errors = []
+    transactions = validate_rows(TransactionCreate, list(enumerate(rows)), errors)
+    return {**categorize_transactions(db, current_user.id, transactions, len(rows)), **error_report(errors)}
+
 @router.get("/goals", response_model=List[FinancialGoalResponse])
 def get_financial_goals(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     goals = db.query(FinancialGoal).filter(
@@ -169,11 +238,12 @@ def get_financial_goals(
 @router.post("/goals", response_model=FinancialGoalResponse)
 def create_financial_goal(
     goal_data: FinancialGoalCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     goal = FinancialGoal(user_id=current_user.id, **goal_data.model_dump())
     db.add(goal)
+    bump_data_version(db, current_user.id, FINANCE)
     db.commit()
     db.refresh(goal)
     
@@ -185,7 +255,7 @@ def create_financial_goal(
 def update_financial_goal(
     goal_id: int,
     goal_data: FinancialGoalUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     goal = db.query(FinancialGoal).filter(
@@ -202,6 +272,7 @@ def update_financial_goal(
     if goal.current_amount >= goal.target_amount:
         goal.is_achieved = 1
     
+    bump_data_version(db, current_user.id, FINANCE)
     db.commit()
     db.refresh(goal)
     
@@ -213,7 +284,7 @@ def update_financial_goal(
 def get_monthly_summary(
     month: int = None,
     year: int = None,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     today = date.today()
@@ -226,19 +297,10 @@ def get_monthly_summary(
     else:
         month_end = date(year, month + 1, 1) - timedelta(days=1)
     
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id,
-        Transaction.transaction_date >= month_start,
-        Transaction.transaction_date <= month_end
-    ).all()
-    
-    total_income = sum(t.amount for t in transactions if t.type == "income")
-    total_expenses = sum(t.amount for t in transactions if t.type == "expense")
-    
-    expense_by_category = {}
-    for t in transactions:
-        if t.type == "expense":
-            expense_by_category[t.category] = expense_by_category.get(t.category, 0) + t.amount
+    totals = get_period_totals(db, current_user.id, month_start, month_end)
+    total_income = totals["income"]
+    total_expenses = totals["expenses"]
+    expense_by_category = totals["expense_by_category"]
     
     return MonthlySummary(
         total_income=total_income,
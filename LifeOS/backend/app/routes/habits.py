@@ -4,20 +4,25 @@ from sqlalchemy import func
 from typing import List
 from datetime import date, timedelta
 from ..core.database import get_db
-from ..core.security import get_current_user
-from ..models.user import User
+from ..core.security import get_current_principal
+from ..core.auth_cache import Principal
 from ..models.habit import Habit, HabitLog
 from ..schemas.habit_schema import (
     HabitCreate, HabitUpdate, HabitResponse, 
     HabitLogCreate, HabitLogResponse, HabitWithLogs
 )
-from ..services.habit_service import calculate_streak, calculate_completion_rate
+from ..services.habit_service import get_habit_stats
+from ..services.rollup_service import sync_habit_day_rollup
+from ..services.life_score_service import refresh_life_score
+from ..services.upsert_service import upsert
+from ..services.data_version_service import bump_data_version, HABITS
+from ..utils.etag import conditional_get
 
 router = APIRouter(prefix="/api/habits", tags=["Habits"])
 
-@router.get("/", response_model=List[HabitResponse])
+@router.get("/", response_model=List[HabitResponse], dependencies=[Depends(conditional_get(HABITS))])
 def get_habits(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     habits = db.query(Habit).filter(
@@ -25,11 +30,12 @@ def get_habits(
         Habit.is_active == True
     ).all()
     
+    stats = get_habit_stats(db, [habit.id for habit in habits], current_user.id)
+    
     result = []
     for habit in habits:
         habit_data = HabitResponse.model_validate(habit)
-        habit_data.current_streak = calculate_streak(db, habit.id, current_user.id)
-        habit_data.completion_rate = calculate_completion_rate(db, habit.id, current_user.id)
+        habit_data.current_streak, habit_data.completion_rate = stats[habit.id]
         result.append(habit_data)
     
     return result
@@ -37,7 +43,7 @@ def get_habits(
 @router.post("/", response_model=HabitResponse)
 def create_habit(
     habit_data: HabitCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     habit = Habit(
@@ -48,6 +54,8 @@ def create_habit(
         target_count=habit_data.target_count
     )
     db.add(habit)
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, HABITS)
     db.commit()
     db.refresh(habit)
     return HabitResponse.model_validate(habit)
@@ -55,7 +63,7 @@ def create_habit(
 @router.get("/{habit_id}", response_model=HabitWithLogs)
 def get_habit(
     habit_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     habit = db.query(Habit).filter(
@@ -71,8 +79,7 @@ def get_habit(
     ).order_by(HabitLog.completed_at.desc()).limit(30).all()
     
     habit_data = HabitWithLogs.model_validate(habit)
-    habit_data.current_streak = calculate_streak(db, habit.id, current_user.id)
-    habit_data.completion_rate = calculate_completion_rate(db, habit.id, current_user.id)
+    habit_data.current_streak, habit_data.completion_rate = get_habit_stats(db, [habit.id], current_user.id)[habit.id]
     habit_data.logs = [HabitLogResponse.model_validate(log) for log in logs]
     
     return habit_data
@@ -81,7 +88,7 @@ def get_habit(
 def update_habit(
     habit_id: int,
     habit_data: HabitUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     habit = db.query(Habit).filter(
@@ -95,6 +102,8 @@ def update_habit(
     for key, value in update_data.items():
         setattr(habit, key, value)
     
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, HABITS)
     db.commit()
     db.refresh(habit)
     return HabitResponse.model_validate(habit)
@@ -102,7 +111,7 @@ def update_habit(
 @router.delete("/{habit_id}")
 def delete_habit(
     habit_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     habit = db.query(Habit).filter(
@@ -113,13 +122,15 @@ def delete_habit(
         raise HTTPException(status_code=404, detail="Habit not found")
     
     habit.is_active = False
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, HABITS)
     db.commit()
     return {"message": "Habit deleted successfully"}
 
 @router.post("/log", response_model=HabitLogResponse)
 def log_habit(
     log_data: HabitLogCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     habit = db.query(Habit).filter(
@@ -129,34 +140,32 @@ def log_habit(
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     
-    existing_log = db.query(HabitLog).filter(
-        HabitLog.habit_id == log_data.habit_id,
-        HabitLog.user_id == current_user.id,
-        HabitLog.completed_at == log_data.completed_at
-    ).first()
-    
-    if existing_log:
-        existing_log.count += log_data.count
-        existing_log.notes = log_data.notes or existing_log.notes
-        db.commit()
-        db.refresh(existing_log)
-        return HabitLogResponse.model_validate(existing_log)
-    
-    log = HabitLog(
-        habit_id=log_data.habit_id,
-        user_id=current_user.id,
-        completed_at=log_data.completed_at,
-        count=log_data.count,
-        notes=log_data.notes
+    # Logging the same habit twice on a day adds to that day's count instead of creating a second log.
+    log = upsert(
+        db, HabitLog,
+        {
+            "habit_id": log_data.habit_id,
+            "user_id": current_user.id,
+            "completed_at": log_data.completed_at,
+            "count": log_data.count,
+            "notes": log_data.notes
+        },
+        ["habit_id", "user_id", "completed_at"],
+        lambda excluded: {
+            "count": HabitLog.count + excluded.count,
+            "notes": func.coalesce(func.nullif(excluded.notes, ""), HabitLog.notes)
+        }
     )
-    db.add(log)
+    sync_habit_day_rollup(db, current_user.id, log_data.completed_at)
+    refresh_life_score(db, current_user.id)
+    response = HabitLogResponse.model_validate(log)
+    bump_data_version(db, current_user.id, HABITS)
     db.commit()
-    db.refresh(log)
-    return HabitLogResponse.model_validate(log)
+    return response
 
 @router.get("/logs/today", response_model=List[HabitLogResponse])
 def get_today_logs(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     today = date.today()
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Body, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List
+from ..core.database import get_db
+from ..core.security import get_current_principal
+from ..core.auth_cache import Principal
+from ..schemas.import_schema import ImportResult
+from ..services.import_service import IMPORTS, import_rows, read_csv_rows
+
+router = APIRouter(prefix="/api/import", tags=["Import"])
+
+def _check_domain(domain: str):
+    if domain not in IMPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown import domain. Choose one of: {', '.join(IMPORTS)}")
+
+@router.post("/{domain}", response_model=ImportResult)
+def import_json(
+    domain: str,
+    rows: List[Dict[str, Any]] = Body(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    _check_domain(domain)
+    return import_rows(db, domain, current_user.id, rows)
+
+@router.post("/{domain}/csv", response_model=ImportResult)
+def import_csv(
+    domain: str,
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    _check_domain(domain)
+    try:
+        rows = read_csv_rows(file.file.read())
+        return import_rows(db, domain, current_user.id, rows)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV file must be UTF-8 encoded")
@@ -1,61 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date, timedelta
 from ..core.database import get_db
-from ..core.security import get_current_user
-from ..models.user import User
+from ..core.security import get_current_principal
+from ..core.auth_cache import Principal
 from ..models.mood import MoodEntry, JournalEntry
 from ..schemas.mood_schema import (
     MoodCreate, MoodUpdate, MoodResponse,
-    JournalCreate, JournalUpdate, JournalResponse
+    JournalCreate, JournalUpdate, JournalResponse, JournalSearchResult, JournalTagCountResponse
 )
+from ..services.rollup_service import record_mood_entry, sync_mood_rollup
+from ..services.upsert_service import upsert
+from ..services.life_score_service import refresh_life_score
+from ..services.mood_service import get_mood_stats as mood_stats, journal_sentiment
+from ..services.journal_service import search_journal, split_tags, sync_journal_tags, tag_filters, get_tag_counts
+from ..services.data_version_service import bump_data_version, MOOD, JOURNAL
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields, page_statement, render_page
 
 router = APIRouter(prefix="/api/mood", tags=["Mood"])
 
 @router.get("/", response_model=List[MoodResponse])
 def get_mood_entries(
+    response: Response,
     days: int = 30,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     start_date = date.today() - timedelta(days=days)
-    entries = db.query(MoodEntry).filter(
+    selected = parse_fields(fields, MoodResponse)
+    statement = page_statement(MoodEntry, MoodEntry.logged_at, [
         MoodEntry.user_id == current_user.id,
         MoodEntry.logged_at >= start_date
-    ).order_by(MoodEntry.logged_at.desc()).all()
-    return [MoodResponse.model_validate(e) for e in entries]
+    ], limit, cursor, selected)
+    return render_page(db.execute(statement), MoodResponse, MoodEntry.logged_at, limit, selected, response)
 
 @router.post("/", response_model=MoodResponse)
 def create_mood_entry(
     mood_data: MoodCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    existing = db.query(MoodEntry).filter(
-        MoodEntry.user_id == current_user.id,
-        MoodEntry.logged_at == mood_data.logged_at
-    ).first()
-    
-    if existing:
-        for key, value in mood_data.model_dump().items():
-            setattr(existing, key, value)
-        db.commit()
-        db.refresh(existing)
-        return MoodResponse.model_validate(existing)
-    
-    entry = MoodEntry(
-        user_id=current_user.id,
-        **mood_data.model_dump()
-    )
-    db.add(entry)
+    # One statement inserts the day's entry or overwrites it when the day is already logged.
+    entry = upsert(db, MoodEntry, dict(user_id=current_user.id, **mood_data.model_dump()), ["user_id", "logged_at"])
+    sync_mood_rollup(db, entry)
+    refresh_life_score(db, current_user.id)
+    response = MoodResponse.model_validate(entry)
+    bump_data_version(db, current_user.id, MOOD)
     db.commit()
-    db.refresh(entry)
-    return MoodResponse.model_validate(entry)
+    return response
 
 @router.get("/today", response_model=MoodResponse)
 def get_today_mood(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     today = date.today()
@@ -71,7 +71,7 @@ def get_today_mood(
 def update_mood_entry(
     mood_id: int,
     mood_data: MoodUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     entry = db.query(MoodEntry).filter(
@@ -81,38 +81,79 @@ def update_mood_entry(
     if not entry:
         raise HTTPException(status_code=404, detail="Mood entry not found")
     
+    record_mood_entry(db, entry, -1)
     update_data = mood_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(entry, key, value)
+    record_mood_entry(db, entry)
     
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, MOOD)
     db.commit()
     db.refresh(entry)
     return MoodResponse.model_validate(entry)
 
 @router.get("/journal", response_model=List[JournalResponse])
 def get_journal_entries(
+    response: Response,
     days: int = 30,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    tags: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     start_date = date.today() - timedelta(days=days)
-    entries = db.query(JournalEntry).filter(
+    selected = parse_fields(fields, JournalResponse)
+    statement = page_statement(JournalEntry, JournalEntry.logged_at, [
         JournalEntry.user_id == current_user.id,
-        JournalEntry.logged_at >= start_date
-    ).order_by(JournalEntry.logged_at.desc()).all()
-    return [JournalResponse.model_validate(e) for e in entries]
+        JournalEntry.logged_at >= start_date,
+        *tag_filters(current_user.id, split_tags(tags))
+    ], limit, cursor, selected)
+    return render_page(db.execute(statement), JournalResponse, JournalEntry.logged_at, limit, selected, response)
+
+@router.get("/journal/search", response_model=List[JournalSearchResult])
+def search_journal_entries(
+    q: str = Query(..., min_length=1, max_length=200),
+    tags: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    results = search_journal(db, current_user.id, q, split_tags(tags), start_date, end_date, limit, offset)
+    return [
+        JournalSearchResult(**JournalResponse.model_validate(entry).model_dump(), rank=round(rank, 4))
+        for entry, rank in results
+    ]
+
+@router.get("/journal/tags", response_model=List[JournalTagCountResponse])
+def get_journal_tags(
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    return [JournalTagCountResponse(tag=tag, entries=entries) for tag, entries in get_tag_counts(db, current_user.id, limit)]
 
 @router.post("/journal", response_model=JournalResponse)
 def create_journal_entry(
     journal_data: JournalCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     entry = JournalEntry(
         user_id=current_user.id,
-        **journal_data.model_dump()
+        **journal_data.model_dump(),
+        **journal_sentiment(journal_data.content),
+        search_revision=bump_data_version(db, current_user.id, JOURNAL)
     )
     db.add(entry)
+    db.flush()
+    sync_journal_tags(db, current_user.id, entry.id, None, entry.tags)
+    bump_data_version(db, current_user.id, MOOD)
     db.commit()
     db.refresh(entry)
     return JournalResponse.model_validate(entry)
@@ -121,7 +162,7 @@ def create_journal_entry(
 def update_journal_entry(
     journal_id: int,
     journal_data: JournalUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     entry = db.query(JournalEntry).filter(
@@ -132,9 +173,15 @@ def update_journal_entry(
         raise HTTPException(status_code=404, detail="Journal entry not found")
     
     update_data = journal_data.model_dump(exclude_unset=True)
+    if update_data.get("content") is not None:
+        update_data.update(journal_sentiment(update_data["content"]))
+    previous_tags = entry.tags
     for key, value in update_data.items():
         setattr(entry, key, value)
+    sync_journal_tags(db, current_user.id, entry.id, previous_tags, entry.tags)
+    entry.search_revision = bump_data_version(db, current_user.id, JOURNAL)
     
+    bump_data_version(db, current_user.id, MOOD)
     db.commit()
     db.refresh(entry)
     return JournalResponse.model_validate(entry)
@@ -142,7 +189,7 @@ def update_journal_entry(
 @router.delete("/journal/{journal_id}")
 def delete_journal_entry(
     journal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     entry = db.query(JournalEntry).filter(
@@ -152,36 +199,17 @@ def delete_journal_entry(
     if not entry:
         raise HTTPException(status_code=404, detail="Journal entry not found")
     
+    sync_journal_tags(db, current_user.id, entry.id, entry.tags, None)
     db.delete(entry)
+    bump_data_version(db, current_user.id, JOURNAL)
+    bump_data_version(db, current_user.id, MOOD)
     db.commit()
     return {"message": "Journal entry deleted successfully"}
 
 @router.get("/stats")
 def get_mood_stats(
     days: int = 30,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    start_date = date.today() - timedelta(days=days)
-    entries = db.query(MoodEntry).filter(
-        MoodEntry.user_id == current_user.id,
-        MoodEntry.logged_at >= start_date
-    ).all()
-    
-    if not entries:
-        return {
-            "avg_mood": 0,
-            "avg_energy": 0,
-            "avg_stress": 0,
-            "avg_sleep": 0,
-            "total_entries": 0
-        }
-    
-    total = len(entries)
-    return {
-        "avg_mood": sum(e.mood_score for e in entries) / total,
-        "avg_energy": sum(e.energy_level for e in entries) / total,
-        "avg_stress": sum(e.stress_level for e in entries) / total,
-        "avg_sleep": sum(e.sleep_hours or 0 for e in entries) / total,
-        "total_entries": total
-    }
+    return mood_stats(db, current_user.id, days)
@@ -1,44 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 from datetime import date, timedelta
 from ..core.database import get_db
-from ..core.security import get_current_user
-from ..models.user import User
+from ..core.security import get_current_principal
+from ..core.auth_cache import Principal
 from ..models.nutrition import FoodLog, WaterLog, NutritionGoal
+from ..models.rollup import DailyNutrition
 from ..schemas.nutrition_schema import (
-    FoodLogCreate, FoodLogUpdate, FoodLogResponse,
+    FoodLogCreate, FoodLogUpdate, FoodLogResponse, FoodCatalogItem,
     WaterLogCreate, WaterLogResponse,
     NutritionGoalCreate, NutritionGoalResponse, DailySummary
 )
+from ..services.rollup_service import record_food_log, record_water_intake
+from ..services.life_score_service import refresh_life_score
+from ..services.upsert_service import upsert
+from ..services.nutrition_service import search_foods, fill_food_nutrients
+from ..services.data_version_service import bump_data_version, NUTRITION
+from ..utils.etag import conditional_get
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields, page_statement, render_page
 
 router = APIRouter(prefix="/api/nutrition", tags=["Nutrition"])
 
 @router.get("/food", response_model=List[FoodLogResponse])
 def get_food_logs(
+    response: Response,
     days: int = 7,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     start_date = date.today() - timedelta(days=days)
-    logs = db.query(FoodLog).filter(
+    selected = parse_fields(fields, FoodLogResponse)
+    statement = page_statement(FoodLog, FoodLog.logged_at, [
         FoodLog.user_id == current_user.id,
         FoodLog.logged_at >= start_date
-    ).order_by(FoodLog.logged_at.desc()).all()
-    return [FoodLogResponse.model_validate(l) for l in logs]
+    ], limit, cursor, selected)
+    return render_page(db.execute(statement), FoodLogResponse, FoodLog.logged_at, limit, selected, response)
+
+@router.get("/foods/search", response_model=List[FoodCatalogItem])
+def search_food_catalog(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Principal = Depends(get_current_principal)
+):
+    return search_foods(q, limit)
 
 @router.post("/food", response_model=FoodLogResponse)
 def create_food_log(
     food_data: FoodLogCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     log = FoodLog(
         user_id=current_user.id,
-        **food_data.model_dump()
+        **fill_food_nutrients(food_data.model_dump(), food_data.model_fields_set)
     )
     db.add(log)
+    record_food_log(db, log)
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, NUTRITION)
     db.commit()
     db.refresh(log)
     return FoodLogResponse.model_validate(log)
@@ -47,7 +71,7 @@ def create_food_log(
 def update_food_log(
     food_id: int,
     food_data: FoodLogUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     log = db.query(FoodLog).filter(
@@ -57,10 +81,14 @@ def update_food_log(
     if not log:
         raise HTTPException(status_code=404, detail="Food log not found")
     
+    record_food_log(db, log, -1)
     update_data = food_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(log, key, value)
+    record_food_log(db, log)
     
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, NUTRITION)
     db.commit()
     db.refresh(log)
     return FoodLogResponse.model_validate(log)
@@ -68,7 +96,7 @@ def update_food_log(
 @router.delete("/food/{food_id}")
 def delete_food_log(
     food_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     log = db.query(FoodLog).filter(
@@ -78,52 +106,50 @@ def delete_food_log(
     if not log:
         raise HTTPException(status_code=404, detail="Food log not found")
     
+    record_food_log(db, log, -1)
     db.delete(log)
+    refresh_life_score(db, current_user.id)
+    bump_data_version(db, current_user.id, NUTRITION)
     db.commit()
     return {"message": "Food log deleted successfully"}
 
 @router.get("/water", response_model=List[WaterLogResponse])
 def get_water_logs(
+    response: Response,
     days: int = 7,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     start_date = date.today() - timedelta(days=days)
-    logs = db.query(WaterLog).filter(
+    selected = parse_fields(fields, WaterLogResponse)
+    statement = page_statement(WaterLog, WaterLog.logged_at, [
         WaterLog.user_id == current_user.id,
         WaterLog.logged_at >= start_date
-    ).order_by(WaterLog.logged_at.desc()).all()
-    return [WaterLogResponse.model_validate(l) for l in logs]
+    ], limit, cursor, selected)
+    return render_page(db.execute(statement), WaterLogResponse, WaterLog.logged_at, limit, selected, response)
 
 @router.post("/water", response_model=WaterLogResponse)
 def create_water_log(
     water_data: WaterLogCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    existing = db.query(WaterLog).filter(
-        WaterLog.user_id == current_user.id,
-        WaterLog.logged_at == water_data.logged_at
-    ).first()
-    
-    if existing:
-        existing.amount_ml += water_data.amount_ml
-        db.commit()
-        db.refresh(existing)
-        return WaterLogResponse.model_validate(existing)
-    
-    log = WaterLog(
-        user_id=current_user.id,
-        **water_data.model_dump()
+    log = upsert(
+        db, WaterLog, dict(user_id=current_user.id, **water_data.model_dump()), ["user_id", "logged_at"],
+        lambda excluded: {"amount_ml": WaterLog.amount_ml + excluded.amount_ml}
     )
-    db.add(log)
+    record_water_intake(db, current_user.id, water_data.logged_at, water_data.amount_ml)
+    response = WaterLogResponse.model_validate(log)
+    bump_data_version(db, current_user.id, NUTRITION)
     db.commit()
-    db.refresh(log)
-    return WaterLogResponse.model_validate(log)
+    return response
 
 @router.get("/goals", response_model=NutritionGoalResponse)
 def get_nutrition_goals(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     goal = db.query(NutritionGoal).filter(
@@ -141,39 +167,29 @@ def get_nutrition_goals(
 @router.put("/goals", response_model=NutritionGoalResponse)
 def update_nutrition_goals(
     goal_data: NutritionGoalCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    goal = db.query(NutritionGoal).filter(
-        NutritionGoal.user_id == current_user.id
-    ).first()
-    
-    if not goal:
-        goal = NutritionGoal(user_id=current_user.id, **goal_data.model_dump())
-        db.add(goal)
-    else:
-        for key, value in goal_data.model_dump().items():
-            setattr(goal, key, value)
-    
+    goal = upsert(db, NutritionGoal, dict(user_id=current_user.id, **goal_data.model_dump()), ["user_id"])
+    refresh_life_score(db, current_user.id)
+    response = NutritionGoalResponse.model_validate(goal)
+    bump_data_version(db, current_user.id, NUTRITION)
     db.commit()
-    db.refresh(goal)
-    return NutritionGoalResponse.model_validate(goal)
+    return response
 
 @router.get("/summary/{log_date}", response_model=DailySummary)
 def get_daily_summary(
     log_date: date,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    food_logs = db.query(FoodLog).filter(
-        FoodLog.user_id == current_user.id,
-        FoodLog.logged_at == log_date
-    ).all()
+    totals = db.query(DailyNutrition).filter(
+        DailyNutrition.user_id == current_user.id,
+        DailyNutrition.day == log_date
+    ).first()
     
-    water_logs = db.query(WaterLog).filter(
-        WaterLog.user_id == current_user.id,
-        WaterLog.logged_at == log_date
-    ).all()
+    if not totals:
+        totals = DailyNutrition(calories=0, protein=0, carbs=0, fat=0, water_ml=0)
     
     goal = db.query(NutritionGoal).filter(
         NutritionGoal.user_id == current_user.id
@@ -183,11 +199,11 @@ def get_daily_summary(
         goal = NutritionGoal(user_id=current_user.id)
     
     return DailySummary(
-        total_calories=sum(f.calories for f in food_logs),
-        total_protein=sum(f.protein for f in food_logs),
-        total_carbs=sum(f.carbs for f in food_logs),
-        total_fat=sum(f.fat for f in food_logs),
-        total_water=sum(w.amount_ml for w in water_logs),
+        total_calories=totals.calories,
+        total_protein=totals.protein,
+        total_carbs=totals.carbs,
+        total_fat=totals.fat,
+        total_water=totals.water_ml,
         goal_calories=goal.daily_calories,
         goal_protein=goal.daily_protein,
         goal_carbs=goal.daily_carbs,
@@ -195,9 +211,9 @@ def get_daily_summary(
         goal_water=goal.daily_water_ml
     )
 
-@router.get("/today", response_model=List[FoodLogResponse])
+@router.get("/today", response_model=List[FoodLogResponse], dependencies=[Depends(conditional_get(NUTRITION))])
 def get_today_food(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     today = date.today()
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import date, datetime
+from .import_schema import ImportRowError
 
 class TransactionCreate(BaseModel):
     type: str  # income or expense
@@ -80,3 +81,23 @@ class MonthlySummary(BaseModel):
     total_expenses: float
     net_savings: float
     expense_by_category: dict
+
+class CategoryOverrideCreate(BaseModel):
+    category: str
+    expense_type: str  # essential, lifestyle, savings or debt
+
+class CategoryOverrideResponse(BaseModel):
+    id: int
+    user_id: int
+    category: str
+    expense_type: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class CategorizeResult(BaseModel):
+    expense_types: List[Optional[str]]  # one per row, null for rows that failed validation
+    type_breakdown: Dict[str, float]
+    failed: int
+    errors: List[ImportRowError]
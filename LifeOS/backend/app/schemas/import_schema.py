@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    row: int
+    field: str
+    message: str
+
+class ImportResult(BaseModel):
+    domain: str
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[ImportRowError]
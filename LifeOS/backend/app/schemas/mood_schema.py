@@ -50,8 +50,17 @@ class JournalResponse(BaseModel):
     content: str
     mood_id: Optional[int]
     tags: Optional[str]
+    sentiment: Optional[str] = None
+    sentiment_score: Optional[float] = None
     logged_at: date
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+class JournalSearchResult(JournalResponse):
+    rank: float
+
+class JournalTagCountResponse(BaseModel):
+    tag: str
+    entries: int
@@ -40,6 +40,15 @@ class FoodLogResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class FoodCatalogItem(BaseModel):
+    name: str
+    serving_size: Optional[str] = None
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+    fiber: float
+
 class WaterLogCreate(BaseModel):
     amount_ml: int
     logged_at: date
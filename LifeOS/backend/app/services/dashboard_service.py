@@ -0,0 +1,86 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from .life_score_service import SCORE_FIELDS, load_score_inputs, compute_life_score, generate_insights
+from .upsert_service import upsert
+from ..models.ai_scores import LifeScore, AIInsight
+from ..models.mood import MoodEntry
+from ..schemas.ai_schema import LifeScoreResponse, AIInsightResponse, DashboardData
+
+def summarize_snapshot(inputs: dict, today_mood) -> dict:
+    today = inputs["today"]
+    month_start = date(today.year, today.month, 1)
+    
+    today_nutrition = next((d for d in inputs["nutrition_days"] if d.day == today), None)
+    nutrition_goal = inputs["nutrition_goal"]
+    
+    month_finance = [d for d in inputs["finance_days"] if d.day >= month_start]
+    income = sum(d.amount for d in month_finance if d.type == "income")
+    expenses = sum(d.amount for d in month_finance if d.type == "expense")
+    
+    return {
+        "habit_summary": {
+            "total_habits": len(inputs["habits"]),
+            "completed_today": len([h for h, dates in inputs["habit_dates"].items() if today in dates])
+        },
+        "nutrition_summary": {
+            "calories_consumed": today_nutrition.calories if today_nutrition else 0,
+            "calories_goal": nutrition_goal.daily_calories if nutrition_goal else 2000
+        },
+        "mood_summary": {
+            "today_mood": today_mood.mood_score if today_mood else None,
+            "today_energy": today_mood.energy_level if today_mood else None
+        },
+        "finance_summary": {
+            "monthly_income": income,
+            "monthly_expenses": expenses,
+            "net_savings": income - expenses
+        }
+    }
+
+def build_dashboard(db: Session, user_id: int) -> DashboardData:
+    inputs = load_score_inputs(db, user_id)
+    today = inputs["today"]
+    week_start = today - timedelta(days=7)
+    
+    score_history = db.query(LifeScore).filter(
+        LifeScore.user_id == user_id,
+        LifeScore.calculated_at >= week_start
+    ).order_by(LifeScore.calculated_at.desc()).all()
+    
+    today_mood = db.query(MoodEntry).filter(
+        MoodEntry.user_id == user_id,
+        MoodEntry.logged_at == today
+    ).first()
+    
+    summaries = summarize_snapshot(inputs, today_mood)
+    
+    life_score = next((s for s in score_history if s.calculated_at == today), None)
+    if life_score:
+        scores = {field: getattr(life_score, field) for field in SCORE_FIELDS}
+    else:
+        scores = compute_life_score(inputs)
+        life_score = upsert(db, LifeScore, dict(user_id=user_id, calculated_at=today, **scores), ["user_id", "calculated_at"])
+        score_history.insert(0, life_score)
+    
+    life_score_data = LifeScoreResponse.model_validate(life_score)
+    history_data = [LifeScoreResponse.model_validate(s) for s in score_history]
+    
+    generate_insights(db, user_id, scores)
+    db.commit()
+    
+    insights = db.query(AIInsight).filter(
+        AIInsight.user_id == user_id,
+        AIInsight.is_read == 0
+    ).order_by(AIInsight.priority.desc()).limit(5).all()
+    
+    return DashboardData(
+        life_score=life_score_data,
+        score_history=history_data,
+        insights=[AIInsightResponse.model_validate(i) for i in insights],
+        **summaries
+    )
+
+async def build_dashboard_async(db: AsyncSession, user_id: int) -> DashboardData:
+    # The snapshot and scorers are plain ORM code; run_sync drives them over the async connection.
+    return await db.run_sync(build_dashboard, user_id)
@@ -0,0 +1,48 @@
+from typing import Dict, Iterable
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from ..core.result_cache import result_cache
+from ..models.data_version import DataVersion
+from .upsert_service import upsert, upsert_many
+
+HABITS = "habits"
+MOOD = "mood"
+NUTRITION = "nutrition"
+FINANCE = "finance"
+INSIGHTS = "insights"
+# Bumped alongside MOOD by journal writes only; stamps JournalEntry.search_revision so the SQLite
+# search index can load just the entries changed since it last synced. Not part of any ETag.
+JOURNAL = "journal"
+
+DOMAINS = (HABITS, MOOD, NUTRITION, FINANCE, INSIGHTS)
+# The life score is computed from these; insights only add to what the dashboard shows.
+SCORE_DOMAINS = (HABITS, MOOD, NUTRITION, FINANCE)
+
+def bump_data_version(db: Session, user_id: int, domain: str) -> int:
+    # Runs inside the write's transaction, so readers never see the new version without the new data.
+    version = upsert(
+        db, DataVersion, {"user_id": user_id, "domain": domain, "version": 1}, ["user_id", "domain"],
+        lambda excluded: {"version": DataVersion.version + 1}
+    ).version
+    result_cache.invalidate_after_commit(db, user_id, domain)
+    return version
+
+def bump_data_versions(db: Session, user_ids: Iterable[int], domain: str):
+    # Batch jobs touch thousands of users per transaction; one executemany instead of a round trip each.
+    user_ids = sorted(set(user_ids))
+    upsert_many(
+        db, DataVersion, [{"user_id": user_id, "domain": domain, "version": 1} for user_id in user_ids],
+        ["user_id", "domain"], lambda excluded: {"version": DataVersion.version + 1}
+    )
+    for user_id in user_ids:
+        result_cache.invalidate_after_commit(db, user_id, domain)
+
+def data_versions_statement(user_id: int, domains: Iterable[str]) -> Select:
+    return select(DataVersion.domain, DataVersion.version).where(
+        DataVersion.user_id == user_id,
+        DataVersion.domain.in_(list(domains))
+    )
+
+def get_data_versions(db: Session, user_id: int, domains: Iterable[str]) -> Dict[str, int]:
+    return dict(db.execute(data_versions_statement(user_id, domains)).all())
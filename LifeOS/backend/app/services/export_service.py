@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal
+from ..models.finance import Transaction
+from ..models.nutrition import FoodLog, WaterLog
+from ..models.mood import MoodEntry, JournalEntry
+from ..models.habit import HabitLog
+from ..models.ai_scores import LifeScore
+from ..schemas.finance_schema import TransactionResponse
+from ..schemas.nutrition_schema import FoodLogResponse, WaterLogResponse
+from ..schemas.mood_schema import MoodResponse, JournalResponse
+from ..schemas.habit_schema import HabitLogResponse
+from ..schemas.ai_schema import LifeScoreResponse
+
+EXPORT_BATCH_SIZE = 1000
+
+# domain -> (model, date column, response schema whose fields define the exported columns)
+EXPORTS = {
+    "transactions": (Transaction, Transaction.transaction_date, TransactionResponse),
+    "food": (FoodLog, FoodLog.logged_at, FoodLogResponse),
+    "water": (WaterLog, WaterLog.logged_at, WaterLogResponse),
+    "mood": (MoodEntry, MoodEntry.logged_at, MoodResponse),
+    "journal": (JournalEntry, JournalEntry.logged_at, JournalResponse),
+    "habit-logs": (HabitLog, HabitLog.completed_at, HabitLogResponse),
+    "life-scores": (LifeScore, LifeScore.calculated_at, LifeScoreResponse)
+}
+
+def export_columns(domain: str) -> List[str]:
+    return list(EXPORTS[domain][2].model_fields)
+
+def iter_export_batches(db: Session, domain: str, user_id: int, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Dict]]:
+    model, date_column, _ = EXPORTS[domain]
+    columns = [getattr(model, name) for name in export_columns(domain)]
+    
+    # yield_per streams through a server-side cursor, so only one batch is ever held in memory.
+    result = db.execute(
+        select(*columns)
+        .where(model.user_id == user_id)
+        .order_by(date_column, model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in result.mappings().partitions():
+        yield partition
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def encode_ndjson(batches: Iterable[List[Dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(json.dumps(dict(row), default=_json_default) + "\n" for row in batch).encode()
+
+def encode_csv(columns: List[str], batches: Iterable[List[Dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    
+    for batch in batches:
+        writer.writerows([row[column] for column in columns] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def stream_export(domain: str, user_id: int, fmt: str = "ndjson", compress: bool = False) -> Iterator[bytes]:
+    # The request's session is closed before a streaming body is sent, so the export owns its own.
+    db = SessionLocal()
+    try:
+        batches = iter_export_batches(db, domain, user_id)
+        if fmt == "csv":
+            chunks = encode_csv(export_columns(domain), batches)
+        else:
+            chunks = encode_ndjson(batches)
+        
+        yield from gzip_chunks(chunks) if compress else chunks
+    finally:
+        db.close()
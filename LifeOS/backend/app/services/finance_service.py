@@ -1,21 +1,64 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, extract
 from datetime import date, timedelta
-from ..models.finance import Transaction, Budget
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .data_version_service import FINANCE
+from .upsert_service import upsert
+from ..ai.finance_model import expense_categorizer, normalize_category
+from ..core.result_cache import result_cache
+from ..models.finance import Budget, ExpenseCategoryOverride
+from ..models.rollup import DailyFinance
 
-def get_finance_score(db: Session, user_id: int) -> float:
-    today = date.today()
-    month_start = date(today.year, today.month, 1)
-    
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.transaction_date >= month_start
-    ).all()
-    
-    if not transactions:
+def summarize_finance_rows(rows: Iterable[Tuple[str, str, float, int]]) -> dict:
+    totals = {"transaction_count": 0, "income": 0, "expenses": 0, "expense_by_category": {}}
+    for type_, category, amount, count in rows:
+        totals["transaction_count"] += count
+        if type_ == "income":
+            totals["income"] += amount
+        elif type_ == "expense":
+            totals["expenses"] += amount
+            expense_by_category = totals["expense_by_category"]
+            expense_by_category[category] = expense_by_category.get(category, 0) + amount
+    
+    return totals
+
+def get_period_totals(db: Session, user_id: int, start_date: date, end_date: Optional[date] = None) -> dict:
+    query = db.query(
+        DailyFinance.type,
+        DailyFinance.category,
+        func.sum(DailyFinance.amount),
+        func.sum(DailyFinance.entries)
+    ).filter(
+        DailyFinance.user_id == user_id,
+        DailyFinance.day >= start_date,
+        DailyFinance.entries > 0
+    )
+    if end_date:
+        query = query.filter(DailyFinance.day <= end_date)
+    
+    return summarize_finance_rows(query.group_by(DailyFinance.type, DailyFinance.category).all())
+
+def get_monthly_expenses(db: Session, user_id: int, start_date: date) -> Dict[str, float]:
+    year = extract("year", DailyFinance.day)
+    month = extract("month", DailyFinance.day)
+    
+    rows = db.query(year, month, func.sum(DailyFinance.amount)).filter(
+        DailyFinance.user_id == user_id,
+        DailyFinance.day >= start_date,
+        DailyFinance.type == "expense",
+        DailyFinance.entries > 0
+    ).group_by(year, month).all()
+    
+    return {f"{int(y):04d}-{int(m):02d}": amount for y, m, amount in rows}
+
+def score_finance(totals: dict, budgets: List[Budget]) -> float:
+    if not totals["transaction_count"]:
         return 50.0
     
-    income = sum(t.amount for t in transactions if t.type == "income")
-    expenses = sum(t.amount for t in transactions if t.type == "expense")
+    income = totals["income"]
+    expenses = totals["expenses"]
+    expense_by_category = totals["expense_by_category"]
     
     if income == 0:
         savings_rate = 0
@@ -33,16 +76,12 @@ def get_finance_score(db: Session, user_id: int) -> float:
     else:
         savings_score = max(0, 40 + savings_rate)
     
-    budgets = db.query(Budget).filter(Budget.user_id == user_id).all()
     budget_score = 100
     
     if budgets:
         over_budget_count = 0
         for budget in budgets:
-            spent = sum(
-                t.amount for t in transactions 
-                if t.type == "expense" and t.category == budget.category
-            )
+            spent = expense_by_category.get(budget.category, 0)
             if spent > budget.monthly_limit:
                 over_budget_count += 1
         
@@ -52,25 +91,27 @@ def get_finance_score(db: Session, user_id: int) -> float:
     
     return min(round(total_score, 2), 100)
 
+def get_finance_score(db: Session, user_id: int) -> float:
+    today = date.today()
+    month_start = date(today.year, today.month, 1)
+    
+    totals = get_period_totals(db, user_id, month_start)
+    budgets = db.query(Budget).filter(Budget.user_id == user_id).all()
+    
+    return score_finance(totals, budgets)
+
+@result_cache.cached("spending-patterns", [FINANCE])
 def analyze_spending_patterns(db: Session, user_id: int, months: int = 3) -> dict:
     today = date.today()
     start_date = date(today.year, today.month, 1) - timedelta(days=months * 30)
     
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.transaction_date >= start_date,
-        Transaction.type == "expense"
-    ).all()
+    category_totals = get_period_totals(db, user_id, start_date)["expense_by_category"]
     
     insights = []
     
-    if not transactions:
+    if not category_totals:
         return {"insights": ["Start tracking expenses to get spending insights."]}
     
-    category_totals = {}
-    for t in transactions:
-        category_totals[t.category] = category_totals.get(t.category, 0) + t.amount
-    
     total_spent = sum(category_totals.values())
     
     if total_spent > 0:
@@ -81,10 +122,7 @@ def analyze_spending_patterns(db: Session, user_id: int, months: int = 3) -> dic
         if top_percentage > 40:
             insights.append(f"{top_category} accounts for {top_percentage:.0f}% of spending. Consider reviewing this category.")
     
-    monthly_totals = {}
-    for t in transactions:
-        month_key = t.transaction_date.strftime("%Y-%m")
-        monthly_totals[month_key] = monthly_totals.get(month_key, 0) + t.amount
+    monthly_totals = get_monthly_expenses(db, user_id, start_date)
     
     if len(monthly_totals) >= 2:
         sorted_months = sorted(monthly_totals.keys())
@@ -99,3 +137,30 @@ def analyze_spending_patterns(db: Session, user_id: int, months: int = 3) -> dic
                 insights.append(f"Great job! Spending decreased {abs(change):.0f}% from last month.")
     
     return {"insights": insights, "top_categories": category_totals}
+
+def get_category_overrides(db: Session, user_id: int) -> Dict[str, str]:
+    return dict(db.query(ExpenseCategoryOverride.category, ExpenseCategoryOverride.expense_type).filter(
+        ExpenseCategoryOverride.user_id == user_id
+    ).all())
+
+def learn_category_override(db: Session, user_id: int, category: str, expense_type: str) -> ExpenseCategoryOverride:
+    return upsert(db, ExpenseCategoryOverride, {
+        "user_id": user_id,
+        "category": normalize_category(category),
+        "expense_type": expense_type
+    }, ["user_id", "category"])
+
+def categorize_transactions(db: Session, user_id: int, transactions: List[Tuple[int, dict]], received: int) -> dict:
+    # Expense types for validated (row number, TransactionCreate fields) pairs, with the user's overrides
+    # applied, plus expense totals per type. Rows missing from the batch get no type.
+    codes = expense_categorizer.categorize_codes(
+        [row["category"] for _, row in transactions], get_category_overrides(db, user_id)
+    )
+    amounts = [row["amount"] if row["type"] == "expense" else 0.0 for _, row in transactions]
+    expense_types: List[Optional[str]] = [None] * received
+    for (index, _), expense_type in zip(transactions, np.array(expense_categorizer.types, dtype=object)[codes].tolist()):
+        expense_types[index] = expense_type
+    return {
+        "expense_types": expense_types,
+        "type_breakdown": expense_categorizer.type_totals(codes, amounts)
+    }
@@ -1,46 +1,97 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy import func, distinct
 from datetime import date, timedelta
+from typing import Dict, List, Set, Tuple
 from ..models.habit import Habit, HabitLog
 
-def calculate_streak(db: Session, habit_id: int, user_id: int) -> int:
-    today = date.today()
+MAX_STREAK_DAYS = 366
+
+def streak_from_dates(dates: Set[date], today: date) -> int:
     streak = 0
     current_date = today
+    while current_date in dates and streak < MAX_STREAK_DAYS:
+        streak += 1
+        current_date -= timedelta(days=1)
+    return streak
+
+def completion_rate_from_dates(dates: Set[date], today: date, days: int = 30) -> float:
+    start_date = today - timedelta(days=days)
+    unique_days = sum(1 for d in dates if d >= start_date)
+    return round((unique_days / days) * 100, 2)
+
+def score_habits(stats: List[Tuple[int, float]]) -> float:
+    if not stats:
+        return 50.0
     
-    while True:
-        log = db.query(HabitLog).filter(
-            HabitLog.habit_id == habit_id,
-            HabitLog.user_id == user_id,
-            HabitLog.completed_at == current_date
-        ).first()
-        
-        if log:
-            streak += 1
-            current_date -= timedelta(days=1)
-        else:
-            break
+    total_score = 0
+    for streak, completion_rate in stats:
+        streak_score = min(streak * 5, 50)
+        completion_score = completion_rate * 0.5
         
-        if streak > 365:
-            break
+        total_score += streak_score + completion_score
     
-    return streak
+    avg_score = total_score / len(stats)
+    return min(round(avg_score, 2), 100)
 
-def calculate_completion_rate(db: Session, habit_id: int, user_id: int, days: int = 30) -> float:
-    start_date = date.today() - timedelta(days=days)
+def calculate_streaks(db: Session, habit_ids: List[int], user_id: int) -> Dict[int, int]:
+    streaks = {habit_id: 0 for habit_id in habit_ids}
+    if not habit_ids:
+        return streaks
+    
+    today = date.today()
+    window_start = today - timedelta(days=MAX_STREAK_DAYS - 1)
+    
+    rows = db.query(HabitLog.habit_id, HabitLog.completed_at).filter(
+        HabitLog.habit_id.in_(habit_ids),
+        HabitLog.user_id == user_id,
+        HabitLog.completed_at >= window_start,
+        HabitLog.completed_at <= today
+    ).distinct().all()
+    
+    dates_by_habit = {habit_id: set() for habit_id in habit_ids}
+    for habit_id, completed_at in rows:
+        dates_by_habit[habit_id].add(completed_at)
     
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
-    if not habit:
-        return 0.0
+    for habit_id, dates in dates_by_habit.items():
+        streaks[habit_id] = streak_from_dates(dates, today)
     
-    logs = db.query(HabitLog).filter(
-        HabitLog.habit_id == habit_id,
+    return streaks
+
+def calculate_streak(db: Session, habit_id: int, user_id: int) -> int:
+    return calculate_streaks(db, [habit_id], user_id)[habit_id]
+
+def calculate_completion_rates(db: Session, habit_ids: List[int], user_id: int, days: int = 30) -> Dict[int, float]:
+    rates = {habit_id: 0.0 for habit_id in habit_ids}
+    if not habit_ids:
+        return rates
+    
+    start_date = date.today() - timedelta(days=days)
+    
+    rows = db.query(
+        HabitLog.habit_id,
+        func.count(distinct(HabitLog.completed_at))
+    ).filter(
+        HabitLog.habit_id.in_(habit_ids),
         HabitLog.user_id == user_id,
         HabitLog.completed_at >= start_date
-    ).all()
+    ).group_by(HabitLog.habit_id).all()
     
-    unique_days = len(set(log.completed_at for log in logs))
+    for habit_id, unique_days in rows:
+        rates[habit_id] = round((unique_days / days) * 100, 2)
     
-    return round((unique_days / days) * 100, 2)
+    return rates
+
+def calculate_completion_rate(db: Session, habit_id: int, user_id: int, days: int = 30) -> float:
+    return calculate_completion_rates(db, [habit_id], user_id, days)[habit_id]
+
+def get_habit_stats(db: Session, habit_ids: List[int], user_id: int) -> Dict[int, Tuple[int, float]]:
+    streaks = calculate_streaks(db, habit_ids, user_id)
+    rates = calculate_completion_rates(db, habit_ids, user_id)
+    return {habit_id: (streaks[habit_id], rates[habit_id]) for habit_id in habit_ids}
+
+async def get_habit_stats_async(db: AsyncSession, habit_ids: List[int], user_id: int) -> Dict[int, Tuple[int, float]]:
+    return await db.run_sync(get_habit_stats, habit_ids, user_id)
 
 def get_habit_score(db: Session, user_id: int) -> float:
     habits = db.query(Habit).filter(
@@ -48,18 +99,5 @@ def get_habit_score(db: Session, user_id: int) -> float:
         Habit.is_active == True
     ).all()
     
-    if not habits:
-        return 50.0
-    
-    total_score = 0
-    for habit in habits:
-        streak = calculate_streak(db, habit.id, user_id)
-        completion_rate = calculate_completion_rate(db, habit.id, user_id)
-        
-        streak_score = min(streak * 5, 50)
-        completion_score = completion_rate * 0.5
-        
-        total_score += streak_score + completion_score
-    
-    avg_score = total_score / len(habits)
-    return min(round(avg_score, 2), 100)
+    stats = get_habit_stats(db, [habit.id for habit in habits], user_id)
+    return score_habits([stats[habit.id] for habit in habits])
@@ -0,0 +1,161 @@
+import csv
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from ..models.finance import Transaction
+from ..models.nutrition import FoodLog
+from ..models.habit import Habit, HabitLog
+from ..schemas.finance_schema import TransactionCreate
+from ..schemas.nutrition_schema import FoodLogCreate
+from ..schemas.habit_schema import HabitLogCreate
+from .rollup_service import (
+    add_transaction_deltas, add_food_log_deltas,
+    record_transactions_bulk, record_food_logs_bulk, sync_habit_day_rollups
+)
+from .life_score_service import refresh_life_score
+from .upsert_service import upsert_many
+from .data_version_service import bump_data_version, HABITS, NUTRITION, FINANCE
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+IMPORTS = {
+    "transactions": (Transaction, TransactionCreate),
+    "food": (FoodLog, FoodLogCreate),
+    "habit-logs": (HabitLog, HabitLogCreate)
+}
+
+DATA_VERSION_DOMAINS = {
+    "transactions": FINANCE,
+    "food": NUTRITION,
+    "habit-logs": HABITS
+}
+
+def read_csv_rows(content: bytes) -> Iterator[Dict[str, Any]]:
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    for row in reader:
+        # Blank cells fall back to the schema defaults instead of failing validation.
+        yield {key: value for key, value in row.items() if key and value not in ("", None)}
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    chunk = []
+    for index, row in enumerate(rows):
+        chunk.append((index, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def validate_rows(schema: Type[BaseModel], chunk: List[Tuple[int, Dict[str, Any]]], errors: List[dict]) -> List[Tuple[int, dict]]:
+    valid = []
+    for index, row in chunk:
+        try:
+            valid.append((index, schema.model_validate(row).model_dump()))
+        except ValidationError as exc:
+            errors.extend(
+                {"row": index, "field": ".".join(str(part) for part in error["loc"]), "message": error["msg"]}
+                for error in exc.errors()
+            )
+    return valid
+
+def error_report(errors: List[dict]) -> dict:
+    return {
+        "failed": len({error["row"] for error in errors}),
+        "errors": sorted(errors, key=lambda error: error["row"])[:MAX_REPORTED_ERRORS]
+    }
+
+def _insert_rows(db: Session, model, user_id: int, rows: List[dict]):
+    if rows:
+        # A Core insert with a list of parameter sets is a single executemany, batched by the dialect.
+        db.execute(insert(model.__table__), [dict(row, user_id=user_id) for row in rows])
+
+def _import_habit_logs(db: Session, user_id: int, valid: List[Tuple[int, dict]], errors: List[dict]) -> Tuple[int, int]:
+    habit_ids = {row[0] for row in db.query(Habit.id).filter(Habit.user_id == user_id).all()}
+    
+    # Same merge rule as POST /api/habits/log: repeated (habit, day) pairs add to one log's count.
+    merged = {}
+    for index, row in valid:
+        if row["habit_id"] not in habit_ids:
+            errors.append({"row": index, "field": "habit_id", "message": "Habit not found"})
+            continue
+        key = (row["habit_id"], row["completed_at"])
+        if key in merged:
+            merged[key]["count"] += row["count"]
+            merged[key]["notes"] = row["notes"] or merged[key]["notes"]
+        else:
+            merged[key] = dict(row)
+    
+    if not merged:
+        return 0, 0
+    
+    # Counting the day range before and after only feeds the inserted/updated report; the merge itself is
+    # one upsert that adds to whatever count is stored when it runs.
+    days = [day for _, day in merged]
+    in_range = db.query(func.count(HabitLog.id)).filter(
+        HabitLog.user_id == user_id,
+        HabitLog.completed_at >= min(days),
+        HabitLog.completed_at <= max(days)
+    )
+    before = in_range.scalar()
+    upsert_many(
+        db, HabitLog,
+        [dict(row, user_id=user_id) for row in merged.values()],
+        ["habit_id", "user_id", "completed_at"],
+        lambda excluded: {
+            "count": HabitLog.count + excluded.count,
+            "notes": func.coalesce(func.nullif(excluded.notes, ""), HabitLog.notes)
+        }
+    )
+    inserted = max(0, min(in_range.scalar() - before, len(merged)))
+    sync_habit_day_rollups(db, user_id, days)
+    
+    return inserted, len(merged) - inserted
+
+def import_rows(db: Session, domain: str, user_id: int, rows: Iterable[Dict[str, Any]], chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    model, schema = IMPORTS[domain]
+    errors = []
+    received = 0
+    inserted = 0
+    updated = 0
+    pending_habit_logs = []
+    rollup_deltas = {}
+    
+    for chunk in _chunks(rows, chunk_size):
+        received += len(chunk)
+        valid = validate_rows(schema, chunk, errors)
+        
+        if domain == "habit-logs":
+            pending_habit_logs.extend(valid)
+            continue
+        
+        records = [row for _, row in valid]
+        _insert_rows(db, model, user_id, records)
+        if domain == "transactions":
+            add_transaction_deltas(rollup_deltas, records)
+        else:
+            add_food_log_deltas(rollup_deltas, records)
+        inserted += len(records)
+    
+    # Rollups are touched once per import, not once per chunk or row.
+    if domain == "transactions":
+        record_transactions_bulk(db, user_id, rollup_deltas)
+    elif domain == "food":
+        record_food_logs_bulk(db, user_id, rollup_deltas)
+    else:
+        inserted, updated = _import_habit_logs(db, user_id, pending_habit_logs, errors)
+    
+    if inserted or updated:
+        refresh_life_score(db, user_id)
+        bump_data_version(db, user_id, DATA_VERSION_DOMAINS[domain])
+    db.commit()
+    
+    return {
+        "domain": domain,
+        "received": received,
+        "inserted": inserted,
+        "updated": updated,
+        **error_report(errors)
+    }
@@ -0,0 +1,278 @@
+import heapq
+import math
+import re
+import string
+from collections import Counter, OrderedDict
+from datetime import date
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import delete, func, insert, literal_column, select
+from sqlalchemy.orm import Session
+from .data_version_service import get_data_versions, JOURNAL
+from .upsert_service import upsert_many
+from ..models.mood import JournalEntry, JournalTag, JournalTagCount
+
+SEARCH_CONFIG = "english"
+# Must match ix_journal_entries_search (migration 0008) character for character, or Postgres
+# will not use the index.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+    "setweight(to_tsvector('english', content), 'C')"
+)
+
+# Fallback ranking: title and tags matches count for more than body text, like the A/B/C weights above.
+FIELD_WEIGHTS = (3.0, 2.0, 1.0)
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_INDEXED_USERS = 256
+MAX_TAG_LENGTH = 255  # journal_tags.tag and journal_tag_counts.tag
+
+QUERY_PATTERN = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+# Letters and digits make words, apostrophes are dropped ("don't" -> "dont"), anything else separates.
+SEARCH_TOKEN_TABLE = str.maketrans({**{char: " " for char in string.punctuation}, "'": None, "\u2019": None})
+
+def search_tokens(text: Optional[str]) -> List[str]:
+    return text.lower().translate(SEARCH_TOKEN_TABLE).split() if text else []
+
+def split_tags(tags: Optional[str]) -> List[str]:
+    # Tags are entered comma separated; matching ignores case and surrounding whitespace and only
+    # looks at the first MAX_TAG_LENGTH characters, which is all the tag tables store.
+    if not tags:
+        return []
+    return list(dict.fromkeys(tag.strip().lower()[:MAX_TAG_LENGTH] for tag in tags.split(",") if tag.strip()))
+
+def tag_filters(user_id: int, tags: Iterable[str]) -> list:
+    # Each tag is a lookup on ix_journal_tags_user_tag rather than a scan of the user's entries.
+    return [
+        JournalEntry.id.in_(select(JournalTag.journal_id).where(JournalTag.user_id == user_id, JournalTag.tag == tag))
+        for tag in tags
+    ]
+
+def sync_journal_tags(db: Session, user_id: int, journal_id: int, before: Optional[str], after: Optional[str]):
+    # Applies the difference between two tag strings to journal_tags and the per-user counts.
+    old_tags, new_tags = set(split_tags(before)), set(split_tags(after))
+    removed, added = old_tags - new_tags, new_tags - old_tags
+    if removed:
+        db.execute(delete(JournalTag).where(JournalTag.journal_id == journal_id, JournalTag.tag.in_(removed)))
+    if added:
+        db.execute(insert(JournalTag), [{"journal_id": journal_id, "user_id": user_id, "tag": tag} for tag in sorted(added)])
+    record_tag_counts(db, user_id, {**{tag: 1 for tag in added}, **{tag: -1 for tag in removed}})
+
+def record_tag_counts(db: Session, user_id: int, deltas: Dict[str, int]):
+    if not deltas:
+        return
+    upsert_many(
+        db, JournalTagCount, [{"user_id": user_id, "tag": tag, "entries": delta} for tag, delta in sorted(deltas.items())],
+        ["user_id", "tag"], lambda excluded: {"entries": JournalTagCount.entries + excluded.entries}
+    )
+    removed = [tag for tag, delta in deltas.items() if delta < 0]
+    if removed:
+        db.execute(delete(JournalTagCount).where(
+            JournalTagCount.user_id == user_id,
+            JournalTagCount.tag.in_(removed),
+            JournalTagCount.entries <= 0
+        ))
+
+def get_tag_counts(db: Session, user_id: int, limit: int = 100) -> List[Tuple[str, int]]:
+    return db.execute(
+        select(JournalTagCount.tag, JournalTagCount.entries)
+        .where(JournalTagCount.user_id == user_id)
+        .order_by(JournalTagCount.entries.desc(), JournalTagCount.tag)
+        .limit(limit)
+    ).all()
+
+def parse_search_query(query: str) -> Tuple[List[str], List[List[str]], List[str]]:
+    # Web-search style: bare words must all match, "quoted text" matches as a phrase and -word excludes.
+    terms, phrases, excluded = [], [], []
+    for phrase_negated, phrase, term_negated, term in QUERY_PATTERN.findall(query):
+        tokens = search_tokens(phrase if phrase else term)
+        if not tokens:
+            continue
+        if phrase_negated or term_negated:
+            excluded.extend(tokens)
+        elif phrase and len(tokens) > 1:
+            phrases.append(tokens)
+        else:
+            terms.extend(tokens)
+    return terms, phrases, excluded
+
+def _journal_filters(user_id: int, tags: List[str], start_date: Optional[date], end_date: Optional[date]) -> list:
+    filters = [JournalEntry.user_id == user_id] + tag_filters(user_id, tags)
+    if start_date:
+        filters.append(JournalEntry.logged_at >= start_date)
+    if end_date:
+        filters.append(JournalEntry.logged_at <= end_date)
+    return filters
+
+def _search_postgres(db: Session, user_id: int, query: str, tags: List[str], start_date: Optional[date],
+                     end_date: Optional[date], limit: int, offset: int) -> List[Tuple[JournalEntry, float]]:
+    vector = literal_column(SEARCH_VECTOR_SQL)
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), query)
+    rank = func.ts_rank_cd(vector, tsquery).label("rank")
+    statement = select(JournalEntry, rank).where(
+        vector.op("@@")(tsquery),
+        *_journal_filters(user_id, tags, start_date, end_date)
+    ).order_by(rank.desc(), JournalEntry.logged_at.desc(), JournalEntry.id.desc()).limit(limit).offset(offset)
+    return [(entry, float(score)) for entry, score in db.execute(statement).all()]
+
+class JournalIndex:
+    # In-memory inverted index over one user's journal: term -> {entry id: field-weighted term frequency}.
+    # Kept in step with the database by reloading the entries written since the journal version it last saw.
+    def __init__(self):
+        self.version: Optional[int] = None
+        # entry id -> hash of (title, tags, content) as last indexed, to spot edited rows
+        self.hashes: Dict[int, int] = {}
+        # entry id -> each field's tokens joined and padded with spaces, for phrase matching
+        self.fields: Dict[int, Tuple[str, ...]] = {}
+        self.logged_at: Dict[int, date] = {}
+        self.tags: Dict[int, Set[str]] = {}
+        self.lengths: Dict[int, float] = {}
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.total_length = 0.0
+        self.lock = Lock()
+
+    def refresh(self, db: Session, user_id: int):
+        # Version first, rows second: a write landing in between only makes the next refresh redo work.
+        version = get_data_versions(db, user_id, [JOURNAL]).get(JOURNAL, 0)
+        if version == self.version:
+            return
+        statement = select(
+            JournalEntry.id, JournalEntry.title, JournalEntry.tags, JournalEntry.content, JournalEntry.logged_at
+        ).where(JournalEntry.user_id == user_id)
+        if self.version is not None:
+            # Journal writes stamp the row with the version they bumped to, so only those rows are read.
+            statement = statement.where(JournalEntry.search_revision > self.version)
+        for entry_id, title, tags, content, logged_at in db.execute(statement).all():
+            source = (title, tags, content)
+            if self.hashes.get(entry_id) != hash(source):
+                self._remove(entry_id)
+                self._add(entry_id, source)
+            self.logged_at[entry_id] = logged_at
+        # Deleted entries leave nothing to select; a count off ix_journal_entries_user_revision spots them
+        # and only then are the ids compared.
+        entries = db.execute(select(func.count(JournalEntry.id)).where(JournalEntry.user_id == user_id)).scalar()
+        if entries != len(self.hashes):
+            seen = set(db.execute(select(JournalEntry.id).where(JournalEntry.user_id == user_id)).scalars())
+            for entry_id in set(self.hashes) - seen:
+                self._remove(entry_id)
+                del self.logged_at[entry_id]
+        self.version = version
+
+    def _add(self, entry_id: int, source: tuple):
+        frequencies: Dict[str, float] = {}
+        fields = []
+        length = 0.0
+        for text, weight in zip(source, FIELD_WEIGHTS):
+            tokens = search_tokens(text)
+            fields.append(" " + " ".join(tokens) + " ")
+            length += len(tokens) * weight
+            for token, count in Counter(tokens).items():
+                frequencies[token] = frequencies.get(token, 0.0) + count * weight
+        postings = self.postings
+        for token, frequency in frequencies.items():
+            posting = postings.get(token)
+            if posting is None:
+                postings[token] = {entry_id: frequency}
+            else:
+                posting[entry_id] = frequency
+        self.hashes[entry_id] = hash(source)
+        self.fields[entry_id] = tuple(fields)
+        self.tags[entry_id] = set(split_tags(source[1]))
+        self.lengths[entry_id] = length
+        self.total_length += length
+
+    def _remove(self, entry_id: int):
+        if self.hashes.pop(entry_id, None) is None:
+            return
+        for token in set(" ".join(self.fields.pop(entry_id)).split()):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(entry_id, None)
+                if not postings:
+                    del self.postings[token]
+        self.total_length -= self.lengths.pop(entry_id)
+        del self.tags[entry_id]
+
+    def _has_phrase(self, entry_id: int, phrase: str) -> bool:
+        # Phrases never span fields: each field is matched on its own.
+        return any(phrase in field for field in self.fields[entry_id])
+
+    def search(self, query: str, tags: List[str], start_date: Optional[date], end_date: Optional[date],
+               limit: int, offset: int) -> List[Tuple[int, float]]:
+        terms, phrases, excluded = parse_search_query(query)
+        required = list(dict.fromkeys(terms + [token for phrase in phrases for token in phrase]))
+        if not required:
+            return []
+
+        postings = [self.postings.get(token, {}) for token in required]
+        # Intersect starting from the rarest term so the candidate set is small from the start.
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        if not candidates:
+            return []
+        for token in excluded:
+            candidates.difference_update(self.postings.get(token, {}))
+
+        phrases = [" " + " ".join(phrase) + " " for phrase in phrases]
+        wanted_tags = set(tags)
+        documents = len(self.hashes)
+        average_length = self.total_length / documents if documents else 0.0
+        idf = {
+            token: math.log(1 + (documents - len(self.postings[token]) + 0.5) / (len(self.postings[token]) + 0.5))
+            for token in required
+        }
+
+        scored = []
+        for entry_id in candidates:
+            logged_at = self.logged_at[entry_id]
+            if (start_date and logged_at < start_date) or (end_date and logged_at > end_date):
+                continue
+            if wanted_tags and not wanted_tags <= self.tags[entry_id]:
+                continue
+            if phrases and not all(self._has_phrase(entry_id, phrase) for phrase in phrases):
+                continue
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[entry_id] / average_length) if average_length else BM25_K1
+            score = 0.0
+            for token in required:
+                frequency = self.postings[token][entry_id]
+                score += idf[token] * frequency * (BM25_K1 + 1) / (frequency + norm)
+            scored.append((score, logged_at, entry_id))
+
+        return [(entry_id, score) for score, _, entry_id in heapq.nlargest(limit + offset, scored)[offset:]]
+
+_indexes: "OrderedDict[int, JournalIndex]" = OrderedDict()
+_indexes_lock = Lock()
+
+def _journal_index(user_id: int) -> JournalIndex:
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            index = _indexes[user_id] = JournalIndex()
+            while len(_indexes) > MAX_INDEXED_USERS:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(user_id)
+        return index
+
+def _search_index(db: Session, user_id: int, query: str, tags: List[str], start_date: Optional[date],
+                  end_date: Optional[date], limit: int, offset: int) -> List[Tuple[JournalEntry, float]]:
+    index = _journal_index(user_id)
+    with index.lock:
+        index.refresh(db, user_id)
+        ranked = index.search(query, tags, start_date, end_date, limit, offset)
+    if not ranked:
+        return []
+    entries = {entry.id: entry for entry in db.query(JournalEntry).filter(JournalEntry.id.in_([entry_id for entry_id, _ in ranked])).all()}
+    return [(entries[entry_id], score) for entry_id, score in ranked if entry_id in entries]
+
+def search_journal(db: Session, user_id: int, query: str, tags: Optional[List[str]] = None, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None, limit: int = 20, offset: int = 0) -> List[Tuple[JournalEntry, float]]:
+    tags = [tag.strip().lower() for tag in tags or [] if tag.strip()]
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, user_id, query, tags, start_date, end_date, limit, offset)
+    return _search_index(db, user_id, query, tags, start_date, end_date, limit, offset)
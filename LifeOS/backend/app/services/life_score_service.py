@@ -1,14 +1,20 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
-from .habit_service import get_habit_score
-from .mood_service import get_mood_score, analyze_mood_trends
-from .nutrition_service import get_nutrition_score, analyze_nutrition_patterns
-from .finance_service import get_finance_score, analyze_spending_patterns
-from ..models.ai_scores import AIInsight
+from typing import Dict, List, Optional
+from .habit_service import MAX_STREAK_DAYS, streak_from_dates, completion_rate_from_dates, score_habits
+from .mood_service import score_mood
+from .nutrition_service import score_nutrition
+from .finance_service import summarize_finance_rows, score_finance
+from .data_version_service import SCORE_DOMAINS
+from .upsert_service import upsert, upsert_many
+from .score_kernel import load_score_columns, score_rows
+from ..core.result_cache import result_cache
+from ..models.ai_scores import LifeScore, AIInsight
 from ..models.habit import Habit, HabitLog
-from ..models.mood import MoodEntry
-from ..models.nutrition import FoodLog
-from ..models.finance import Transaction
+from ..models.nutrition import NutritionGoal
+from ..models.finance import Budget
+from ..models.rollup import DailyHabit, DailyNutrition, DailyMood, DailyFinance
 
 WEIGHTS = {
     "habit": 0.30,
@@ -18,44 +24,140 @@ WEIGHTS = {
     "consistency": 0.10
 }
 
+SCORE_FIELDS = ["habit_score", "nutrition_score", "mood_score", "finance_score", "consistency_score", "total_score"]
+
+def score_consistency(habit_days: int, mood_days: int, food_days: int, finance_days: int, days: int = 7) -> float:
+    avg_consistency = (
+        (habit_days / days) * 25 +
+        (mood_days / days) * 25 +
+        (food_days / days) * 25 +
+        (min(finance_days, days) / days) * 25
+    )
+    
+    return min(round(avg_consistency, 2), 100)
+
 def calculate_consistency_score(db: Session, user_id: int, days: int = 7) -> float:
     start_date = date.today() - timedelta(days=days)
     
-    habit_days = db.query(HabitLog.completed_at).filter(
-        HabitLog.user_id == user_id,
-        HabitLog.completed_at >= start_date
-    ).distinct().count()
+    habit_days = db.query(DailyHabit.day).filter(
+        DailyHabit.user_id == user_id,
+        DailyHabit.day >= start_date,
+        DailyHabit.log_entries > 0
+    ).count()
     
-    mood_days = db.query(MoodEntry.logged_at).filter(
-        MoodEntry.user_id == user_id,
-        MoodEntry.logged_at >= start_date
-    ).distinct().count()
+    mood_days = db.query(DailyMood.day).filter(
+        DailyMood.user_id == user_id,
+        DailyMood.day >= start_date,
+        DailyMood.entries > 0
+    ).count()
     
-    food_days = db.query(FoodLog.logged_at).filter(
-        FoodLog.user_id == user_id,
-        FoodLog.logged_at >= start_date
-    ).distinct().count()
+    food_days = db.query(DailyNutrition.day).filter(
+        DailyNutrition.user_id == user_id,
+        DailyNutrition.day >= start_date,
+        DailyNutrition.food_entries > 0
+    ).count()
     
-    finance_days = db.query(Transaction.transaction_date).filter(
-        Transaction.user_id == user_id,
-        Transaction.transaction_date >= start_date
+    finance_days = db.query(DailyFinance.day).filter(
+        DailyFinance.user_id == user_id,
+        DailyFinance.day >= start_date,
+        DailyFinance.entries > 0
     ).distinct().count()
     
-    avg_consistency = (
-        (habit_days / days) * 25 +
-        (mood_days / days) * 25 +
-        (food_days / days) * 25 +
-        (min(finance_days, days) / days) * 25
-    )
+    return score_consistency(habit_days, mood_days, food_days, finance_days, days)
+
+def load_score_inputs_bulk(db: Session, user_ids: List[int], window_days: int = 7, today: Optional[date] = None) -> Dict[int, dict]:
+    # One query per table for the whole cohort, partitioned per user afterwards.
+    today = today or date.today()
+    window_start = today - timedelta(days=window_days)
+    month_start = date(today.year, today.month, 1)
+    habit_start = min(today - timedelta(days=MAX_STREAK_DAYS - 1), today - timedelta(days=30))
     
-    return min(round(avg_consistency, 2), 100)
+    inputs = {
+        user_id: {
+            "today": today,
+            "window_days": window_days,
+            "habits": [],
+            "habit_dates": {},
+            "nutrition_days": [],
+            "mood_days": [],
+            "finance_days": [],
+            "nutrition_goal": None,
+            "budgets": []
+        }
+        for user_id in user_ids
+    }
+    
+    for habit in db.query(Habit).filter(
+        Habit.user_id.in_(user_ids),
+        Habit.is_active == True
+    ).all():
+        inputs[habit.user_id]["habits"].append(habit)
+    
+    for user_id, habit_id, completed_at in db.query(HabitLog.user_id, HabitLog.habit_id, HabitLog.completed_at).filter(
+        HabitLog.user_id.in_(user_ids),
+        HabitLog.completed_at >= habit_start
+    ).distinct().all():
+        inputs[user_id]["habit_dates"].setdefault(habit_id, set()).add(completed_at)
+    
+    for row in db.query(DailyNutrition).filter(
+        DailyNutrition.user_id.in_(user_ids),
+        DailyNutrition.day >= window_start
+    ).all():
+        inputs[row.user_id]["nutrition_days"].append(row)
+    
+    for row in db.query(DailyMood).filter(
+        DailyMood.user_id.in_(user_ids),
+        DailyMood.day >= window_start,
+        DailyMood.entries > 0
+    ).all():
+        inputs[row.user_id]["mood_days"].append(row)
+    
+    for row in db.query(DailyFinance).filter(
+        DailyFinance.user_id.in_(user_ids),
+        DailyFinance.day >= min(month_start, window_start),
+        DailyFinance.entries > 0
+    ).all():
+        inputs[row.user_id]["finance_days"].append(row)
+    
+    for goal in db.query(NutritionGoal).filter(NutritionGoal.user_id.in_(user_ids)).all():
+        inputs[goal.user_id]["nutrition_goal"] = goal
+    
+    for budget in db.query(Budget).filter(Budget.user_id.in_(user_ids)).all():
+        inputs[budget.user_id]["budgets"].append(budget)
+    
+    return inputs
 
-def calculate_life_score(db: Session, user_id: int) -> dict:
-    habit_score = get_habit_score(db, user_id)
-    nutrition_score = get_nutrition_score(db, user_id)
-    mood_score = get_mood_score(db, user_id)
-    finance_score = get_finance_score(db, user_id)
-    consistency_score = calculate_consistency_score(db, user_id)
+def load_score_inputs(db: Session, user_id: int, window_days: int = 7) -> dict:
+    return load_score_inputs_bulk(db, [user_id], window_days)[user_id]
+
+def compute_life_score(inputs: dict) -> dict:
+    today = inputs["today"]
+    window_days = inputs["window_days"]
+    window_start = today - timedelta(days=window_days)
+    month_start = date(today.year, today.month, 1)
+    habit_dates = inputs["habit_dates"]
+    
+    habit_score = score_habits([
+        (
+            streak_from_dates(habit_dates.get(habit.id, set()), today),
+            completion_rate_from_dates(habit_dates.get(habit.id, set()), today)
+        )
+        for habit in inputs["habits"]
+    ])
+    nutrition_score = score_nutrition(inputs["nutrition_days"], inputs["nutrition_goal"], window_days)
+    mood_score = score_mood(inputs["mood_days"])
+    finance_totals = summarize_finance_rows(
+        (d.type, d.category, d.amount, d.entries)
+        for d in inputs["finance_days"] if d.day >= month_start
+    )
+    finance_score = score_finance(finance_totals, inputs["budgets"])
+    consistency_score = score_consistency(
+        len({d for dates in habit_dates.values() for d in dates if d >= window_start}),
+        len(inputs["mood_days"]),
+        len([d for d in inputs["nutrition_days"] if d.food_entries > 0]),
+        len({d.day for d in inputs["finance_days"] if d.day >= window_start}),
+        window_days
+    )
     
     total_score = (
         habit_score * WEIGHTS["habit"] +
@@ -74,19 +176,43 @@ def calculate_life_score(db: Session, user_id: int) -> dict:
         "total_score": round(total_score, 2)
     }
 
-def generate_insights(db: Session, user_id: int):
+@result_cache.cached("life-score", SCORE_DOMAINS)
+def calculate_life_score(db: Session, user_id: int) -> dict:
+    return compute_life_score(load_score_inputs(db, user_id))
+
+def get_today_life_score(db: Session, user_id: int) -> LifeScore:
     today = date.today()
+    life_score = db.query(LifeScore).filter(
+        LifeScore.user_id == user_id,
+        LifeScore.calculated_at == today
+    ).first()
     
-    existing = db.query(AIInsight).filter(
-        AIInsight.user_id == user_id,
-        AIInsight.generated_at >= today
+    if life_score:
+        return life_score
+    
+    # Writes keep today's row current via refresh_life_score, so it only needs computing once a day.
+    # An upsert because the nightly batch or a concurrent request may be writing the same row.
+    return upsert(
+        db, LifeScore, dict(user_id=user_id, calculated_at=today, **calculate_life_score(db, user_id)),
+        ["user_id", "calculated_at"]
+    )
+
+def refresh_life_score(db: Session, user_id: int):
+    life_score = db.query(LifeScore).filter(
+        LifeScore.user_id == user_id,
+        LifeScore.calculated_at == date.today()
     ).first()
     
-    if existing:
+    if not life_score:
         return
     
-    scores = calculate_life_score(db, user_id)
-    
+    db.flush()
+    # Uncached: this runs inside the write, before the cache hears about it.
+    score_data = calculate_life_score.uncached(db, user_id)
+    for key, value in score_data.items():
+        setattr(life_score, key, value)
+
+def build_insights(scores: dict) -> List[dict]:
     insights_to_add = []
     
     if scores["habit_score"] < 40:
@@ -116,7 +242,6 @@ def generate_insights(db: Session, user_id: int):
         })
     
     if scores["mood_score"] < 40:
-        mood_analysis = analyze_mood_trends(db, user_id)
         insights_to_add.append({
             "category": "mood",
             "insight_type": "alert",
@@ -152,7 +277,24 @@ def generate_insights(db: Session, user_id: int):
             "priority": 1
         })
     
-    for insight_data in insights_to_add:
+    return insights_to_add
+
+def generate_insights(db: Session, user_id: int, scores: Optional[dict] = None):
+    today = date.today()
+    
+    existing = db.query(AIInsight).filter(
+        AIInsight.user_id == user_id,
+        AIInsight.generated_at >= today
+    ).first()
+    
+    if existing:
+        return
+    
+    if scores is None:
+        life_score = get_today_life_score(db, user_id)
+        scores = {field: getattr(life_score, field) for field in SCORE_FIELDS}
+    
+    for insight_data in build_insights(scores):
         insight = AIInsight(
             user_id=user_id,
             **insight_data
@@ -160,3 +302,33 @@ def generate_insights(db: Session, user_id: int):
         db.add(insight)
     
     db.commit()
+
+def score_users(db: Session, user_ids: List[int], today: Optional[date] = None, vectorized: bool = True) -> int:
+    # Batch counterpart of get_today_life_score + generate_insights for a cohort, in one transaction.
+    # The loaders have no upper bound and insights are stamped now(), so today has to be the current day.
+    today = today or date.today()
+    if vectorized:
+        scores = score_rows(load_score_columns(db, user_ids, today=today), WEIGHTS)
+    else:
+        inputs = load_score_inputs_bulk(db, user_ids, today=today)
+        scores = {user_id: compute_life_score(user_inputs) for user_id, user_inputs in inputs.items()}
+    
+    upsert_many(db, LifeScore, [
+        dict(user_id=user_id, calculated_at=today, **user_scores)
+        for user_id, user_scores in scores.items()
+    ], ["user_id", "calculated_at"])
+    
+    with_insights = {row[0] for row in db.query(AIInsight.user_id).filter(
+        AIInsight.user_id.in_(user_ids),
+        AIInsight.generated_at >= today
+    ).distinct().all()}
+    insight_rows = [
+        dict(user_id=user_id, **insight_data)
+        for user_id, user_scores in scores.items() if user_id not in with_insights
+        for insight_data in build_insights(user_scores)
+    ]
+    if insight_rows:
+        db.execute(insert(AIInsight.__table__), insight_rows)
+    
+    db.commit()
+    return len(scores)
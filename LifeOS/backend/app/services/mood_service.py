@@ -1,22 +1,22 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
-from ..models.mood import MoodEntry
+from typing import List, Tuple
+from .data_version_service import MOOD
+from ..ai.mood_analyzer import sentiment_engine
+from ..core.result_cache import result_cache
+from ..models.mood import MoodEntry, JournalEntry
+from ..models.rollup import DailyMood
 
-def get_mood_score(db: Session, user_id: int, days: int = 7) -> float:
-    start_date = date.today() - timedelta(days=days)
-    
-    entries = db.query(MoodEntry).filter(
-        MoodEntry.user_id == user_id,
-        MoodEntry.logged_at >= start_date
-    ).all()
-    
-    if not entries:
+def score_mood(daily_totals: List[DailyMood]) -> float:
+    count = sum(d.entries for d in daily_totals)
+    if not count:
         return 50.0
     
-    avg_mood = sum(e.mood_score for e in entries) / len(entries)
-    avg_energy = sum(e.energy_level for e in entries) / len(entries)
-    avg_stress = sum(e.stress_level for e in entries) / len(entries)
-    avg_sleep = sum(e.sleep_hours or 7 for e in entries) / len(entries)
+    avg_mood = sum(d.mood_total for d in daily_totals) / count
+    avg_energy = sum(d.energy_total for d in daily_totals) / count
+    avg_stress = sum(d.stress_total for d in daily_totals) / count
+    avg_sleep = sum(d.sleep_total + (d.entries - d.sleep_entries) * 7 for d in daily_totals) / count
     
     mood_score = avg_mood * 10
     energy_score = avg_energy * 10
@@ -27,6 +27,45 @@ def get_mood_score(db: Session, user_id: int, days: int = 7) -> float:
     
     return min(round(total_score, 2), 100)
 
+def get_mood_score(db: Session, user_id: int, days: int = 7) -> float:
+    start_date = date.today() - timedelta(days=days)
+    
+    daily_totals = db.query(DailyMood).filter(
+        DailyMood.user_id == user_id,
+        DailyMood.day >= start_date,
+        DailyMood.entries > 0
+    ).all()
+    
+    return score_mood(daily_totals)
+
+@result_cache.cached("mood-stats", [MOOD])
+def get_mood_stats(db: Session, user_id: int, days: int = 30) -> dict:
+    start_date = date.today() - timedelta(days=days)
+    daily_totals = db.query(DailyMood).filter(
+        DailyMood.user_id == user_id,
+        DailyMood.day >= start_date,
+        DailyMood.entries > 0
+    ).all()
+    
+    total = sum(d.entries for d in daily_totals)
+    if not total:
+        return {
+            "avg_mood": 0,
+            "avg_energy": 0,
+            "avg_stress": 0,
+            "avg_sleep": 0,
+            "total_entries": 0
+        }
+    
+    return {
+        "avg_mood": sum(d.mood_total for d in daily_totals) / total,
+        "avg_energy": sum(d.energy_total for d in daily_totals) / total,
+        "avg_stress": sum(d.stress_total for d in daily_totals) / total,
+        "avg_sleep": sum(d.sleep_total for d in daily_totals) / total,
+        "total_entries": total
+    }
+
+@result_cache.cached("mood-trends", [MOOD])
 def analyze_mood_trends(db: Session, user_id: int, days: int = 30) -> dict:
     start_date = date.today() - timedelta(days=days)
     
@@ -68,3 +107,18 @@ def analyze_mood_trends(db: Session, user_id: int, days: int = 30) -> dict:
             insights.append("Your average sleep is below recommended. Aim for 7-8 hours.")
     
     return {"trend": trend, "insights": insights}
+
+def journal_sentiment(content: str) -> dict:
+    result = sentiment_engine.analyze(content)
+    return {"sentiment": result["sentiment"], "sentiment_score": result["score"]}
+
+def score_journal_entries(db: Session, rows: List[Tuple[int, str]]) -> int:
+    # rows are (journal id, content); one executemany writes every score.
+    if not rows:
+        return 0
+    results = sentiment_engine.analyze_many(content for _, content in rows)
+    db.execute(update(JournalEntry), [
+        {"id": journal_id, "sentiment": result["sentiment"], "sentiment_score": result["score"]}
+        for (journal_id, _), result in zip(rows, results)
+    ])
+    return len(rows)
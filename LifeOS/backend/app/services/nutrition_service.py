@@ -1,40 +1,68 @@
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Optional
+from .data_version_service import NUTRITION
+from ..ai.food_catalog import FoodCatalog, NUTRIENTS
+from ..ai.nutrition_model import builtin_food_catalog
+from ..core.config import settings
+from ..core.result_cache import result_cache
 from ..models.nutrition import FoodLog, NutritionGoal
+from ..models.rollup import DailyNutrition
 
-def get_nutrition_score(db: Session, user_id: int, days: int = 7) -> float:
-    start_date = date.today() - timedelta(days=days)
-    
-    goal = db.query(NutritionGoal).filter(NutritionGoal.user_id == user_id).first()
+@lru_cache()
+def get_food_catalog() -> FoodCatalog:
+    # Memory-mapped from FOOD_CATALOG_PATH (see app.jobs.build_food_catalog), so workers share one copy.
+    if settings.food_catalog_path:
+        return FoodCatalog.load(settings.food_catalog_path)
+    return builtin_food_catalog()
+
+def search_foods(query: str, limit: int = 10) -> List[dict]:
+    catalog = get_food_catalog()
+    return [catalog.food(index) for index in catalog.search(query, limit)]
+
+def fill_food_nutrients(values: dict, fields_set: set) -> dict:
+    # A log sent without any nutrient values takes them, and the serving size, from the closest catalog food.
+    # The values are for the catalog's serving; a serving_size sent by the client is kept but not scaled to.
+    if fields_set & set(NUTRIENTS):
+        return values
+    catalog = get_food_catalog()
+    index = catalog.match(values["food_name"])
+    if index is None:
+        return values
+    food = catalog.food(index)
+    values.update({field: food[field] for field in NUTRIENTS})
+    if not values.get("serving_size"):
+        values["serving_size"] = food["serving_size"]
+    return values
+
+def get_nutrition_goals(goal: Optional[NutritionGoal]) -> dict:
     if not goal:
-        goal_calories = 2000
-        goal_protein = 50
-        goal_carbs = 250
-        goal_fat = 65
-    else:
-        goal_calories = goal.daily_calories
-        goal_protein = goal.daily_protein
-        goal_carbs = goal.daily_carbs
-        goal_fat = goal.daily_fat
-    
-    food_logs = db.query(FoodLog).filter(
-        FoodLog.user_id == user_id,
-        FoodLog.logged_at >= start_date
-    ).all()
-    
-    if not food_logs:
+        return {"calories": 2000, "protein": 50, "carbs": 250, "fat": 65}
+    return {
+        "calories": goal.daily_calories,
+        "protein": goal.daily_protein,
+        "carbs": goal.daily_carbs,
+        "fat": goal.daily_fat
+    }
+
+def score_nutrition(daily_totals: List[DailyNutrition], goal: Optional[NutritionGoal], days: int = 7) -> float:
+    daily_totals = [d for d in daily_totals if d.food_entries > 0]
+    if not daily_totals:
         return 50.0
     
-    days_logged = set(log.logged_at for log in food_logs)
+    goals = get_nutrition_goals(goal)
+    goal_calories = goals["calories"]
+    goal_protein = goals["protein"]
+    goal_carbs = goals["carbs"]
+    goal_fat = goals["fat"]
     
     total_score = 0
-    for log_date in days_logged:
-        day_logs = [l for l in food_logs if l.logged_at == log_date]
-        
-        total_cal = sum(l.calories for l in day_logs)
-        total_protein = sum(l.protein for l in day_logs)
-        total_carbs = sum(l.carbs for l in day_logs)
-        total_fat = sum(l.fat for l in day_logs)
+    for day in daily_totals:
+        total_cal = day.calories
+        total_protein = day.protein
+        total_carbs = day.carbs
+        total_fat = day.fat
         
         cal_ratio = min(total_cal / goal_calories, 1.2) if goal_calories > 0 else 1
         cal_score = 100 - abs(1 - cal_ratio) * 100
@@ -51,11 +79,25 @@ def get_nutrition_score(db: Session, user_id: int, days: int = 7) -> float:
         day_score = cal_score * 0.4 + protein_score * 0.3 + carb_score * 0.15 + fat_score * 0.15
         total_score += max(0, day_score)
     
-    consistency_bonus = (len(days_logged) / days) * 20
-    avg_score = (total_score / len(days_logged)) + consistency_bonus
+    consistency_bonus = (len(daily_totals) / days) * 20
+    avg_score = (total_score / len(daily_totals)) + consistency_bonus
     
     return min(round(avg_score, 2), 100)
 
+def get_nutrition_score(db: Session, user_id: int, days: int = 7) -> float:
+    start_date = date.today() - timedelta(days=days)
+    
+    goal = db.query(NutritionGoal).filter(NutritionGoal.user_id == user_id).first()
+    
+    daily_totals = db.query(DailyNutrition).filter(
+        DailyNutrition.user_id == user_id,
+        DailyNutrition.day >= start_date,
+        DailyNutrition.food_entries > 0
+    ).all()
+    
+    return score_nutrition(daily_totals, goal, days)
+
+@result_cache.cached("nutrition-patterns", [NUTRITION])
 def analyze_nutrition_patterns(db: Session, user_id: int, days: int = 14) -> dict:
     start_date = date.today() - timedelta(days=days)
     
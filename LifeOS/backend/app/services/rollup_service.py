@@ -0,0 +1,261 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select
+from datetime import date
+from typing import Dict, Iterable, Tuple
+from ..models.user import User
+from ..models.rollup import DailyHabit, DailyNutrition, DailyMood, DailyFinance
+from ..models.habit import HabitLog
+from ..models.mood import MoodEntry, JournalTag, JournalTagCount
+from ..models.nutrition import FoodLog, WaterLog
+from ..models.finance import Transaction
+from .upsert_service import upsert, upsert_many
+
+def _get_or_create(db: Session, model, defaults: dict, **keys):
+    row = db.query(model).filter_by(**keys).first()
+    if not row:
+        row = model(**keys, **defaults)
+        db.add(row)
+        db.flush()
+    return row
+
+def record_habit_log(db: Session, log: HabitLog, sign: int = 1):
+    row = _get_or_create(
+        db, DailyHabit, {"log_entries": 0},
+        user_id=log.user_id, day=log.completed_at
+    )
+    row.log_entries += sign
+
+def record_food_log(db: Session, log: FoodLog, sign: int = 1):
+    row = _get_or_create(
+        db, DailyNutrition,
+        {"food_entries": 0, "calories": 0, "protein": 0, "carbs": 0, "fat": 0, "fiber": 0, "water_ml": 0},
+        user_id=log.user_id, day=log.logged_at
+    )
+    row.food_entries += sign
+    row.calories += sign * (log.calories or 0)
+    row.protein += sign * (log.protein or 0)
+    row.carbs += sign * (log.carbs or 0)
+    row.fat += sign * (log.fat or 0)
+    row.fiber += sign * (log.fiber or 0)
+
+def record_water_intake(db: Session, user_id: int, day: date, amount_ml: int):
+    upsert(
+        db, DailyNutrition,
+        {"user_id": user_id, "day": day, "food_entries": 0, "calories": 0, "protein": 0, "carbs": 0, "fat": 0, "fiber": 0, "water_ml": amount_ml},
+        ["user_id", "day"],
+        lambda excluded: {"water_ml": DailyNutrition.water_ml + excluded.water_ml}
+    )
+
+def record_mood_entry(db: Session, entry: MoodEntry, sign: int = 1):
+    row = _get_or_create(
+        db, DailyMood,
+        {"entries": 0, "mood_total": 0, "energy_total": 0, "stress_total": 0, "sleep_total": 0, "sleep_entries": 0},
+        user_id=entry.user_id, day=entry.logged_at
+    )
+    row.entries += sign
+    row.mood_total += sign * (entry.mood_score or 0)
+    row.energy_total += sign * (entry.energy_level or 0)
+    row.stress_total += sign * (entry.stress_level or 0)
+    if entry.sleep_hours:
+        row.sleep_total += sign * entry.sleep_hours
+        row.sleep_entries += sign
+
+def sync_mood_rollup(db: Session, entry: MoodEntry):
+    # There is at most one mood entry per user and day, so the day's rollup is that entry.
+    has_sleep = bool(entry.sleep_hours)
+    upsert(db, DailyMood, {
+        "user_id": entry.user_id,
+        "day": entry.logged_at,
+        "entries": 1,
+        "mood_total": entry.mood_score or 0,
+        "energy_total": entry.energy_level or 0,
+        "stress_total": entry.stress_level or 0,
+        "sleep_total": entry.sleep_hours if has_sleep else 0,
+        "sleep_entries": 1 if has_sleep else 0
+    }, ["user_id", "day"])
+
+def sync_habit_day_rollup(db: Session, user_id: int, day: date):
+    log_entries = select(func.count(HabitLog.id)).where(
+        HabitLog.user_id == user_id,
+        HabitLog.completed_at == day
+    ).scalar_subquery()
+    upsert(db, DailyHabit, {"user_id": user_id, "day": day, "log_entries": log_entries}, ["user_id", "day"])
+
+def record_transaction(db: Session, transaction: Transaction, sign: int = 1):
+    row = _get_or_create(
+        db, DailyFinance, {"entries": 0, "amount": 0},
+        user_id=transaction.user_id, day=transaction.transaction_date,
+        type=transaction.type, category=transaction.category
+    )
+    row.entries += sign
+    row.amount += sign * (transaction.amount or 0)
+
+def apply_rollup_deltas(db: Session, model, user_id: int, key_fields: Tuple[str, ...], deltas: Dict[tuple, Dict[str, float]], defaults: dict):
+    if not deltas:
+        return
+    
+    days = [key[0] for key in deltas]
+    existing = {
+        tuple(getattr(row, field) for field in key_fields): row
+        for row in db.query(model).filter(
+            model.user_id == user_id,
+            model.day >= min(days),
+            model.day <= max(days)
+        ).all()
+    }
+    
+    for key, values in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            row = model(user_id=user_id, **dict(zip(key_fields, key)), **defaults)
+            db.add(row)
+        for field, value in values.items():
+            setattr(row, field, getattr(row, field) + value)
+    
+    db.flush()
+
+def sync_habit_day_rollups(db: Session, user_id: int, days: Iterable[date]):
+    # Batch form of sync_habit_day_rollup: recounts the logs on each day instead of adding deltas, so
+    # logs written concurrently by POST /api/habits/log are never counted twice or missed.
+    days = set(days)
+    if not days:
+        return
+    counts = db.query(HabitLog.completed_at, func.count(HabitLog.id)).filter(
+        HabitLog.user_id == user_id,
+        HabitLog.completed_at >= min(days),
+        HabitLog.completed_at <= max(days)
+    ).group_by(HabitLog.completed_at).all()
+    upsert_many(db, DailyHabit, [
+        {"user_id": user_id, "day": day, "log_entries": log_entries}
+        for day, log_entries in counts if day in days
+    ], ["user_id", "day"])
+
+def add_food_log_deltas(deltas: dict, logs: list) -> dict:
+    for log in logs:
+        totals = deltas.setdefault((log["logged_at"],), {"food_entries": 0, "calories": 0, "protein": 0, "carbs": 0, "fat": 0, "fiber": 0})
+        totals["food_entries"] += 1
+        for field in ("calories", "protein", "carbs", "fat", "fiber"):
+            totals[field] += log.get(field) or 0
+    return deltas
+
+def record_food_logs_bulk(db: Session, user_id: int, deltas: dict):
+    apply_rollup_deltas(
+        db, DailyNutrition, user_id, ("day",), deltas,
+        {"food_entries": 0, "calories": 0, "protein": 0, "carbs": 0, "fat": 0, "fiber": 0, "water_ml": 0}
+    )
+
+def add_transaction_deltas(deltas: dict, transactions: list) -> dict:
+    for transaction in transactions:
+        key = (transaction["transaction_date"], transaction["type"], transaction["category"])
+        totals = deltas.setdefault(key, {"entries": 0, "amount": 0})
+        totals["entries"] += 1
+        totals["amount"] += transaction.get("amount") or 0
+    return deltas
+
+def record_transactions_bulk(db: Session, user_id: int, deltas: dict):
+    apply_rollup_deltas(db, DailyFinance, user_id, ("day", "type", "category"), deltas, {"entries": 0, "amount": 0})
+
+def rebuild_user_rollups(db: Session, user_id: int):
+    for model in (DailyHabit, DailyNutrition, DailyMood, DailyFinance):
+        db.query(model).filter(model.user_id == user_id).delete(synchronize_session=False)
+    
+    habit_days = db.query(HabitLog.completed_at, func.count(HabitLog.id)).filter(
+        HabitLog.user_id == user_id
+    ).group_by(HabitLog.completed_at).all()
+    db.add_all([
+        DailyHabit(user_id=user_id, day=day, log_entries=count)
+        for day, count in habit_days
+    ])
+    
+    food_days = db.query(
+        FoodLog.logged_at,
+        func.count(FoodLog.id),
+        func.coalesce(func.sum(FoodLog.calories), 0),
+        func.coalesce(func.sum(FoodLog.protein), 0),
+        func.coalesce(func.sum(FoodLog.carbs), 0),
+        func.coalesce(func.sum(FoodLog.fat), 0),
+        func.coalesce(func.sum(FoodLog.fiber), 0)
+    ).filter(FoodLog.user_id == user_id).group_by(FoodLog.logged_at).all()
+    water_days = dict(db.query(WaterLog.logged_at, func.sum(WaterLog.amount_ml)).filter(
+        WaterLog.user_id == user_id
+    ).group_by(WaterLog.logged_at).all())
+    
+    nutrition_rows = {}
+    for day, count, calories, protein, carbs, fat, fiber in food_days:
+        nutrition_rows[day] = DailyNutrition(
+            user_id=user_id, day=day, food_entries=count,
+            calories=calories, protein=protein, carbs=carbs, fat=fat, fiber=fiber,
+            water_ml=water_days.pop(day, 0) or 0
+        )
+    for day, water_ml in water_days.items():
+        nutrition_rows[day] = DailyNutrition(
+            user_id=user_id, day=day, food_entries=0,
+            calories=0, protein=0, carbs=0, fat=0, fiber=0,
+            water_ml=water_ml or 0
+        )
+    db.add_all(nutrition_rows.values())
+    
+    has_sleep = MoodEntry.sleep_hours > 0
+    mood_days = db.query(
+        MoodEntry.logged_at,
+        func.count(MoodEntry.id),
+        func.coalesce(func.sum(MoodEntry.mood_score), 0),
+        func.coalesce(func.sum(MoodEntry.energy_level), 0),
+        func.coalesce(func.sum(MoodEntry.stress_level), 0),
+        func.sum(case((has_sleep, MoodEntry.sleep_hours), else_=0)),
+        func.sum(case((has_sleep, 1), else_=0))
+    ).filter(MoodEntry.user_id == user_id).group_by(MoodEntry.logged_at).all()
+    db.add_all([
+        DailyMood(
+            user_id=user_id, day=day, entries=count,
+            mood_total=mood, energy_total=energy, stress_total=stress,
+            sleep_total=sleep, sleep_entries=sleep_count
+        )
+        for day, count, mood, energy, stress, sleep, sleep_count in mood_days
+    ])
+    
+    finance_days = db.query(
+        Transaction.transaction_date,
+        Transaction.type,
+        Transaction.category,
+        func.count(Transaction.id),
+        func.coalesce(func.sum(Transaction.amount), 0)
+    ).filter(Transaction.user_id == user_id).group_by(
+        Transaction.transaction_date, Transaction.type, Transaction.category
+    ).all()
+    db.add_all([
+        DailyFinance(
+            user_id=user_id, day=day, type=type_, category=category,
+            entries=count, amount=amount
+        )
+        for day, type_, category, count, amount in finance_days
+    ])
+    
+    db.query(JournalTagCount).filter(JournalTagCount.user_id == user_id).delete(synchronize_session=False)
+    tag_counts = db.query(JournalTag.tag, func.count(JournalTag.journal_id)).filter(
+        JournalTag.user_id == user_id
+    ).group_by(JournalTag.tag).all()
+    db.add_all([JournalTagCount(user_id=user_id, tag=tag, entries=count) for tag, count in tag_counts])
+    
+    db.flush()
+
+def rebuild_all_rollups(db: Session, chunk_size: int = 500) -> int:
+    rebuilt = 0
+    last_id = 0
+    
+    while True:
+        user_ids = [row[0] for row in db.query(User.id).filter(
+            User.id > last_id
+        ).order_by(User.id).limit(chunk_size).all()]
+        
+        if not user_ids:
+            break
+        
+        for user_id in user_ids:
+            rebuild_user_rollups(db, user_id)
+        db.commit()
+        
+        rebuilt += len(user_ids)
+        last_id = user_ids[-1]
+    
+    return rebuilt
@@ -0,0 +1,347 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .habit_service import MAX_STREAK_DAYS
+from ..models.habit import Habit, HabitLog
+from ..models.nutrition import NutritionGoal
+from ..models.finance import Budget
+from ..models.rollup import DailyNutrition, DailyMood, DailyFinance
+
+# Columnar counterpart of life_score_service.compute_life_score: every score for a whole cohort
+# in a handful of array operations instead of a Python loop per user, habit and day.
+#
+# A cohort is a dict of flat NumPy arrays. Rows point at their user by position in "user_ids"
+# (*_user columns) and carry their date as a day offset back from "today" (0 = today,
+# negative = future-dated). Categories are small integers into "categories".
+
+DEFAULT_GOALS = (2000.0, 50.0, 250.0, 65.0)
+COMPLETION_DAYS = 30
+BITMAP_CELLS = 1 << 26
+
+FINANCE_OTHER = 0
+FINANCE_INCOME = 1
+FINANCE_EXPENSE = 2
+FINANCE_TYPES = {"income": FINANCE_INCOME, "expense": FINANCE_EXPENSE}
+
+def _day_offsets(today: date, days: List[date]) -> np.ndarray:
+    if not days:
+        return np.zeros(0, dtype=np.int64)
+    return today.toordinal() - np.fromiter((day.toordinal() for day in days), dtype=np.int64, count=len(days))
+
+def _columns(rows: list, count: int) -> List[list]:
+    return [list(column) for column in zip(*rows)] if rows else [[] for _ in range(count)]
+
+def load_score_columns(db: Session, user_ids: List[int], window_days: int = 7, today: Optional[date] = None) -> Dict[str, np.ndarray]:
+    # Same rows as load_score_inputs_bulk, fetched as plain tuples on the session's connection
+    # (no ORM row processing) and turned into arrays.
+    today = today or date.today()
+    window_start = today - timedelta(days=window_days)
+    month_start = date(today.year, today.month, 1)
+    habit_start = min(today - timedelta(days=MAX_STREAK_DAYS - 1), today - timedelta(days=COMPLETION_DAYS))
+
+    connection = db.connection()
+    users = np.array(sorted(user_ids), dtype=np.int64)
+
+    def user_index(ids: list) -> np.ndarray:
+        return np.searchsorted(users, np.array(ids, dtype=np.int64))
+
+    habit_user, habit_id = _columns(connection.execute(
+        select(Habit.user_id, Habit.id).where(Habit.user_id.in_(user_ids), Habit.is_active == True)
+    ).all(), 2)
+
+    log_user, log_habit, log_day = _columns(connection.execute(
+        select(HabitLog.user_id, HabitLog.habit_id, HabitLog.completed_at).where(
+            HabitLog.user_id.in_(user_ids),
+            HabitLog.completed_at >= habit_start
+        ).distinct()
+    ).all(), 3)
+
+    nutrition = _columns(connection.execute(
+        select(
+            DailyNutrition.user_id, DailyNutrition.food_entries, DailyNutrition.calories,
+            DailyNutrition.protein, DailyNutrition.carbs, DailyNutrition.fat
+        ).where(DailyNutrition.user_id.in_(user_ids), DailyNutrition.day >= window_start)
+    ).all(), 6)
+
+    mood = _columns(connection.execute(
+        select(
+            DailyMood.user_id, DailyMood.entries, DailyMood.mood_total, DailyMood.energy_total,
+            DailyMood.stress_total, DailyMood.sleep_total, DailyMood.sleep_entries
+        ).where(DailyMood.user_id.in_(user_ids), DailyMood.day >= window_start, DailyMood.entries > 0)
+    ).all(), 7)
+
+    finance_user, finance_day, finance_type, finance_category, finance_entries, finance_amount = _columns(connection.execute(
+        select(
+            DailyFinance.user_id, DailyFinance.day, DailyFinance.type, DailyFinance.category,
+            DailyFinance.entries, DailyFinance.amount
+        ).where(
+            DailyFinance.user_id.in_(user_ids),
+            DailyFinance.day >= min(month_start, window_start),
+            DailyFinance.entries > 0
+        )
+    ).all(), 6)
+
+    goals = np.tile(np.array(DEFAULT_GOALS), (len(users), 1))
+    for user_id, *values in connection.execute(
+        select(
+            NutritionGoal.user_id, NutritionGoal.daily_calories, NutritionGoal.daily_protein,
+            NutritionGoal.daily_carbs, NutritionGoal.daily_fat
+        ).where(NutritionGoal.user_id.in_(user_ids))
+    ).all():
+        goals[np.searchsorted(users, user_id)] = values
+
+    budget_user, budget_category, budget_limit = _columns(connection.execute(
+        select(Budget.user_id, Budget.category, Budget.monthly_limit).where(Budget.user_id.in_(user_ids))
+    ).all(), 3)
+
+    categories, category_codes = np.unique(np.array(finance_category + budget_category, dtype=object).astype(str), return_inverse=True)
+
+    return {
+        "today": today,
+        "window_days": window_days,
+        "month_offset": (today - month_start).days,
+        "user_ids": users,
+        "habit_user": user_index(habit_user),
+        "habit_id": np.array(habit_id, dtype=np.int64),
+        "log_user": user_index(log_user),
+        "log_habit": np.array(log_habit, dtype=np.int64),
+        "log_offset": _day_offsets(today, log_day),
+        "nutrition_user": user_index(nutrition[0]),
+        "nutrition_entries": np.array(nutrition[1], dtype=np.int64),
+        "nutrition_values": np.array(nutrition[2:], dtype=np.float64).reshape(4, -1).T,
+        "goals": goals,
+        "mood_user": user_index(mood[0]),
+        "mood_entries": np.array(mood[1], dtype=np.int64),
+        "mood_values": np.array(mood[2:], dtype=np.float64).reshape(5, -1).T,
+        "finance_user": user_index(finance_user),
+        "finance_offset": _day_offsets(today, finance_day),
+        "finance_type": np.array([FINANCE_TYPES.get(type_, FINANCE_OTHER) for type_ in finance_type], dtype=np.int8),
+        "finance_category": category_codes[:len(finance_category)].astype(np.int64),
+        "finance_entries": np.array(finance_entries, dtype=np.int64),
+        "finance_amount": np.array(finance_amount, dtype=np.float64),
+        "budget_user": user_index(budget_user),
+        "budget_category": category_codes[len(finance_category):].astype(np.int64),
+        "budget_limit": np.array(budget_limit, dtype=np.float64),
+        "categories": categories
+    }
+
+def round2(values: np.ndarray) -> np.ndarray:
+    # Python's round(x, 2) rounds the exact binary value; np.round(x, 2) rounds x * 100 after it has
+    # already been rounded to a double, which lands on the other side of .xx5 for a few percent of
+    # scores. x * 100 is split into a double and its exact error (Dekker) so ties resolve the same way.
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 100
+    split = values * 134217729.0
+    high = split - (split - values)
+    error = (high * 100 - scaled) + (values - high) * 100
+    rounded = np.rint(scaled)
+    fraction = scaled - rounded
+    above = (fraction - 0.5) + error
+    below = (fraction + 0.5) + error
+    rounded = np.where(above > 0, rounded + 1, np.where(below < 0, rounded - 1, rounded))
+    # Exact ties the double product hid: round half to even like Python.
+    odd = np.remainder(rounded, 2) == 1
+    rounded = np.where((above == 0) & (error != 0) & odd, rounded + 1, rounded)
+    rounded = np.where((below == 0) & (error != 0) & odd, rounded - 1, rounded)
+    return rounded / 100
+
+def _first_of_runs(*keys: np.ndarray):
+    # Sorts rows by the keys (last key most significant) and flags the first row of every distinct key.
+    order = np.lexsort(keys)
+    first = np.ones(len(order), dtype=bool)
+    for key in keys:
+        sorted_key = key[order]
+        first[1:] &= sorted_key[1:] == sorted_key[:-1]
+    first[1:] = ~first[1:]
+    return order, first
+
+def _per_user(user: np.ndarray, n_users: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    return np.bincount(user, weights=weights, minlength=n_users).astype(np.float64)
+
+def _distinct_days_per_group(group: np.ndarray, offset: np.ndarray, n_groups: int) -> np.ndarray:
+    if not len(group):
+        return np.zeros(n_groups)
+    low = int(offset.min())
+    span = int(offset.max()) - low + 1
+    # Marking a (group, day) grid is far cheaper than sorting when the days cover a short range;
+    # a far-future outlier falls back to sorting instead of allocating a huge grid.
+    if span * n_groups <= BITMAP_CELLS:
+        seen = np.zeros((n_groups, span), dtype=bool)
+        seen[group, offset - low] = True
+        return seen.sum(axis=1, dtype=np.float64)
+    order, first = _first_of_runs(offset, group)
+    return _per_user(group[order][first], n_groups)
+
+def _positions(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # Index of each value in the distinct keys, -1 where absent: a dense id table when the ids
+    # span a modest range, a binary search otherwise.
+    if not len(keys) or not len(values):
+        return np.full(len(values), -1, dtype=np.int64)
+    low = int(min(keys.min(), values.min()))
+    span = int(max(keys.max(), values.max())) - low + 1
+    if span <= BITMAP_CELLS:
+        table = np.full(span, -1, dtype=np.int64)
+        table[keys - low] = np.arange(len(keys))
+        return table[values - low]
+    by_key = np.argsort(keys)
+    position = np.minimum(np.searchsorted(keys, values, sorter=by_key), len(keys) - 1)
+    return np.where(keys[by_key[position]] == values, by_key[position], -1)
+
+def habit_scores(cohort: Dict[str, np.ndarray]) -> np.ndarray:
+    n_users = len(cohort["user_ids"])
+    habit_user = cohort["habit_user"]
+    habit_id = cohort["habit_id"]
+
+    # Logs of inactive habits still count towards consistency, but not here.
+    log_index = _positions(habit_id, cohort["log_habit"])
+    active = log_index >= 0
+    log_index = log_index[active]
+    log_offset = cohort["log_offset"][active]
+
+    recent = log_offset <= COMPLETION_DAYS
+    completed = _distinct_days_per_group(log_index[recent], log_offset[recent], len(habit_id))
+    completion_rate = round2(completed / COMPLETION_DAYS * 100)
+
+    # One row of days per habit, today first; the streak is the length of the leading run of
+    # logged days, i.e. the first unlogged column (the extra column is never logged).
+    past = (log_offset >= 0) & (log_offset < MAX_STREAK_DAYS)
+    logged = np.zeros((len(habit_id), MAX_STREAK_DAYS + 1), dtype=bool)
+    logged[log_index[past], log_offset[past]] = True
+    streak = np.argmin(logged, axis=1)
+
+    per_habit = np.minimum(streak * 5, 50) + completion_rate * 0.5
+    habits = _per_user(habit_user, n_users)
+    totals = _per_user(habit_user, n_users, per_habit)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.minimum(round2(totals / habits), 100)
+    return np.where(habits > 0, scores, 50.0)
+
+def nutrition_scores(cohort: Dict[str, np.ndarray]) -> np.ndarray:
+    n_users = len(cohort["user_ids"])
+    logged = cohort["nutrition_entries"] > 0
+    user = cohort["nutrition_user"][logged]
+    values = cohort["nutrition_values"][logged]
+    goals = cohort["goals"][user]
+
+    has_goal = goals > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratios = np.where(has_goal, np.minimum(values / np.where(has_goal, goals, 1), [1.2, 1.5, 1.2, 1.2]), 1)
+    cal_score = 100 - np.abs(1 - ratios[:, 0]) * 100
+    protein_score = np.minimum(ratios[:, 1] * 100, 100)
+    carb_score = 100 - np.abs(1 - ratios[:, 2]) * 50
+    fat_score = 100 - np.abs(1 - ratios[:, 3]) * 50
+    day_score = np.maximum(0, cal_score * 0.4 + protein_score * 0.3 + carb_score * 0.15 + fat_score * 0.15)
+
+    days = _per_user(user, n_users)
+    totals = _per_user(user, n_users, day_score)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.minimum(round2((totals / days) + (days / cohort["window_days"]) * 20), 100)
+    return np.where(days > 0, scores, 50.0)
+
+def mood_scores(cohort: Dict[str, np.ndarray]) -> np.ndarray:
+    n_users = len(cohort["user_ids"])
+    user = cohort["mood_user"]
+    entries = cohort["mood_entries"]
+    mood_total, energy_total, stress_total, sleep_total, sleep_entries = cohort["mood_values"].T
+
+    count = _per_user(user, n_users, entries)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_mood = _per_user(user, n_users, mood_total) / count
+        avg_energy = _per_user(user, n_users, energy_total) / count
+        avg_stress = _per_user(user, n_users, stress_total) / count
+        # Entries without sleep_hours count as 7 hours.
+        avg_sleep = _per_user(user, n_users, sleep_total + (entries - sleep_entries) * 7) / count
+
+    mood_score = avg_mood * 10
+    energy_score = avg_energy * 10
+    stress_score = (10 - avg_stress) * 10
+    sleep_score = np.minimum(avg_sleep / 8 * 100, 100)
+    total_score = mood_score * 0.4 + energy_score * 0.2 + stress_score * 0.2 + sleep_score * 0.2
+
+    return np.where(count > 0, np.minimum(round2(total_score), 100), 50.0)
+
+def finance_scores(cohort: Dict[str, np.ndarray]) -> np.ndarray:
+    n_users = len(cohort["user_ids"])
+    in_month = cohort["finance_offset"] <= cohort["month_offset"]
+    user = cohort["finance_user"][in_month]
+    type_ = cohort["finance_type"][in_month]
+    amount = cohort["finance_amount"][in_month]
+    income_row = type_ == FINANCE_INCOME
+    expense_row = type_ == FINANCE_EXPENSE
+
+    transaction_count = _per_user(user, n_users, cohort["finance_entries"][in_month])
+    income = _per_user(user[income_row], n_users, amount[income_row])
+    expenses = _per_user(user[expense_row], n_users, amount[expense_row])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        savings_rate = np.where(income == 0, 0, (income - expenses) / income * 100)
+    savings_score = np.select(
+        [savings_rate >= 30, savings_rate >= 20, savings_rate >= 10, savings_rate >= 0],
+        [100, 80, 60, 40],
+        np.maximum(0, 40 + savings_rate)
+    )
+
+    # Month-to-date spend per (user, category), looked up for every budget.
+    n_categories = max(len(cohort["categories"]), 1)
+    spend_keys, spend_index = np.unique(
+        user[expense_row] * n_categories + cohort["finance_category"][in_month][expense_row], return_inverse=True
+    )
+    spend = np.bincount(spend_index.ravel(), weights=amount[expense_row], minlength=len(spend_keys))
+    budget_user = cohort["budget_user"]
+    budget_keys = budget_user * n_categories + cohort["budget_category"]
+    position = np.minimum(np.searchsorted(spend_keys, budget_keys), max(len(spend_keys) - 1, 0))
+    spent = np.where(spend_keys[position] == budget_keys, spend[position], 0) if len(spend_keys) else np.zeros(len(budget_keys))
+
+    budgets = _per_user(budget_user, n_users)
+    over_budget = _per_user(budget_user[spent > cohort["budget_limit"]], n_users)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        budget_score = np.where(budgets > 0, 100 - (over_budget / budgets * 100), 100)
+
+    total_score = savings_score * 0.6 + budget_score * 0.4
+    return np.where(transaction_count > 0, np.minimum(round2(total_score), 100), 50.0)
+
+def consistency_scores(cohort: Dict[str, np.ndarray]) -> np.ndarray:
+    n_users = len(cohort["user_ids"])
+    days = cohort["window_days"]
+
+    in_window = cohort["log_offset"] <= days
+    habit_days = _distinct_days_per_group(cohort["log_user"][in_window], cohort["log_offset"][in_window], n_users)
+    mood_days = _per_user(cohort["mood_user"][cohort["mood_entries"] > 0], n_users)
+    food_days = _per_user(cohort["nutrition_user"][cohort["nutrition_entries"] > 0], n_users)
+    in_window = cohort["finance_offset"] <= days
+    finance_days = _distinct_days_per_group(cohort["finance_user"][in_window], cohort["finance_offset"][in_window], n_users)
+
+    avg_consistency = (
+        (habit_days / days) * 25 +
+        (mood_days / days) * 25 +
+        (food_days / days) * 25 +
+        (np.minimum(finance_days, days) / days) * 25
+    )
+    return np.minimum(round2(avg_consistency), 100)
+
+def compute_life_scores(cohort: Dict[str, np.ndarray], weights: Dict[str, float]) -> Dict[str, np.ndarray]:
+    scores = {
+        "habit_score": habit_scores(cohort),
+        "nutrition_score": nutrition_scores(cohort),
+        "mood_score": mood_scores(cohort),
+        "finance_score": finance_scores(cohort),
+        "consistency_score": consistency_scores(cohort)
+    }
+    scores["total_score"] = round2(
+        scores["habit_score"] * weights["habit"] +
+        scores["nutrition_score"] * weights["nutrition"] +
+        scores["mood_score"] * weights["mood"] +
+        scores["finance_score"] * weights["finance"] +
+        scores["consistency_score"] * weights["consistency"]
+    )
+    return scores
+
+def score_rows(cohort: Dict[str, np.ndarray], weights: Dict[str, float]) -> Dict[int, dict]:
+    scores = compute_life_scores(cohort, weights)
+    columns = {field: values.tolist() for field, values in scores.items()}
+    return {
+        user_id: {field: values[index] for field, values in columns.items()}
+        for index, user_id in enumerate(cohort["user_ids"].tolist())
+    }
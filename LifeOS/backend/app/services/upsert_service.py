@@ -0,0 +1,41 @@
+from typing import Callable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert
+}
+
+# INSERT ... ON CONFLICT DO UPDATE ... RETURNING in one round trip. set_ maps the statement's
+# excluded row to the columns to write on conflict; by default every non-key value is overwritten.
+def upsert(db: Session, model, values: dict, conflict_columns: List[str], set_: Optional[Callable] = None):
+    insert = DIALECT_INSERTS[db.get_bind().dialect.name]
+    statement = insert(model).values(**values)
+    
+    if set_ is None:
+        updates = {key: getattr(statement.excluded, key) for key in values if key not in conflict_columns}
+    else:
+        updates = set_(statement.excluded)
+    if "updated_at" in model.__table__.c and "updated_at" not in updates:
+        updates["updated_at"] = func.now()
+    
+    statement = statement.on_conflict_do_update(index_elements=conflict_columns, set_=updates).returning(model)
+    return db.execute(statement, execution_options={"populate_existing": True}).scalar_one()
+
+# Many-row variant for batch jobs: one executemany, no ORM objects returned.
+def upsert_many(db: Session, model, rows: List[dict], conflict_columns: List[str], set_: Optional[Callable] = None):
+    if not rows:
+        return
+    insert = DIALECT_INSERTS[db.get_bind().dialect.name]
+    statement = insert(model.__table__)
+    
+    if set_ is None:
+        updates = {key: statement.excluded[key] for key in rows[0] if key not in conflict_columns}
+    else:
+        updates = set_(statement.excluded)
+    if "updated_at" in model.__table__.c and "updated_at" not in updates:
+        updates["updated_at"] = func.now()
+    
+    db.execute(statement.on_conflict_do_update(index_elements=conflict_columns, set_=updates), rows)
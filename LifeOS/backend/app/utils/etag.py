@@ -0,0 +1,56 @@
+import hashlib
+from datetime import date
+from typing import Dict, Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.auth_cache import Principal
+from ..core.database import get_db, get_async_db
+from ..core.security import get_current_principal, get_current_principal_async
+from ..services.data_version_service import data_versions_statement, get_data_versions
+
+# Clients must revalidate every time; the ETag makes that revalidation cheap.
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(user_id: int, request: Request, versions: Dict[str, int]) -> str:
+    # Responses also depend on today's date (streaks, "today" views), so a new day is a new version.
+    parts = [str(user_id), date.today().isoformat(), request.url.path, request.url.query]
+    parts.extend(f"{domain}={version}" for domain, version in sorted(versions.items()))
+    return '"' + hashlib.sha1("|".join(parts).encode()).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a proxy still matches.
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+def _not_modified_or_tag(request: Request, response: Response, etag: str):
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+def conditional_get(*domains: str):
+    def check_etag(
+        request: Request,
+        response: Response,
+        current_user: Principal = Depends(get_current_principal),
+        db: Session = Depends(get_db)
+    ):
+        versions = get_data_versions(db, current_user.id, domains)
+        _not_modified_or_tag(request, response, make_etag(current_user.id, request, versions))
+    return check_etag
+
+def conditional_get_async(*domains: str):
+    async def check_etag(
+        request: Request,
+        response: Response,
+        current_user: Principal = Depends(get_current_principal_async),
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        versions = dict((await db.execute(data_versions_statement(current_user.id, domains))).all())
+        _not_modified_or_tag(request, response, make_etag(current_user.id, request, versions))
+    return check_etag
@@ -0,0 +1,74 @@
+import base64
+import binascii
+from datetime import date
+from typing import List, Optional, Tuple, Type
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Result
+from sqlalchemy.sql import Select
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(day: date, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{day.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day, row_id = raw.split("|")
+        return date.fromisoformat(day), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    if not fields:
+        return None
+
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return requested
+
+def page_statement(model, date_column, filters: list, limit: int, cursor: Optional[str], fields: Optional[List[str]]) -> Select:
+    if fields is None:
+        statement = select(model)
+    else:
+        # The cursor columns are always selected so the next page can be addressed.
+        columns = dict.fromkeys(["id", date_column.key] + fields)
+        statement = select(*[getattr(model, name) for name in columns])
+
+    statement = statement.where(*filters)
+    if cursor:
+        day, row_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(date_column, model.id) < tuple_(day, row_id))
+
+    # One extra row tells us whether another page exists without a COUNT.
+    return statement.order_by(date_column.desc(), model.id.desc()).limit(limit + 1)
+
+def render_page(result: Result, schema: Type[BaseModel], date_column, limit: int, fields: Optional[List[str]], response: Response):
+    rows = result.scalars().all() if fields is None else result.mappings().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if fields is None:
+            next_cursor = encode_cursor(getattr(last, date_column.key), last.id)
+        else:
+            next_cursor = encode_cursor(last[date_column.key], last["id"])
+
+    if fields is None:
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return [schema.model_validate(row) for row in rows]
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return JSONResponse(content=jsonable_encoder([{f: row[f] for f in fields} for row in rows]), headers=headers)
@@ -0,0 +1,245 @@
+"""initial schema (the tables the app created before migrations)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table('ai_insights',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('insight_type', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=True),
+    sa.Column('is_read', sa.Integer(), nullable=True),
+    sa.Column('generated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ai_insights_id', 'ai_insights', ['id'], unique=False)
+
+    op.create_table('budgets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('monthly_limit', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_budgets_id', 'budgets', ['id'], unique=False)
+
+    op.create_table('financial_goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('target_amount', sa.Float(), nullable=False),
+    sa.Column('current_amount', sa.Float(), nullable=True),
+    sa.Column('deadline', sa.Date(), nullable=True),
+    sa.Column('is_achieved', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_financial_goals_id', 'financial_goals', ['id'], unique=False)
+
+    op.create_table('food_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('food_name', sa.String(), nullable=False),
+    sa.Column('meal_type', sa.String(), nullable=True),
+    sa.Column('calories', sa.Float(), nullable=True),
+    sa.Column('protein', sa.Float(), nullable=True),
+    sa.Column('carbs', sa.Float(), nullable=True),
+    sa.Column('fat', sa.Float(), nullable=True),
+    sa.Column('fiber', sa.Float(), nullable=True),
+    sa.Column('serving_size', sa.String(), nullable=True),
+    sa.Column('logged_at', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_food_logs_id', 'food_logs', ['id'], unique=False)
+
+    op.create_table('habits',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('frequency', sa.String(), nullable=True),
+    sa.Column('target_count', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_habits_id', 'habits', ['id'], unique=False)
+
+    op.create_table('life_scores',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('habit_score', sa.Float(), nullable=True),
+    sa.Column('nutrition_score', sa.Float(), nullable=True),
+    sa.Column('mood_score', sa.Float(), nullable=True),
+    sa.Column('finance_score', sa.Float(), nullable=True),
+    sa.Column('consistency_score', sa.Float(), nullable=True),
+    sa.Column('total_score', sa.Float(), nullable=True),
+    sa.Column('calculated_at', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_life_scores_id', 'life_scores', ['id'], unique=False)
+
+    op.create_table('mood_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('mood_score', sa.Integer(), nullable=False),
+    sa.Column('energy_level', sa.Integer(), nullable=True),
+    sa.Column('stress_level', sa.Integer(), nullable=True),
+    sa.Column('sleep_hours', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('logged_at', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_mood_entries_id', 'mood_entries', ['id'], unique=False)
+
+    op.create_table('nutrition_goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('daily_calories', sa.Integer(), nullable=True),
+    sa.Column('daily_protein', sa.Integer(), nullable=True),
+    sa.Column('daily_carbs', sa.Integer(), nullable=True),
+    sa.Column('daily_fat', sa.Integer(), nullable=True),
+    sa.Column('daily_water_ml', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_nutrition_goals_id', 'nutrition_goals', ['id'], unique=False)
+
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('transaction_date', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_id', 'transactions', ['id'], unique=False)
+
+    op.create_table('water_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('amount_ml', sa.Integer(), nullable=False),
+    sa.Column('logged_at', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_water_logs_id', 'water_logs', ['id'], unique=False)
+
+    op.create_table('habit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('habit_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['habit_id'], ['habits.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_habit_logs_id', 'habit_logs', ['id'], unique=False)
+
+    op.create_table('journal_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('mood_id', sa.Integer(), nullable=True),
+    sa.Column('tags', sa.String(), nullable=True),
+    sa.Column('logged_at', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['mood_id'], ['mood_entries.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_journal_entries_id', 'journal_entries', ['id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_journal_entries_id', table_name='journal_entries')
+    op.drop_table('journal_entries')
+
+    op.drop_index('ix_habit_logs_id', table_name='habit_logs')
+    op.drop_table('habit_logs')
+
+    op.drop_index('ix_water_logs_id', table_name='water_logs')
+    op.drop_table('water_logs')
+
+    op.drop_index('ix_transactions_id', table_name='transactions')
+    op.drop_table('transactions')
+
+    op.drop_index('ix_nutrition_goals_id', table_name='nutrition_goals')
+    op.drop_table('nutrition_goals')
+
+    op.drop_index('ix_mood_entries_id', table_name='mood_entries')
+    op.drop_table('mood_entries')
+
+    op.drop_index('ix_life_scores_id', table_name='life_scores')
+    op.drop_table('life_scores')
+
+    op.drop_index('ix_habits_id', table_name='habits')
+    op.drop_table('habits')
+
+    op.drop_index('ix_food_logs_id', table_name='food_logs')
+    op.drop_table('food_logs')
+
+    op.drop_index('ix_financial_goals_id', table_name='financial_goals')
+    op.drop_table('financial_goals')
+
+    op.drop_index('ix_budgets_id', table_name='budgets')
+    op.drop_table('budgets')
+
+    op.drop_index('ix_ai_insights_id', table_name='ai_insights')
+    op.drop_table('ai_insights')
+
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
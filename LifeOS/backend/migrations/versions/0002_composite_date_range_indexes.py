@@ -0,0 +1,133 @@
+"""daily rollup tables and composite date range indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('daily_finance',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', 'type', 'category', name='uq_daily_finance_user_day_type_category')
+    )
+    op.create_index('ix_daily_finance_id', 'daily_finance', ['id'], unique=False)
+
+    op.create_table('daily_habits',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('log_entries', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', name='uq_daily_habits_user_day')
+    )
+    op.create_index('ix_daily_habits_id', 'daily_habits', ['id'], unique=False)
+
+    op.create_table('daily_mood',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=True),
+    sa.Column('mood_total', sa.Integer(), nullable=True),
+    sa.Column('energy_total', sa.Integer(), nullable=True),
+    sa.Column('stress_total', sa.Integer(), nullable=True),
+    sa.Column('sleep_total', sa.Integer(), nullable=True),
+    sa.Column('sleep_entries', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', name='uq_daily_mood_user_day')
+    )
+    op.create_index('ix_daily_mood_id', 'daily_mood', ['id'], unique=False)
+
+    op.create_table('daily_nutrition',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('food_entries', sa.Integer(), nullable=True),
+    sa.Column('calories', sa.Float(), nullable=True),
+    sa.Column('protein', sa.Float(), nullable=True),
+    sa.Column('carbs', sa.Float(), nullable=True),
+    sa.Column('fat', sa.Float(), nullable=True),
+    sa.Column('fiber', sa.Float(), nullable=True),
+    sa.Column('water_ml', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', name='uq_daily_nutrition_user_day')
+    )
+    op.create_index('ix_daily_nutrition_id', 'daily_nutrition', ['id'], unique=False)
+
+    op.create_index('ix_ai_insights_user_generated', 'ai_insights', ['user_id', 'generated_at'], unique=False)
+    op.create_index('ix_ai_insights_user_unread', 'ai_insights', ['user_id', 'priority'], unique=False, postgresql_where=sa.text('is_read = 0'), sqlite_where=sa.text('is_read = 0'))
+
+    op.create_index('ix_budgets_user_category', 'budgets', ['user_id', 'category'], unique=False)
+
+    op.create_index('ix_food_logs_user_logged', 'food_logs', ['user_id', 'logged_at'], unique=False)
+
+    op.create_index('ix_habit_logs_habit_user_completed', 'habit_logs', ['habit_id', 'user_id', 'completed_at'], unique=False)
+    op.create_index('ix_habit_logs_user_completed', 'habit_logs', ['user_id', 'completed_at'], unique=False)
+
+    op.create_index('ix_habits_user_active', 'habits', ['user_id'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+
+    op.create_index('ix_journal_entries_user_logged', 'journal_entries', ['user_id', 'logged_at'], unique=False)
+
+    op.create_index('ix_life_scores_user_calculated', 'life_scores', ['user_id', 'calculated_at'], unique=False)
+
+    op.create_index('ix_mood_entries_user_logged', 'mood_entries', ['user_id', 'logged_at'], unique=False)
+
+    op.create_index('ix_transactions_user_date', 'transactions', ['user_id', 'transaction_date'], unique=False)
+
+    op.create_index('ix_water_logs_user_logged', 'water_logs', ['user_id', 'logged_at'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_water_logs_user_logged', table_name='water_logs')
+
+    op.drop_index('ix_transactions_user_date', table_name='transactions')
+
+    op.drop_index('ix_mood_entries_user_logged', table_name='mood_entries')
+
+    op.drop_index('ix_life_scores_user_calculated', table_name='life_scores')
+
+    op.drop_index('ix_journal_entries_user_logged', table_name='journal_entries')
+
+    op.drop_index('ix_habits_user_active', table_name='habits', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+
+    op.drop_index('ix_habit_logs_user_completed', table_name='habit_logs')
+    op.drop_index('ix_habit_logs_habit_user_completed', table_name='habit_logs')
+
+    op.drop_index('ix_food_logs_user_logged', table_name='food_logs')
+
+    op.drop_index('ix_budgets_user_category', table_name='budgets')
+
+    op.drop_index('ix_ai_insights_user_unread', table_name='ai_insights', postgresql_where=sa.text('is_read = 0'), sqlite_where=sa.text('is_read = 0'))
+    op.drop_index('ix_ai_insights_user_generated', table_name='ai_insights')
+
+    op.drop_index('ix_daily_nutrition_id', table_name='daily_nutrition')
+    op.drop_table('daily_nutrition')
+
+    op.drop_index('ix_daily_mood_id', table_name='daily_mood')
+    op.drop_table('daily_mood')
+
+    op.drop_index('ix_daily_habits_id', table_name='daily_habits')
+    op.drop_table('daily_habits')
+
+    op.drop_index('ix_daily_finance_id', table_name='daily_finance')
+    op.drop_table('daily_finance')
@@ -0,0 +1,34 @@
+"""keyset pagination indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# List endpoints page on (date, id) descending; appending id lets the index serve both the
+# ordering and the cursor predicate.
+INDEXES = [
+    ('ix_food_logs_user_logged', 'food_logs', 'logged_at'),
+    ('ix_journal_entries_user_logged', 'journal_entries', 'logged_at'),
+    ('ix_life_scores_user_calculated', 'life_scores', 'calculated_at'),
+    ('ix_mood_entries_user_logged', 'mood_entries', 'logged_at'),
+    ('ix_transactions_user_date', 'transactions', 'transaction_date'),
+    ('ix_water_logs_user_logged', 'water_logs', 'logged_at'),
+]
+
+def upgrade():
+    for name, table, date_column in INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, ['user_id', date_column, 'id'], unique=False)
+
+def downgrade():
+    for name, table, date_column in INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, ['user_id', date_column], unique=False)
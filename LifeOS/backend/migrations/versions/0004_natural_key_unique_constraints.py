@@ -0,0 +1,76 @@
+"""natural key unique constraints
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Collapse duplicates left by the old select-then-insert routes so the constraints can be added.
+    # Water and habit logs keep the first row with the amounts summed; mood entries and budgets keep
+    # the latest row, which is what the routes would have overwritten.
+    op.execute("""
+        UPDATE water_logs SET amount_ml = (
+            SELECT SUM(w.amount_ml) FROM water_logs w
+            WHERE w.user_id = water_logs.user_id AND w.logged_at = water_logs.logged_at
+        )
+        WHERE id IN (SELECT MIN(id) FROM water_logs GROUP BY user_id, logged_at HAVING COUNT(*) > 1)
+    """)
+    op.execute("DELETE FROM water_logs WHERE id NOT IN (SELECT MIN(id) FROM water_logs GROUP BY user_id, logged_at)")
+
+    op.execute("""
+        UPDATE habit_logs SET count = (
+            SELECT SUM(h.count) FROM habit_logs h
+            WHERE h.habit_id = habit_logs.habit_id AND h.user_id = habit_logs.user_id AND h.completed_at = habit_logs.completed_at
+        )
+        WHERE id IN (SELECT MIN(id) FROM habit_logs GROUP BY habit_id, user_id, completed_at HAVING COUNT(*) > 1)
+    """)
+    op.execute("DELETE FROM habit_logs WHERE id NOT IN (SELECT MIN(id) FROM habit_logs GROUP BY habit_id, user_id, completed_at)")
+
+    op.execute("""
+        UPDATE journal_entries SET mood_id = (
+            SELECT MAX(kept.id) FROM mood_entries m
+            JOIN mood_entries kept ON kept.user_id = m.user_id AND kept.logged_at = m.logged_at
+            WHERE m.id = journal_entries.mood_id
+        )
+        WHERE mood_id IS NOT NULL
+    """)
+    op.execute("DELETE FROM mood_entries WHERE id NOT IN (SELECT MAX(id) FROM mood_entries GROUP BY user_id, logged_at)")
+
+    op.execute("DELETE FROM budgets WHERE id NOT IN (SELECT MAX(id) FROM budgets GROUP BY user_id, category)")
+
+    with op.batch_alter_table('mood_entries') as batch_op:
+        batch_op.create_unique_constraint('uq_mood_entries_user_logged', ['user_id', 'logged_at'])
+
+    with op.batch_alter_table('water_logs') as batch_op:
+        batch_op.create_unique_constraint('uq_water_logs_user_logged', ['user_id', 'logged_at'])
+
+    op.drop_index('ix_habit_logs_habit_user_completed', table_name='habit_logs')
+    with op.batch_alter_table('habit_logs') as batch_op:
+        batch_op.create_unique_constraint('uq_habit_logs_habit_user_completed', ['habit_id', 'user_id', 'completed_at'])
+
+    op.drop_index('ix_budgets_user_category', table_name='budgets')
+    with op.batch_alter_table('budgets') as batch_op:
+        batch_op.create_unique_constraint('uq_budgets_user_category', ['user_id', 'category'])
+
+def downgrade():
+    with op.batch_alter_table('budgets') as batch_op:
+        batch_op.drop_constraint('uq_budgets_user_category', type_='unique')
+    op.create_index('ix_budgets_user_category', 'budgets', ['user_id', 'category'], unique=False)
+
+    with op.batch_alter_table('habit_logs') as batch_op:
+        batch_op.drop_constraint('uq_habit_logs_habit_user_completed', type_='unique')
+    op.create_index('ix_habit_logs_habit_user_completed', 'habit_logs', ['habit_id', 'user_id', 'completed_at'], unique=False)
+
+    with op.batch_alter_table('water_logs') as batch_op:
+        batch_op.drop_constraint('uq_water_logs_user_logged', type_='unique')
+
+    with op.batch_alter_table('mood_entries') as batch_op:
+        batch_op.drop_constraint('uq_mood_entries_user_logged', type_='unique')
@@ -0,0 +1,30 @@
+"""per-user data versions for conditional GETs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('data_versions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('domain', sa.String(length=32), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'domain', name='uq_data_versions_user_domain')
+    )
+    op.create_index('ix_data_versions_id', 'data_versions', ['id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_data_versions_id', table_name='data_versions')
+    op.drop_table('data_versions')
@@ -0,0 +1,24 @@
+"""one life score per user and day
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Concurrent first requests of the day could each insert today's row; keep the latest.
+    op.execute("DELETE FROM life_scores WHERE id NOT IN (SELECT MAX(id) FROM life_scores GROUP BY user_id, calculated_at)")
+
+    with op.batch_alter_table('life_scores') as batch_op:
+        batch_op.create_unique_constraint('uq_life_scores_user_calculated', ['user_id', 'calculated_at'])
+
+def downgrade():
+    with op.batch_alter_table('life_scores') as batch_op:
+        batch_op.drop_constraint('uq_life_scores_user_calculated', type_='unique')
@@ -0,0 +1,24 @@
+"""journal entry sentiment columns
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Existing rows stay NULL until `python -m app.jobs.backfill_sentiment` scores them.
+    with op.batch_alter_table('journal_entries') as batch_op:
+        batch_op.add_column(sa.Column('sentiment', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('sentiment_score', sa.Float(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table('journal_entries') as batch_op:
+        batch_op.drop_column('sentiment_score')
+        batch_op.drop_column('sentiment')
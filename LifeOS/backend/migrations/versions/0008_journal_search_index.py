@@ -0,0 +1,31 @@
+"""full-text search index on journal entries
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Same expression as journal_service.SEARCH_VECTOR_SQL; queries only use the index when they match.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+    "setweight(to_tsvector('english', content), 'C')"
+)
+
+def upgrade():
+    # SQLite has no tsvector; search there runs on the in-process inverted index instead.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f"CREATE INDEX ix_journal_entries_search ON journal_entries USING GIN (({SEARCH_VECTOR_SQL}))")
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX ix_journal_entries_search")
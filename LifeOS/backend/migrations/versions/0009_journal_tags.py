@@ -0,0 +1,76 @@
+"""normalized journal tags and per-user tag counts
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 5000
+MAX_TAG_LENGTH = 255
+
+def split_tags(tags):
+    # Same normalization as journal_service.split_tags.
+    if not tags:
+        return []
+    return list(dict.fromkeys(tag.strip().lower()[:MAX_TAG_LENGTH] for tag in tags.split(",") if tag.strip()))
+
+def upgrade():
+    journal_tags = op.create_table('journal_tags',
+    sa.Column('journal_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=MAX_TAG_LENGTH), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['journal_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('journal_id', 'tag')
+    )
+    op.create_index('ix_journal_tags_user_tag', 'journal_tags', ['user_id', 'tag', 'journal_id'], unique=False)
+
+    op.create_table('journal_tag_counts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=MAX_TAG_LENGTH), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'tag', name='uq_journal_tag_counts_user_tag')
+    )
+    op.create_index('ix_journal_tag_counts_id', 'journal_tag_counts', ['id'], unique=False)
+
+    # Split the existing comma separated strings a chunk of entries at a time; the strings stay on
+    # journal_entries as entered.
+    bind = op.get_bind()
+    after_id = 0
+    while True:
+        rows = bind.execute(sa.text(
+            "SELECT id, user_id, tags FROM journal_entries WHERE id > :after_id AND tags IS NOT NULL "
+            "ORDER BY id LIMIT :limit"
+        ), {"after_id": after_id, "limit": CHUNK_SIZE}).all()
+        if not rows:
+            break
+        tag_rows = [
+            {"journal_id": journal_id, "user_id": user_id, "tag": tag}
+            for journal_id, user_id, tags in rows
+            for tag in split_tags(tags)
+        ]
+        if tag_rows:
+            bind.execute(journal_tags.insert(), tag_rows)
+        after_id = rows[-1][0]
+
+    op.execute("""
+        INSERT INTO journal_tag_counts (user_id, tag, entries)
+        SELECT user_id, tag, COUNT(*) FROM journal_tags GROUP BY user_id, tag
+    """)
+
+def downgrade():
+    op.drop_index('ix_journal_tag_counts_id', table_name='journal_tag_counts')
+    op.drop_table('journal_tag_counts')
+    op.drop_index('ix_journal_tags_user_tag', table_name='journal_tags')
+    op.drop_table('journal_tags')
@@ -0,0 +1,31 @@
+"""per-user expense category overrides
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('expense_category_overrides',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('expense_type', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'category', name='uq_expense_category_overrides_user_category')
+    )
+    op.create_index('ix_expense_category_overrides_id', 'expense_category_overrides', ['id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_expense_category_overrides_id', table_name='expense_category_overrides')
+    op.drop_table('expense_category_overrides')
@@ -0,0 +1,22 @@
+"""journal search revision for incremental index refreshes
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 09:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Existing entries stay NULL: a search index's first refresh reads every entry regardless.
+    op.add_column('journal_entries', sa.Column('search_revision', sa.Integer(), nullable=True))
+    op.create_index('ix_journal_entries_user_revision', 'journal_entries', ['user_id', 'search_revision'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_journal_entries_user_revision', table_name='journal_entries')
+    op.drop_column('journal_entries', 'search_revision')
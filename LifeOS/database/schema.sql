@@ -33,7 +33,8 @@ CREATE TABLE IF NOT EXISTS habit_logs (
     completed_at DATE NOT NULL,
     count INTEGER DEFAULT 1,
     notes TEXT,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_habit_logs_habit_user_completed UNIQUE (habit_id, user_id, completed_at)
 );
 
 -- Mood Entries Table
@@ -46,7 +47,8 @@ CREATE TABLE IF NOT EXISTS mood_entries (
     sleep_hours INTEGER,
     notes TEXT,
     logged_at DATE NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_mood_entries_user_logged UNIQUE (user_id, logged_at)
 );
 
 -- Journal Entries Table
@@ -57,10 +59,31 @@ CREATE TABLE IF NOT EXISTS journal_entries (
     content TEXT NOT NULL,
     mood_id INTEGER REFERENCES mood_entries(id),
     tags VARCHAR(255),
+    sentiment VARCHAR(16),
+    sentiment_score DECIMAL(3,2),
+    search_revision INTEGER,
     logged_at DATE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Journal Tags (one row per normalized tag on an entry)
+CREATE TABLE IF NOT EXISTS journal_tags (
+    journal_id INTEGER NOT NULL REFERENCES journal_entries(id) ON DELETE CASCADE,
+    tag VARCHAR(255) NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    PRIMARY KEY (journal_id, tag)
+);
+
+-- Per-user tag frequencies maintained on write
+CREATE TABLE IF NOT EXISTS journal_tag_counts (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    tag VARCHAR(255) NOT NULL,
+    entries INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_journal_tag_counts_user_tag UNIQUE (user_id, tag)
+);
+
 -- Food Logs Table
 CREATE TABLE IF NOT EXISTS food_logs (
     id SERIAL PRIMARY KEY,
@@ -83,7 +106,8 @@ CREATE TABLE IF NOT EXISTS water_logs (
     user_id INTEGER NOT NULL REFERENCES users(id),
     amount_ml INTEGER NOT NULL,
     logged_at DATE NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_water_logs_user_logged UNIQUE (user_id, logged_at)
 );
 
 -- Nutrition Goals Table
@@ -118,7 +142,8 @@ CREATE TABLE IF NOT EXISTS budgets (
     category VARCHAR(100) NOT NULL,
     monthly_limit DECIMAL(10,2) NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT uq_budgets_user_category UNIQUE (user_id, category)
 );
 
 -- Financial Goals Table
@@ -133,6 +158,17 @@ CREATE TABLE IF NOT EXISTS financial_goals (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Per-user expense type overrides learned from corrections (category is lowercased, single spaced)
+CREATE TABLE IF NOT EXISTS expense_category_overrides (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    category VARCHAR NOT NULL,
+    expense_type VARCHAR(16) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT uq_expense_category_overrides_user_category UNIQUE (user_id, category)
+);
+
 -- Life Scores Table
 CREATE TABLE IF NOT EXISTS life_scores (
     id SERIAL PRIMARY KEY,
@@ -144,7 +180,8 @@ CREATE TABLE IF NOT EXISTS life_scores (
     consistency_score DECIMAL(5,2) DEFAULT 0,
     total_score DECIMAL(5,2) DEFAULT 0,
     calculated_at DATE NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_life_scores_user_calculated UNIQUE (user_id, calculated_at)
 );
 
 -- AI Insights Table
@@ -160,6 +197,67 @@ CREATE TABLE IF NOT EXISTS ai_insights (
     generated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Daily Rollup Tables (per-user, per-day aggregates maintained on write)
+CREATE TABLE IF NOT EXISTS daily_habits (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    day DATE NOT NULL,
+    log_entries INTEGER DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_daily_habits_user_day UNIQUE (user_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS daily_nutrition (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    day DATE NOT NULL,
+    food_entries INTEGER DEFAULT 0,
+    calories DOUBLE PRECISION DEFAULT 0,
+    protein DOUBLE PRECISION DEFAULT 0,
+    carbs DOUBLE PRECISION DEFAULT 0,
+    fat DOUBLE PRECISION DEFAULT 0,
+    fiber DOUBLE PRECISION DEFAULT 0,
+    water_ml INTEGER DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_daily_nutrition_user_day UNIQUE (user_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS daily_mood (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    day DATE NOT NULL,
+    entries INTEGER DEFAULT 0,
+    mood_total INTEGER DEFAULT 0,
+    energy_total INTEGER DEFAULT 0,
+    stress_total INTEGER DEFAULT 0,
+    sleep_total INTEGER DEFAULT 0,
+    sleep_entries INTEGER DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_daily_mood_user_day UNIQUE (user_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS daily_finance (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    day DATE NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    entries INTEGER DEFAULT 0,
+    amount DOUBLE PRECISION DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_daily_finance_user_day_type_category UNIQUE (user_id, day, type, category)
+);
+
+-- Per-user data versions, bumped by every write and used to build ETags
+CREATE TABLE IF NOT EXISTS data_versions (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    domain VARCHAR(32) NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_data_versions_user_domain UNIQUE (user_id, domain)
+);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_habits_user ON habits(user_id);
 CREATE INDEX IF NOT EXISTS idx_habit_logs_habit ON habit_logs(habit_id);
@@ -169,3 +267,24 @@ CREATE INDEX IF NOT EXISTS idx_food_logs_user ON food_logs(user_id);
 CREATE INDEX IF NOT EXISTS idx_transactions_user ON transactions(user_id);
 CREATE INDEX IF NOT EXISTS idx_life_scores_user ON life_scores(user_id);
 CREATE INDEX IF NOT EXISTS idx_ai_insights_user ON ai_insights(user_id);
+
+-- Composite indexes for per-user date-range queries
+CREATE INDEX IF NOT EXISTS ix_habits_user_active ON habits(user_id) WHERE is_active;
+CREATE INDEX IF NOT EXISTS ix_habit_logs_user_completed ON habit_logs(user_id, completed_at);
+CREATE INDEX IF NOT EXISTS ix_mood_entries_user_logged ON mood_entries(user_id, logged_at, id);
+CREATE INDEX IF NOT EXISTS ix_journal_entries_user_logged ON journal_entries(user_id, logged_at, id);
+CREATE INDEX IF NOT EXISTS ix_journal_entries_user_revision ON journal_entries(user_id, search_revision);
+CREATE INDEX IF NOT EXISTS ix_journal_tags_user_tag ON journal_tags(user_id, tag, journal_id);
+CREATE INDEX IF NOT EXISTS ix_food_logs_user_logged ON food_logs(user_id, logged_at, id);
+CREATE INDEX IF NOT EXISTS ix_water_logs_user_logged ON water_logs(user_id, logged_at, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_user_date ON transactions(user_id, transaction_date, id);
+CREATE INDEX IF NOT EXISTS ix_life_scores_user_calculated ON life_scores(user_id, calculated_at, id);
+CREATE INDEX IF NOT EXISTS ix_ai_insights_user_generated ON ai_insights(user_id, generated_at);
+CREATE INDEX IF NOT EXISTS ix_ai_insights_user_unread ON ai_insights(user_id, priority) WHERE is_read = 0;
+
+-- Full-text search over journal entries (expression must match journal_service.SEARCH_VECTOR_SQL)
+CREATE INDEX IF NOT EXISTS ix_journal_entries_search ON journal_entries USING GIN ((
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(tags, '')), 'B') ||
+    setweight(to_tsvector('english', content), 'C')
+));